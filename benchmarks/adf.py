@@ -0,0 +1,141 @@
+"""Time the rendering of ADF documents against the conversion of the same texts in the Jira markup.
+
+The same synthetic sections (a heading, formatted text with a link and a mention, a nested list, a table, and a code
+block) are written both in the Jira markup, which `JiraPreprocessor.clean_jira_text` converts with regex and HTML
+passes, and as ADF documents, which `AdfRenderer` renders in a single traversal.
+
+Usage:
+    uv run python benchmarks/adf.py [--sizes 1 10 100 1000] [--show]
+"""
+
+import time
+import argparse
+from dataclasses import dataclass
+from typing import Any
+
+from jira_prompts_mcp_server.jira_utils.preprocessing import JiraPreprocessor
+
+BASE_URL = "https://example.atlassian.net"
+
+
+@dataclass
+class _User:
+    displayName: str
+
+
+class _Users:
+    """Stands in for the Jira client (only the user lookups are needed)."""
+
+    def user(self, account_id: str) -> _User:
+        return _User(f"User {account_id}")
+
+
+def _text(text: str, *marks: str | dict[str, Any]) -> dict[str, Any]:
+    return {"type": "text", "text": text, "marks": [{"type": x} if isinstance(x, str) else x for x in marks]}
+
+
+def _paragraph(*content: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "paragraph", "content": list(content)}
+
+
+def _list(*items: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"type": "bulletList", "content": [{"type": "listItem", "content": item} for item in items]}
+
+
+def _table(*rows: tuple[str, str], header: bool = False) -> list[dict[str, Any]]:
+    return [
+        {
+            "type": "tableRow",
+            "content": [
+                {"type": "tableHeader" if header else "tableCell", "content": [_paragraph(_text(cell))]} for cell in row
+            ],
+        }
+        for row in rows
+    ]
+
+
+def make_section(i: int) -> tuple[str, list[dict[str, Any]]]:
+    """A section in the Jira markup and as the nodes of an ADF document."""
+    markup = (
+        f"h2. Section {i}\n"
+        f"Some *bold* text and _italic_ words with {{{{code_{i}}}}} and a [link|https://example.com/{i}] "
+        f"mentioning [~accountid:user{i % 5}] -struck- here.\n"
+        f"* first item {i}\n** nested item\n* second item\n"
+        f"||Name||Value||\n|alpha|{i}|\n|beta|{i * 2}|\n"
+        "{code:python}\nprint('hello')\n{code}\n"
+    )
+    nodes = [
+        {"type": "heading", "attrs": {"level": 2}, "content": [_text(f"Section {i}")]},
+        _paragraph(
+            _text("Some "),
+            _text("bold", "strong"),
+            _text(" text and "),
+            _text("italic", "em"),
+            _text(" words with "),
+            _text(f"code_{i}", "code"),
+            _text(" and a "),
+            _text("link", {"type": "link", "attrs": {"href": f"https://example.com/{i}"}}),
+            _text(" mentioning "),
+            {"type": "mention", "attrs": {"id": f"user{i % 5}"}},
+            _text(" "),
+            _text("struck", "strike"),
+            _text(" here."),
+        ),
+        _list(
+            [_paragraph(_text(f"first item {i}")), _list([_paragraph(_text("nested item"))])],
+            [_paragraph(_text("second item"))],
+        ),
+        {
+            "type": "table",
+            "content": _table(("Name", "Value"), header=True) + _table(("alpha", str(i)), ("beta", str(i * 2))),
+        },
+        {"type": "codeBlock", "attrs": {"language": "python"}, "content": [_text("print('hello')")]},
+    ]
+    return markup, nodes
+
+
+def make_texts(sections: int) -> tuple[str, dict[str, Any]]:
+    """The Jira markup and the ADF document of a number of sections."""
+    parts = [make_section(i) for i in range(sections)]
+    markup = "\n".join(x[0] for x in parts)
+    doc = {"type": "doc", "version": 1, "content": [node for x in parts for node in x[1]]}
+    return markup, doc
+
+
+def _best_time_ms(function, argument, repeat: int) -> float:
+    """The shortest of 3 timings (each one the average of `repeat` calls), in milliseconds."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function(argument)
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="Numbers of sections")
+    parser.add_argument("--show", action="store_true", help="Print the two conversions of a section and exit")
+    args = parser.parse_args()
+
+    preprocessor = JiraPreprocessor(base_url=BASE_URL, jira_client=_Users())
+    if args.show:
+        markup, doc = make_texts(1)
+        print(preprocessor.clean_jira_text(markup), "-" * 40, preprocessor.clean_adf(doc), sep="\n")
+        return
+
+    print(f"{'sections':>8} {'chars':>9} {'markup':>11} {'ADF':>11} {'speedup':>8}")
+    for sections in args.sizes:
+        markup, doc = make_texts(sections)
+        # The user lookups are cached by the preprocessor, so the first (warm-up) runs fill the cache
+        preprocessor.clean_jira_text(markup)
+        preprocessor.clean_adf(doc)
+        repeat = max(1, 200 // sections)
+        markup_ms = _best_time_ms(preprocessor.clean_jira_text, markup, repeat)
+        adf_ms = _best_time_ms(preprocessor.clean_adf, doc, repeat)
+        print(f"{sections:>8} {len(markup):>9} {markup_ms:>8.2f} ms {adf_ms:>8.2f} ms {markup_ms / adf_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Time the rewriting of smart links and mentions on texts of growing sizes.
+
+The single-pass rewrite of `JiraPreprocessor` is compared with the loop it replaced, which called `str.replace` on the
+whole text once per match (quadratic in the size of the text). The time per 1,000 lines of the single pass stays
+flat as the texts grow.
+
+Usage:
+    uv run python benchmarks/smart_links.py [--sizes 100 1000 5000 20000] [--skip-old]
+"""
+
+import re
+import time
+import argparse
+from dataclasses import dataclass
+
+from jira_prompts_mcp_server.jira_utils.preprocessing import JiraPreprocessor
+
+BASE_URL = "https://example.atlassian.net"
+
+
+@dataclass
+class _User:
+    displayName: str
+
+
+class _Users:
+    """Stands in for the Jira client (only the user lookups are needed)."""
+
+    def user(self, account_id: str) -> _User:
+        return _User(f"User {account_id}")
+
+
+def make_text(lines: int) -> str:
+    """A text with an issue link, a Confluence link, and a mention on each line (50 issues and 20 users in total)."""
+    return "".join(
+        f"See [ACME-{i % 50}|{BASE_URL}/browse/ACME-{i % 50}|smart-link] and "
+        f"[page|{BASE_URL}/wiki/spaces/ENG/pages/{i % 50}/ACME-1+Runbook+{i % 50}?atlOrigin=x|smart-link] "
+        f"cc [~accountid:user{i % 20}] about the rollout.\n"
+        for i in range(lines)
+    )
+
+
+def replace_per_match(preprocessor: JiraPreprocessor, text: str) -> str:
+    """The rewriting before the single pass: every match is replaced in the whole text."""
+    for match in re.finditer(r"\[(.*?)\|(.*?)\|smart-link\]", text):
+        text = text.replace(match.group(0), preprocessor._replace_smart_link(match))
+    for account_id in re.findall(r"\[~accountid:(.*?)\]", text):
+        display_name = preprocessor.jira_client.user(account_id).displayName
+        text = text.replace(f"[~accountid:{account_id}]", f"@<{display_name}>")
+    return text
+
+
+def single_pass(preprocessor: JiraPreprocessor, text: str) -> str:
+    return preprocessor._process_mentions(preprocessor._process_smart_links(text))
+
+
+def _time_ms(function, *args) -> tuple[float, str]:
+    started = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000], help="Numbers of lines")
+    parser.add_argument("--skip-old", action="store_true", help="Only time the single pass")
+    args = parser.parse_args()
+
+    preprocessor = JiraPreprocessor(base_url=BASE_URL, jira_client=_Users())
+    print(f"{'lines':>7} {'chars':>10} {'single pass':>14} {'per 1k lines':>13} {'per match':>14} {'per 1k lines':>13}")
+    for lines in args.sizes:
+        text = make_text(lines)
+        # The user lookups are cached by the preprocessor, so the first (warm-up) run fills the cache
+        single_pass(preprocessor, text)
+        new_ms, new_result = _time_ms(single_pass, preprocessor, text)
+        row = f"{lines:>7} {len(text):>10} {new_ms:>11.1f} ms {new_ms * 1000 / lines:>10.2f} ms"
+        if not args.skip_old:
+            old_ms, old_result = _time_ms(replace_per_match, preprocessor, text)
+            assert old_result == new_result, "The two rewrites disagree"
+            row += f" {old_ms:>11.1f} ms {old_ms * 1000 / lines:>10.2f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
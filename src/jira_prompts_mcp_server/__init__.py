@@ -1,31 +1,89 @@
 import os
-import logging
+import enum
+import asyncio
 from pathlib import Path
-from datetime import datetime
+from typing import Annotated
 
 import typer
 
-from .server import APP
+from .log import setup_logging
+from .server import APP, close_jira_sites, serve_http
+from .webhooks import start_webhook_receiver
 
 
-def _main(url: str, username: str, api_token: str) -> None:
+class Transport(str, enum.Enum):
+    STDIO = "stdio"
+    STREAMABLE_HTTP = "streamable-http"
+    SSE = "sse"
+
+
+def _main(
+    url: str,
+    username: str,
+    api_token: str,
+    transport: Annotated[
+        Transport, typer.Option(help="Use an HTTP transport to share one server between multiple clients")
+    ] = Transport.STDIO,
+    host: Annotated[
+        str, typer.Option(help="Host address to bind to (HTTP transports and webhooks only)")
+    ] = "127.0.0.1",
+    port: Annotated[int, typer.Option(help="Port to bind to (HTTP transports only)")] = 8000,
+    max_concurrency_per_client: Annotated[
+        int, typer.Option(help="Maximum number of prompts rendered concurrently for each client")
+    ] = 4,
+    deadline: Annotated[
+        float, typer.Option(help="Seconds a prompt may take before its optional sections are omitted (0 disables)")
+    ] = 25.0,
+    shutdown_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for in-flight prompts when shutting down (HTTP transports only)")
+    ] = 30.0,
+    webhook_port: Annotated[
+        int | None, typer.Option(help="Receive Jira webhook events on this port to keep the caches fresh")
+    ] = None,
+    webhook_secret: Annotated[
+        str | None, typer.Option(help="The secret of the Jira webhook", envvar="JIRA_WEBHOOK_SECRET")
+    ] = None,
+    profile_count: Annotated[
+        int, typer.Option(help="Profile the next N prompt invocations", envvar="JIRA_PROMPTS_PROFILE_COUNT")
+    ] = 0,
+    profile_pattern: Annotated[
+        str | None,
+        typer.Option(
+            help="Profile the prompt invocations whose issue key matches this regular expression",
+            envvar="JIRA_PROMPTS_PROFILE_PATTERN",
+        ),
+    ] = None,
+    profile_dir: Annotated[
+        Path, typer.Option(help="The directory of the profiles", envvar="JIRA_PROMPTS_PROFILE_DIR")
+    ] = Path("/tmp/jira_prompts_profiles"),
+) -> None:
     os.environ["JIRA_URL"] = url
     os.environ["JIRA_USERNAME"] = username
     os.environ["JIRA_API_TOKEN"] = api_token
-    APP.run()
+    os.environ["JIRA_PROMPTS_MAX_CONCURRENCY_PER_CLIENT"] = str(max_concurrency_per_client)
+    os.environ["JIRA_PROMPTS_DEADLINE"] = str(deadline)
+    os.environ["JIRA_PROMPTS_PROFILE_COUNT"] = str(profile_count)
+    os.environ["JIRA_PROMPTS_PROFILE_PATTERN"] = profile_pattern or ""
+    os.environ["JIRA_PROMPTS_PROFILE_DIR"] = str(profile_dir)
+    if webhook_port is not None:
+        start_webhook_receiver(host, webhook_port, secret=webhook_secret)
+    try:
+        if transport == Transport.STDIO:
+            APP.run()
+        else:
+            asyncio.run(serve_http(transport.value, host=host, port=port, shutdown_timeout=shutdown_timeout))
+    finally:
+        close_jira_sites()
 
 
 def entry_point():
-    logging.basicConfig(
-        format="[%(asctime)s][%(levelname)s][%(name)s] %(message)s",
-        level=logging.INFO,
-        datefmt="%Y-%m-%dT%H:%M:%S%z",
+    # Export log to rotated files under /tmp (by default) without blocking the request threads
+    setup_logging(
+        log_dir=Path(os.getenv("JIRA_PROMPTS_LOG_DIR", "/tmp")),
+        max_bytes=int(os.getenv("JIRA_PROMPTS_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        backup_count=int(os.getenv("JIRA_PROMPTS_LOG_BACKUP_COUNT", "3")),
+        retention=int(os.getenv("JIRA_PROMPTS_LOG_RETENTION", "10")),
     )
-    # Export log to a temporary file under /tmp
-    tmp_log_file = Path(f"/tmp/jira_prompts_mcp_{datetime.now().strftime('%Y%m%d%H%M%S')}.log")
-    file_handler = logging.FileHandler(tmp_log_file)
-    file_handler.setFormatter(logging.Formatter("[%(asctime)s][%(levelname)s][%(name)s] %(message)s"))
-    logging.getLogger().addHandler(file_handler)
     typer.run(_main)
 
 
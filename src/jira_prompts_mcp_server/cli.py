@@ -7,12 +7,23 @@ Prerequiesite - These environment variables need to be set:
 3. `JIRA_API_TOKEN`
 """
 
+import time
 import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import typer
 from fastmcp import Client
 
+from .export import ExportCheckpoint, export_issues
+from .jira_utils import JiraSiteRegistry
+from .jira_utils.resilience import CircuitOpenError, DeadlineExceeded
+from .jira_utils.sprints import with_stable_order
+from .profiling import current_rss
 from .server import APP as MCP_APP
+from .server import render_issue_full
 
 CLIENT = Client(MCP_APP)
 
@@ -20,24 +31,170 @@ TYPER_APP = typer.Typer()
 
 
 @TYPER_APP.command()
-def jira_full(issue_key: str):
+def jira_full(issue_key: str, site: str | None = None, custom_fields: str | None = None):
+    arguments = {"issue_key": issue_key}
+    if site:
+        arguments["site"] = site
+    if custom_fields:
+        arguments["custom_fields"] = custom_fields
+
     async def _internal_func():
         async with CLIENT:
-            result = await CLIENT.get_prompt("jira-issue-full", arguments={"issue_key": issue_key})
+            result = await CLIENT.get_prompt("jira-issue-full", arguments=arguments)
             print(result.messages[0].content.text)  # type: ignore
 
     asyncio.run(_internal_func())
 
 
 @TYPER_APP.command()
-def jira_brief(issue_key: str):
+def jira_brief(issue_key: str, site: str | None = None, custom_fields: str | None = None):
+    arguments = {"issue_key": issue_key}
+    if site:
+        arguments["site"] = site
+    if custom_fields:
+        arguments["custom_fields"] = custom_fields
+
+    async def _internal_func():
+        async with CLIENT:
+            result = await CLIENT.get_prompt("jira-issue-brief", arguments=arguments)
+            print(result.messages[0].content.text)  # type: ignore
+
+    asyncio.run(_internal_func())
+
+
+@TYPER_APP.command()
+def sprint_summary(
+    board_id: str | None = None, sprint_id: str | None = None, jql: str | None = None, site: str | None = None
+):
+    arguments = {
+        key: value
+        for key, value in (("board_id", board_id), ("sprint_id", sprint_id), ("jql", jql), ("site", site))
+        if value
+    }
+
     async def _internal_func():
         async with CLIENT:
-            result = await CLIENT.get_prompt("jira-issue-brief", arguments={"issue_key": issue_key})
+            result = await CLIENT.get_prompt("jira-sprint-summary", arguments=arguments)
             print(result.messages[0].content.text)  # type: ignore
 
     asyncio.run(_internal_func())
 
 
+@TYPER_APP.command()
+def export(
+    jql: str,
+    output: Path,
+    site: str | None = None,
+    concurrency: int = 8,
+    page_size: int = 50,
+    resume: bool = False,
+    custom_fields: str | None = None,
+):
+    """Export the issues matched by a JQL query, rendered like jira-issue-full, to a JSONL file (gzipped if the
+    file name ends with .gz). Use --resume to continue an interrupted export, or to retry the failed issues."""
+    jira_sites = JiraSiteRegistry.from_env()
+
+    def _report(checkpoint: ExportCheckpoint):
+        total = "?" if checkpoint.total is None else checkpoint.total
+        typer.echo(
+            f"Exported {checkpoint.exported}/{total} issues ({checkpoint.failed} failed, {checkpoint.partial} partial)",
+            err=True,
+        )
+
+    try:
+        checkpoint = export_issues(
+            jira_sites.get(site),
+            jql,
+            output,
+            concurrency=concurrency,
+            page_size=page_size,
+            resume=resume,
+            custom_fields=custom_fields,
+            on_progress=_report,
+        )
+    except (CircuitOpenError, DeadlineExceeded) as e:
+        typer.echo(
+            f"Stopped the export, as Jira is unavailable or too slow ({e}). Run it again with --resume to continue.",
+            err=True,
+        )
+        raise typer.Exit(1)
+    finally:
+        jira_sites.close()
+    typer.echo(
+        f"Exported {checkpoint.exported} issues to {output} ({checkpoint.failed} failed, {checkpoint.partial} partial)",
+        err=True,
+    )
+    if not checkpoint.complete:
+        typer.echo("Run the export again with --resume to retry the failed and partial issues.", err=True)
+        raise typer.Exit(1)
+
+
+@TYPER_APP.command()
+def memory_soak(
+    jql: str,
+    duration: float = 300.0,
+    site: str | None = None,
+    concurrency: int = 4,
+    max_issues: int = 2000,
+    report_every: float = 10.0,
+    tolerance: float = 0.5,
+):
+    """Render the issues matched by a JQL query over and over, and check that the RSS grows by no more than the memory
+    budget of the site (plus the tolerance, which covers the allocator overhead and the renders in flight). Requires
+    JIRA_MEMORY_BUDGET and JIRA_CACHE_TTL."""
+    jira_sites = JiraSiteRegistry.from_env()
+    try:
+        jira_fetcher = jira_sites.get(site)
+        budget = jira_fetcher.memory_budget
+        if budget is None or not jira_fetcher.prompt_cache.enabled:
+            typer.echo("Set a memory budget (JIRA_MEMORY_BUDGET) and enable caching (JIRA_CACHE_TTL)", err=True)
+            raise typer.Exit(2)
+        results = jira_fetcher.iter_search_results(with_stable_order(jql), ("summary",))
+        keys = [raw["key"] for raw in itertools.islice(results, max_issues)]
+        if not keys:
+            typer.echo("No issues matched the query", err=True)
+            raise typer.Exit(2)
+        typer.echo(f"Rendering {len(keys)} issues for {duration:.0f} seconds", err=True)
+
+        next_key = itertools.cycle(keys).__next__
+        lock = threading.Lock()
+        counts = {"rendered": 0, "failed": 0}
+        end_time = time.monotonic() + duration
+
+        def _work():
+            while time.monotonic() < end_time:
+                with lock:
+                    key = next_key()
+                try:
+                    render_issue_full(jira_fetcher, key)
+                    outcome = "rendered"
+                except Exception:
+                    outcome = "failed"
+                with lock:
+                    counts[outcome] += 1
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # Warm up (the imports, connections, and thread stacks are not part of the cached data)
+            list(executor.map(lambda key: render_issue_full(jira_fetcher, key), keys[:concurrency]))
+            baseline = peak = current_rss()
+            futures = [executor.submit(_work) for _ in range(concurrency)]
+            while not all(future.done() for future in futures):
+                time.sleep(min(report_every, max(end_time - time.monotonic(), 0.1)))
+                rss = current_rss()
+                peak = max(peak, rss)
+                usage = budget.stats()
+                typer.echo(
+                    f"{counts['rendered']} rendered ({counts['failed']} failed), cached {usage['used_bytes'] >> 20} MiB"
+                    f" ({usage['evictions']} evictions), RSS {rss >> 20} MiB (+{(rss - baseline) >> 20} MiB)",
+                    err=True,
+                )
+    finally:
+        jira_sites.close()
+    growth, allowed = peak - baseline, budget.limit * (1 + tolerance)
+    typer.echo(f"Peak RSS growth: {growth >> 20} MiB (allowed: {int(allowed) >> 20} MiB)", err=True)
+    if growth > allowed:
+        raise typer.Exit(1)
+
+
 if __name__ == "__main__":
     TYPER_APP()
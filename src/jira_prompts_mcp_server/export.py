@@ -0,0 +1,220 @@
+"""Export the issues matched by a JQL query, rendered like the jira-issue-full prompt, to a JSONL file.
+
+The results are paged through and written page by page, so the memory use does not grow with the number of issues.
+After each page, a checkpoint is saved next to the output file, from which an interrupted export can be resumed. The
+issues that failed to render, or were rendered without some of their sections, are listed in the checkpoint (and left
+out of the output) until a resumed export renders them in full.
+"""
+
+import os
+import json
+import gzip
+import logging
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .jira_utils import JiraFetcher
+from .jira_utils.resilience import CircuitOpenError, DeadlineExceeded
+from .jira_utils.sprints import with_stable_order
+from .server import StrFallbackEncoder, collect_issue_full
+
+LOGGER = logging.getLogger("jira_prompts.export")
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+@dataclasses.dataclass
+class ExportCheckpoint:
+    """The progress of an export.
+
+    Everything before `next_start` in the search results has been written, except for the issues listed in
+    `failed_keys` and `partial_keys`, which are rendered again when the export is resumed.
+    """
+
+    jql: str
+    custom_fields: str = ""
+    output_format: str = "jsonl"  # "jsonl" or "jsonl.gz"
+    next_start: int = 0
+    output_size: int = 0  # The size of the output file after the last completed page
+    exported: int = 0
+    total: int | None = None
+    failed_keys: list[str] = dataclasses.field(default_factory=list)  # The issues that failed to render
+    partial_keys: list[str] = dataclasses.field(default_factory=list)  # The issues rendered with omitted sections
+
+    @property
+    def failed(self) -> int:
+        return len(self.failed_keys)
+
+    @property
+    def partial(self) -> int:
+        return len(self.partial_keys)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every issue has been written (the export may still have stopped before the end of the results)."""
+        return not self.failed_keys and not self.partial_keys
+
+    def check_matches(self, other: "ExportCheckpoint") -> None:
+        """Check that a resumed export writes the same records as the export that saved this checkpoint.
+
+        Raises:
+            ValueError: If the query, the custom fields, or the output format differ
+        """
+        for name in ("jql", "custom_fields", "output_format"):
+            saved, requested = getattr(self, name), getattr(other, name)
+            if saved != requested:
+                raise ValueError(
+                    f"The checkpoint belongs to an export with another {name}: {saved!r} (not {requested!r})"
+                )
+
+    @classmethod
+    def load(cls, path: Path) -> "ExportCheckpoint | None":
+        if not path.exists():
+            return None
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        # Replace the file atomically, so an interruption never leaves a partial checkpoint behind
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(dataclasses.asdict(self)), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def _iter_pages(
+    jira_fetcher: JiraFetcher, jql: str, start: int, page_size: int
+) -> Iterator[tuple[int, list[str], int | None]]:
+    """Page through the keys of the issues matched by a JQL query.
+
+    Yields:
+        The offset of the page, the issue keys in the page, and the total number of matched issues (if reported)
+    """
+    while True:
+        results = jira_fetcher.jira.search_issues(
+            jql, startAt=start, maxResults=page_size, fields="key", json_result=True
+        )
+        assert isinstance(results, dict)
+        keys = [entry["key"] for entry in results.get("issues") or ()]
+        if not keys:
+            return
+        total = results.get("total")
+        yield start, keys, total
+        start += len(keys)
+        if total is not None and start >= total:
+            return
+
+
+def export_issues(
+    jira_fetcher: JiraFetcher,
+    jql: str,
+    output: Path,
+    concurrency: int = 8,
+    page_size: int = 50,
+    resume: bool = False,
+    custom_fields: str | None = None,
+    on_progress: Callable[[ExportCheckpoint], None] | None = None,
+) -> ExportCheckpoint:
+    """Render the issues matched by a JQL query, and write them to a JSONL file (one issue per line).
+
+    The output is gzip-compressed if the file name ends with `.gz`.
+
+    Args:
+        jira_fetcher: The fetcher of the Jira site
+        jql: The JQL query
+        output: The path of the output file
+        concurrency: The number of issues rendered concurrently
+        page_size: The number of issues in each page of search results
+        resume: Continue from the checkpoint of an earlier export to the same file (if there is one)
+        custom_fields: Comma-separated names or IDs of custom fields to include
+        on_progress: Called with the checkpoint after each page
+
+    Returns:
+        The final state of the export. The checkpoint is kept if some issues failed or were rendered partially, so
+        they can be retried with `resume`.
+
+    Raises:
+        ValueError: If the checkpoint belongs to an export with a different query, custom fields, or output format
+        CircuitOpenError: If Jira became unavailable (the export can be resumed from the last checkpoint)
+        DeadlineExceeded: If the deadline passed (the export can be resumed from the last checkpoint)
+    """
+    compress = output.suffix == ".gz"
+    requested = ExportCheckpoint(
+        jql=with_stable_order(jql), custom_fields=custom_fields or "", output_format="jsonl.gz" if compress else "jsonl"
+    )
+    checkpoint_path = output.with_name(output.name + CHECKPOINT_SUFFIX)
+    checkpoint = ExportCheckpoint.load(checkpoint_path) if resume else None
+    if checkpoint is None:
+        checkpoint = requested
+    else:
+        checkpoint.check_matches(requested)
+        LOGGER.info(
+            f"Resuming the export from issue #{checkpoint.next_start} ({checkpoint.exported} exported, "
+            f"{checkpoint.failed} failed, {checkpoint.partial} partial)"
+        )
+
+    def _render_line(issue_key: str) -> tuple[str, bytes | None]:
+        """Render an issue to a line of the output (None if it failed), along with its status."""
+        try:
+            content = collect_issue_full(jira_fetcher, issue_key, custom_fields)
+        except (CircuitOpenError, DeadlineExceeded):
+            # The other issues would fail as well, so stop the export (it is resumed from the last checkpoint)
+            raise
+        except Exception as e:
+            LOGGER.warning(f"Failed to export {issue_key}: {e}")
+            return "failed", None
+        if "omitted_sections" in content:
+            LOGGER.warning(f"Skipping {issue_key} until its {', '.join(content['omitted_sections'])} can be fetched")
+            return "partial", None
+        return "exported", (json.dumps(content, cls=StrFallbackEncoder, ensure_ascii=False) + "\n").encode("utf-8")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("ab") as f, ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        def _write_page(keys: list[str]) -> None:
+            lines = []
+            try:
+                for issue_key, (status, line) in zip(keys, executor.map(_render_line, keys)):
+                    if status == "failed":
+                        checkpoint.failed_keys.append(issue_key)
+                    elif status == "partial":
+                        checkpoint.partial_keys.append(issue_key)
+                    else:
+                        lines.append(line)
+            except (CircuitOpenError, DeadlineExceeded):
+                # Don't render the rest of the page
+                executor.shutdown(cancel_futures=True)
+                raise
+            data = b"".join(lines)
+            # Each page is a separate gzip member, so the file can be truncated at any checkpoint
+            f.write(gzip.compress(data) if compress else data)
+            f.flush()
+            checkpoint.output_size = f.tell()
+            checkpoint.exported += len(lines)
+
+        def _save(pending: list[str]) -> None:
+            # The issues waiting to be retried are kept in the saved checkpoint until they are written
+            saved = dataclasses.replace(checkpoint, failed_keys=checkpoint.failed_keys + pending)
+            saved.save(checkpoint_path)
+            if on_progress is not None:
+                on_progress(saved)
+
+        # Drop whatever was written after the last checkpoint (or everything when not resuming)
+        f.truncate(checkpoint.output_size)
+        # Retry the issues that failed or were incomplete (they are listed again if they fail again)
+        pending = checkpoint.failed_keys + checkpoint.partial_keys
+        checkpoint.failed_keys, checkpoint.partial_keys = [], []
+        if pending:
+            LOGGER.info(f"Retrying {len(pending)} issues that failed or were incomplete")
+        while pending:
+            keys, pending = pending[:page_size], pending[page_size:]
+            _write_page(keys)
+            _save(pending)
+        for start, keys, total in _iter_pages(jira_fetcher, checkpoint.jql, checkpoint.next_start, page_size):
+            _write_page(keys)
+            checkpoint.next_start = start + len(keys)
+            checkpoint.total = total
+            _save([])
+    if checkpoint.complete:
+        checkpoint_path.unlink(missing_ok=True)
+    return checkpoint
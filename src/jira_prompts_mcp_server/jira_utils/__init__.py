@@ -1,4 +1,4 @@
-from .issues import IssuesMixin
+from .fetcher import JiraFetcher
+from .registry import JiraSiteRegistry
 
-
-class JiraFetcher(IssuesMixin): ...
+__all__ = ["JiraFetcher", "JiraSiteRegistry"]
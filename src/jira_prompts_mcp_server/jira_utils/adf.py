@@ -0,0 +1,236 @@
+"""Render Atlassian Document Format (ADF) documents to Markdown.
+
+Jira Cloud returns the rich-text fields (descriptions, comments, and multi-line custom fields) as ADF documents from
+the REST API v3. Unlike the Jira markup, ADF is already structured, so it is rendered in a single traversal of the
+document tree without any regex or HTML parsing passes.
+
+Reference: https://developer.atlassian.com/cloud/jira/platform/apis/document/structure/
+"""
+
+import re
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+LOGGER = logging.getLogger("jira_prompts.jira.adf")
+
+# Jira issue links (e.g., https://example.atlassian.net/browse/PROJ-123)
+_ISSUE_URL_PATTERN = re.compile(r"/browse/([A-Z][A-Z0-9_]*-\d+)(?:[?#/]|$)")
+_PANEL_TITLES = {"info": "Info", "note": "Note", "warning": "Warning", "error": "Error", "success": "Success"}
+
+Node = dict[str, Any]
+
+
+class AdfRenderer:
+    """Renders ADF documents to Markdown.
+
+    The output follows the conventions of `JiraPreprocessor.clean_jira_text`: mentions are rendered as
+    "@<display name>", links to issues are shortened to the issue keys, and the formatting without a Markdown
+    counterpart (underline, colors, superscripts, etc.) is dropped.
+    """
+
+    def __init__(self, resolve_user: Callable[[str], str | None] | None = None) -> None:
+        """
+        Args:
+            resolve_user: Looks up the display name of an account ID (used for mentions without a text)
+        """
+        self.resolve_user = resolve_user
+
+    def render(self, doc: Node | None) -> str:
+        if not doc:
+            return ""
+        return "\n".join(self._render_blocks(doc.get("content") or ())).strip()
+
+    # Block nodes are rendered to lists of lines, so the containers can indent or prefix the lines of their children
+
+    def _render_blocks(self, nodes, separator: bool = True) -> list[str]:
+        """Render a sequence of block nodes (separated by blank lines unless `separator` is False)."""
+        lines: list[str] = []
+        for node in nodes:
+            block = self._render_block(node)
+            if not block:
+                continue
+            if lines and separator:
+                lines.append("")
+            lines.extend(block)
+        return lines
+
+    def _render_block(self, node: Node) -> list[str]:
+        node_type = node.get("type")
+        attrs = node.get("attrs") or {}
+        content = node.get("content") or ()
+        if node_type == "paragraph":
+            text = self._render_inline(content)
+            return text.split("\n") if text else []
+        if node_type == "heading":
+            return ["#" * int(attrs.get("level") or 1) + " " + self._render_inline(content).replace("\n", " ")]
+        if node_type in ("bulletList", "orderedList", "taskList", "decisionList"):
+            return self._render_list(node)
+        if node_type == "codeBlock":
+            code = "".join(child.get("text", "") for child in content)
+            return [f"```{attrs.get('language') or ''}", *code.split("\n"), "```"]
+        if node_type == "blockquote":
+            return [f"> {line}" if line else ">" for line in self._render_blocks(content)]
+        if node_type == "panel":
+            title = _PANEL_TITLES.get(attrs.get("panelType"), "Note")
+            lines = self._render_blocks(content) or [""]
+            lines[0] = f"**{title}:** {lines[0]}"
+            return [f"> {line}" if line else ">" for line in lines]
+        if node_type in ("expand", "nestedExpand"):
+            title = attrs.get("title")
+            lines = self._render_blocks(content)
+            return [f"**{title}**", "", *lines] if title else lines
+        if node_type == "rule":
+            return ["---"]
+        if node_type == "table":
+            return self._render_table(node)
+        if node_type in ("mediaSingle", "mediaGroup"):
+            return [" ".join(self._render_media(child) for child in content)]
+        if node_type == "media":
+            return [self._render_media(node)]
+        if node_type in ("blockCard", "embedCard"):
+            return [self._render_card(attrs)]
+        # Extensions, layouts, and unknown nodes: render whatever content they have
+        if content:
+            if content[0].get("type") == "text" or node_type in ("taskItem", "decisionItem"):
+                text = self._render_inline(content)
+                return text.split("\n") if text else []
+            return self._render_blocks(content)
+        text = attrs.get("text")
+        return [text] if text else []
+
+    def _render_list(self, node: Node) -> list[str]:
+        node_type = node.get("type")
+        number = int((node.get("attrs") or {}).get("order") or 1)
+        lines = []
+        for item in node.get("content") or ():
+            if node_type == "orderedList":
+                marker = f"{number}. "
+                number += 1
+            elif item.get("type") == "taskItem":
+                marker = "- [x] " if (item.get("attrs") or {}).get("state") == "DONE" else "- [ ] "
+            else:
+                marker = "- "
+            if item.get("type") in ("taskItem", "decisionItem"):
+                item_lines = self._render_block(item)
+            else:
+                # The nested lists of a list item are kept together with its text
+                item_lines = self._render_blocks(item.get("content") or (), separator=False)
+            indent = " " * len(marker)
+            for i, line in enumerate(item_lines or [""]):
+                lines.append(marker + line if i == 0 else (indent + line if line else ""))
+        return lines
+
+    def _render_table(self, node: Node) -> list[str]:
+        rows = []
+        for row in node.get("content") or ():
+            cells = []
+            for cell in row.get("content") or ():
+                text = " ".join(self._render_blocks(cell.get("content") or (), separator=False))
+                cells.append(text.replace("|", "\\|"))
+            rows.append(cells)
+        if not rows:
+            return []
+        width = max(len(row) for row in rows)
+        lines = []
+        for i, row in enumerate(rows):
+            lines.append("|" + "|".join(row + [""] * (width - len(row))) + "|")
+            if i == 0:
+                lines.append("|" + "|".join(["---"] * width) + "|")
+        return lines
+
+    @staticmethod
+    def _render_media(node: Node) -> str:
+        attrs = node.get("attrs") or {}
+        if attrs.get("type") == "external" and attrs.get("url"):
+            return f"![{attrs.get('alt') or ''}]({attrs['url']})"
+        return f"[attachment: {attrs.get('alt') or attrs.get('id') or 'file'}]"
+
+    @staticmethod
+    def _render_card(attrs: dict[str, Any]) -> str:
+        url = attrs.get("url")
+        if not url:
+            return ""
+        match = _ISSUE_URL_PATTERN.search(url)
+        if match:
+            return f"[{match.group(1)}]({url})"
+        return f"<{url}>"
+
+    # Inline nodes are rendered to strings
+
+    def _render_inline(self, nodes) -> str:
+        parts = []
+        for node in nodes:
+            node_type = node.get("type")
+            if node_type == "text":
+                # Text is by far the most common node, so it takes the shortest path
+                marks = node.get("marks")
+                parts.append(self._apply_marks(node.get("text", ""), marks) if marks else node.get("text", ""))
+                continue
+            attrs = node.get("attrs") or {}
+            if node_type == "hardBreak":
+                parts.append("\n")
+            elif node_type == "mention":
+                parts.append(self._render_mention(attrs))
+            elif node_type == "emoji":
+                parts.append(attrs.get("text") or attrs.get("shortName") or "")
+            elif node_type == "inlineCard":
+                parts.append(self._render_card(attrs))
+            elif node_type == "date":
+                parts.append(self._render_date(attrs.get("timestamp")))
+            elif node_type == "status":
+                parts.append(f"[{attrs.get('text', '')}]")
+            elif node_type == "media" or node_type == "mediaInline":
+                parts.append(self._render_media(node))
+            elif node.get("content"):
+                parts.append(self._render_inline(node["content"]))
+            elif attrs.get("text"):
+                parts.append(attrs["text"])
+        return "".join(parts)
+
+    @staticmethod
+    def _apply_marks(text: str, marks) -> str:
+        # The delimiters must hug the text in Markdown ("* step*" is not emphasized), so the spaces are kept outside
+        core = text.strip()
+        if not core:
+            return text
+        start = text.index(core[0])
+        leading, trailing, text = text[:start], text[start + len(core) :], core
+        link = None
+        for mark in marks:
+            mark_type = mark.get("type")
+            if mark_type == "code":
+                text = f"`{text}`"
+            elif mark_type == "strong":
+                text = f"**{text}**"
+            elif mark_type == "em":
+                text = f"*{text}*"
+            elif mark_type == "strike":
+                text = f"~~{text}~~"
+            elif mark_type == "link":
+                link = (mark.get("attrs") or {}).get("href")
+        if link:
+            text = f"[{text}]({link})"
+        return leading + text + trailing
+
+    def _render_mention(self, attrs: dict[str, Any]) -> str:
+        text = (attrs.get("text") or "").lstrip("@")
+        if text:
+            return f"@<{text}>"
+        account_id = attrs.get("id")
+        if account_id and self.resolve_user is not None:
+            try:
+                display_name = self.resolve_user(account_id)
+            except Exception as e:
+                LOGGER.warning(f"Error looking up user {account_id}: {str(e)}")
+                display_name = None
+            if display_name:
+                return f"@<{display_name}>"
+        return f"@<{account_id or 'unknown'}>"
+
+    @staticmethod
+    def _render_date(timestamp: Any) -> str:
+        try:
+            return datetime.fromtimestamp(int(timestamp) / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            return str(timestamp or "")
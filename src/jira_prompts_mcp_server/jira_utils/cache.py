@@ -0,0 +1,257 @@
+"""In-memory caches for the Jira fetchers."""
+
+import sys
+import time
+import heapq
+import itertools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Objects whose size does not depend on what they reference
+_ATOMIC_TYPES = (str, bytes, int, float, bool, type(None))
+# The memory used by the bookkeeping of an entry (the ordered dict node, the timestamp, and the budget records)
+ENTRY_OVERHEAD = 512
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimate the memory used by an object along with the objects it references.
+
+    Containers, dicts, and the attributes of objects (including slotted dataclasses) are followed. Objects referenced
+    more than once are counted once.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (tuple, list, set, frozenset)):
+            stack.extend(obj)
+        else:
+            for cls in type(obj).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+    return size
+
+
+class MemoryBudget:
+    """A memory budget shared by several caches.
+
+    The size of each entry is estimated when it is stored. When the total exceeds the budget, entries are evicted
+    across the caches by GreedyDual-Size: an entry has a priority of L + cost / size (refreshed when it is read), where
+    L is the priority of the last evicted entry, and the entry with the lowest priority goes first. When all the
+    entries have the same cost and size, this is plain LRU; otherwise, the large entries that are cheap to rebuild go
+    before the small entries that are expensive to rebuild.
+
+    The caches sharing a budget share its lock, so the evictions from any cache are consistent with the accounting.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """
+        Args:
+            limit: The number of bytes the entries of the caches may use in total
+        """
+        self.limit = limit
+        self.used = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self._inflation = 0.0
+        # (cache, key) -> (sequence number, size, priority). Outdated heap items are skipped by their sequence numbers.
+        self._entries: dict[tuple["LRUCache", Hashable], tuple[int, int, float]] = {}
+        self._heap: list[tuple[float, int, "LRUCache", Hashable]] = []
+        self._counter = itertools.count()
+
+    # The methods below are called with the lock held
+
+    def _push(self, cache: "LRUCache", key: Hashable, size: int) -> None:
+        priority = self._inflation + cache.cost / max(size, 1)
+        seq = next(self._counter)
+        self._entries[(cache, key)] = (seq, size, priority)
+        heapq.heappush(self._heap, (priority, seq, cache, key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            # Drop the outdated items left behind by the reads
+            self._heap = [(p, s, c, k) for (c, k), (s, _, p) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _charge(self, cache: "LRUCache", key: Hashable, size: int) -> None:
+        """Account for a stored entry (replacing the previous value of the key), and evict entries if needed."""
+        self._release(cache, key)
+        self._push(cache, key, size)
+        self.used += size
+        cache.size_bytes += size
+        while self.used > self.limit and self._heap:
+            priority, seq, victim_cache, victim_key = heapq.heappop(self._heap)
+            entry = self._entries.get((victim_cache, victim_key))
+            if entry is None or entry[0] != seq:
+                continue
+            self._inflation = priority
+            self._release(victim_cache, victim_key)
+            victim_cache._entries.pop(victim_key, None)
+            self.evictions += 1
+
+    def _touch(self, cache: "LRUCache", key: Hashable) -> None:
+        """Refresh the priority of an entry that has been read."""
+        entry = self._entries.get((cache, key))
+        if entry is not None:
+            self._push(cache, key, entry[1])
+
+    def _release(self, cache: "LRUCache", key: Hashable) -> None:
+        """Stop accounting for an entry that has been removed."""
+        entry = self._entries.pop((cache, key), None)
+        if entry is not None:
+            self.used -= entry[1]
+            cache.size_bytes -= entry[1]
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            return {"limit_bytes": self.limit, "used_bytes": self.used, "evictions": self.evictions}
+
+
+class LRUCache(Generic[K, V]):
+    """A thread-safe LRU cache whose entries expire after a time-to-live.
+
+    A TTL of zero disables the cache (nothing is stored), and a TTL of None keeps the entries until they are evicted
+    or invalidated.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None, budget: MemoryBudget | None = None, cost: float = 1.0):
+        """
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Number of seconds before an entry expires
+            budget: The memory budget shared with other caches (None means the memory use is not accounted for)
+            cost: The relative cost of rebuilding an entry (used to pick the entries evicted to stay in the budget)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.budget = budget
+        self.cost = cost
+        # The estimated size of the entries (only tracked when there is a budget)
+        self.size_bytes = 0
+        # Key -> (the time the value was stored, the value)
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = budget.lock if budget is not None else threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and (self.ttl is None or self.ttl > 0)
+
+    def get(self, key: K) -> V | None:
+        """Get the value of a key, or None if it is not in the cache (or has expired)."""
+        entry = self.get_with_age(key)
+        return None if entry is None else entry[0]
+
+    def get_with_age(self, key: K, max_stale: float = 0.0) -> tuple[V, float, bool] | None:
+        """Get the value of a key along with its age, optionally accepting an expired value.
+
+        Args:
+            key: The key
+            max_stale: Seconds after its expiry during which a value is still returned
+
+        Returns:
+            The value, its age in seconds, and whether it is fresh (or None if there is no acceptable value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            fresh = self.ttl is None or age < self.ttl
+            if self.ttl is not None and age >= self.ttl + max_stale:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            if self.budget is not None:
+                self.budget._touch(self, key)
+            return value, age, fresh
+
+    def set(self, key: K, value: V) -> None:
+        if not self.enabled:
+            return
+        # Estimate the size before taking the lock, which may be shared with other caches
+        size = estimate_size((key, value)) + ENTRY_OVERHEAD if self.budget is not None else 0
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+            if self.budget is not None:
+                self.budget._charge(self, key, size)
+
+    def get_or_set(self, key: K, factory: Callable[[], V]) -> V:
+        """Get the value of a key, or compute and store it if it is not in the cache."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def replace(self, key: K, func: Callable[[V], V]) -> bool:
+        """Update the value of a cached key in place (keeping its age).
+
+        Returns:
+            Whether the key was in the cache
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            value = func(entry[1])
+            self._entries[key] = (entry[0], value)
+            if self.budget is not None:
+                self.budget._charge(self, key, estimate_size((key, value)) + ENTRY_OVERHEAD)
+            return True
+
+    def _remove(self, key: K) -> V | None:
+        """Remove a key (with the lock held)."""
+        entry = self._entries.pop(key, None)
+        if self.budget is not None:
+            self.budget._release(self, key)
+        return None if entry is None else entry[1]
+
+    def pop(self, key: K) -> V | None:
+        with self._lock:
+            return self._remove(key)
+
+    def pop_where(self, predicate: Callable[[K], bool]) -> int:
+        """Remove the keys that satisfy the predicate.
+
+        Returns:
+            The number of removed entries
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {"entries": len(self._entries)}
+        if self.budget is not None:
+            stats["size_bytes"] = self.size_bytes
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,15 +1,174 @@
 """Base client module for Jira API interactions."""
 
+import enum
+import time
+import random
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable
 
+import requests
 from jira import JIRA
+from requests.adapters import HTTPAdapter
 
+from .cache import LRUCache, MemoryBudget
 from .config import JiraConfig
 from .preprocessing import JiraPreprocessor
+from .records import IssueRecord
+from .resilience import CircuitBreaker, DeadlineExceeded, clamp_timeout, remaining_time
 
 # Configure logging
 LOGGER = logging.getLogger("jira_prompts.client")
 
+# The statuses of the responses that are retried, and the longest wait before a retry
+_RETRIED_STATUSES = frozenset({429, 503})
+_MAX_RETRY_DELAY = 60.0
+
+
+class RateLimiter:
+    """A thread-safe token bucket limiting the number of requests per second."""
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        """
+        Args:
+            rate: Number of requests allowed per second
+            burst: Maximum number of requests allowed in a burst (defaults to the rate rounded up)
+        """
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate + 0.999)))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request is allowed, but not past the deadline of the current request.
+
+        Raises:
+            DeadlineExceeded: If the request would not be allowed before the deadline
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            remaining = remaining_time()
+            if remaining is not None and wait >= remaining:
+                raise DeadlineExceeded("The deadline of the request would pass while waiting for the rate limit")
+            time.sleep(wait)
+
+
+class RefreshState(str, enum.Enum):
+    """The outcome of `JiraClient.refresh_in_background`."""
+
+    STARTED = "started"
+    RUNNING = "running"  # A refresh of the same entry is already running
+    UNAVAILABLE = "unavailable"  # The circuit breaker is open
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """An HTTP adapter that guards each request with the circuit breaker, the rate limiter, and the deadline.
+
+    It also retries the requests that failed with a recoverable error (a connection error, or a 429 or 503 response),
+    with exponential backoff like `jira.resilientsession.ResilientSession` (whose retries are disabled), but never
+    past the deadline and not while the circuit breaker is open.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter | None,
+        circuit_breaker: CircuitBreaker | None = None,
+        retries: int = 0,
+        **kwargs,
+    ) -> None:
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.retries = retries
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        timeout = kwargs.get("timeout")
+        attempt = 0
+        while True:
+            kwargs["timeout"] = clamp_timeout(timeout)
+            try:
+                response = self._send_once(request, **kwargs)
+            except requests.ConnectionError as e:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+                LOGGER.warning(f"{request.method} {request.url} failed ({e}); retrying in {delay:.1f} seconds")
+            else:
+                if response.status_code not in _RETRIED_STATUSES:
+                    return response
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                if delay is None:
+                    return response
+                LOGGER.warning(
+                    f"{request.method} {request.url} returned {response.status_code}; retrying in {delay:.1f} seconds"
+                )
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, attempt: int, retry_after: str | None = None) -> float | None:
+        """The seconds to wait before retrying a failed request.
+
+        Returns:
+            None if the request is not retried: the retries are used up, the circuit breaker is open, or the
+            deadline would pass before the retry
+        """
+        if attempt >= self.retries or (self.circuit_breaker is not None and self.circuit_breaker.is_open):
+            return None
+        if retry_after and retry_after.isdigit():
+            delay = 2.0 * max(int(retry_after), 1)
+        else:
+            delay = 10.0 * 2 ** (attempt + 1)
+        # Jitter keeps the clients from retrying in lockstep
+        delay = min(delay, _MAX_RETRY_DELAY) * random.uniform(0.5, 1.0)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    def _acquire_and_send(self, request, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+            # The wait for the rate limiter takes from the time left before the deadline
+            kwargs["timeout"] = clamp_timeout(kwargs.get("timeout"))
+        return super().send(request, **kwargs)
+
+    def _send_once(self, request, **kwargs):
+        if self.circuit_breaker is None:
+            return self._acquire_and_send(request, **kwargs)
+        self.circuit_breaker.before_request()
+        try:
+            response = self._acquire_and_send(request, **kwargs)
+        except DeadlineExceeded:
+            # Out of time before the request was sent, which says nothing about Jira
+            self.circuit_breaker.release()
+            raise
+        except (requests.ConnectionError, requests.Timeout) as e:
+            remaining = remaining_time()
+            if isinstance(e, requests.Timeout) and remaining is not None and remaining <= 0:
+                # The timeout was shortened to the deadline of the request, so it says nothing about Jira
+                self.circuit_breaker.release()
+                raise DeadlineExceeded("The deadline of the request has passed") from e
+            self.circuit_breaker.record_failure()
+            raise
+        except BaseException:
+            self.circuit_breaker.release()
+            raise
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
 
 class JiraClient:
     """Base client for Jira API interactions."""
@@ -26,18 +185,134 @@ class JiraClient:
         # Load configuration from environment variables if not provided
         self.config = config or JiraConfig.from_env()
 
-        # Initialize the Jira client based on auth type
+        # Initialize the Jira client based on auth type. `_RateLimitedAdapter` does the retries, and the server info
+        # (unused by the fetchers) is not fetched, so that no request is sent before the adapter is mounted.
         if self.config.auth_type == "token":
-            raise NotImplementedError("Token authentication is not supported yet")
+            assert self.config.personal_token, "Personal access token is required for token auth"
+            self.jira = JIRA(
+                self.config.url,
+                token_auth=self.config.personal_token,
+                timeout=self.config.timeout,
+                max_retries=0,
+                get_server_info=False,
+            )
         else:  # basic auth
             assert self.config.username and self.config.api_token, "Username and API token are required for basic auth"
             self.jira = JIRA(
                 self.config.url,
                 basic_auth=(self.config.username, self.config.api_token),
+                timeout=self.config.timeout,
+                max_retries=0,
+                get_server_info=False,
             )
 
-        self.preprocessor = JiraPreprocessor(base_url=self.config.url, jira_client=self.jira)
+        # Each client owns its connection pool, rate limiter, and circuit breaker
+        self.rate_limiter = RateLimiter(self.config.rate_limit) if self.config.rate_limit else None
+        self.circuit_breaker = (
+            CircuitBreaker(self.config.breaker_threshold, self.config.breaker_reset_timeout)
+            if self.config.breaker_threshold > 0
+            else None
+        )
+        adapter = _RateLimitedAdapter(
+            self.rate_limiter,
+            self.circuit_breaker,
+            retries=self.config.max_retries,
+            pool_connections=self.config.pool_size,
+            pool_maxsize=self.config.pool_size,
+        )
+        self.jira._session.mount("https://", adapter)
+        self.jira._session.mount("http://", adapter)
+
+        if self.config.adf and not self.config.is_cloud:
+            LOGGER.warning(f"ADF mode is only supported by Jira Cloud; using the Jira markup for {self.config.url}")
+
+        # The caches share the memory budget (if any). The costs are the relative costs of rebuilding the entries.
+        self.memory_budget = MemoryBudget(self.config.memory_budget) if self.config.memory_budget > 0 else None
+        budget = self.memory_budget
+        # Account ID -> display name
+        self.user_cache: LRUCache[str, str] = LRUCache(100, budget=budget, cost=4.0)
+        self.preprocessor = JiraPreprocessor(
+            base_url=self.config.url,
+            jira_client=self.jira,
+            offload_threshold=self.config.offload_threshold,
+            offload_max_workers=self.config.offload_max_workers,
+            user_cache=self.user_cache,
+        )
 
         # Cache for frequently used data
-        self._field_ids: dict[str, str] | None = None
         self._current_user_account_id: str | None = None
+        # "fields" -> the metadata of the fields (`FieldMetadata`), reloaded once per TTL. It is left out of the memory
+        # budget: it is a single small entry, and evicting it would reload the fields before the TTL.
+        self.field_cache: LRUCache[str, Any] = LRUCache(1, self.config.field_cache_ttl)
+        self._field_metadata_lock = threading.Lock()
+        cache_size, cache_ttl = self.config.cache_size, self.config.cache_ttl
+        # Issue key -> IssueRecord
+        self.issue_cache: LRUCache[str, IssueRecord] = LRUCache(cache_size, cache_ttl, budget=budget, cost=4.0)
+        # Comment ID -> (the update time of the comment, the body converted to markdown)
+        self.comment_cache: LRUCache[str, tuple[str, str]] = LRUCache(cache_size * 8, cache_ttl, budget=budget)
+        # (prompt name, issue key, requested custom fields) -> rendered prompt
+        self.prompt_cache: LRUCache[tuple[str, str, str], str] = LRUCache(
+            cache_size, cache_ttl, budget=budget, cost=2.0
+        )
+        # Issue ID -> issue key (webhook events about issue links only carry the issue IDs)
+        self.issue_keys_by_id: LRUCache[str, str] = LRUCache(cache_size * 4, budget=budget)
+
+        # Refreshes the stale cache entries that have been served
+        self._refresh_executor: ThreadPoolExecutor | None = None
+        self._refreshing: set[Hashable] = set()
+        self._refresh_lock = threading.Lock()
+
+    def refresh_in_background(self, key: Hashable, refresh: Callable[[], Any]) -> RefreshState:
+        """Run a refresh in a background thread, unless one with the same key is already running.
+
+        Args:
+            key: Identifies the refreshed entry
+            refresh: The function doing the refresh
+
+        Returns:
+            Whether the refresh was started, is already running, or was skipped as the circuit breaker is open
+        """
+        if self.circuit_breaker is not None and self.circuit_breaker.is_open:
+            return RefreshState.UNAVAILABLE
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return RefreshState.RUNNING
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jira-refresh")
+            self._refreshing.add(key)
+
+        def _run():
+            try:
+                refresh()
+            except Exception as e:
+                LOGGER.warning(f"Failed to refresh {key}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(_run)
+        return RefreshState.STARTED
+
+    def cache_stats(self) -> dict[str, Any]:
+        """The number of entries in each cache, and their estimated sizes and the usage of the memory budget (when
+        there is a budget)."""
+        caches = {
+            "issues": self.issue_cache,
+            "comments": self.comment_cache,
+            "prompts": self.prompt_cache,
+            "issue_keys": self.issue_keys_by_id,
+            "users": self.user_cache,
+            "fields": self.field_cache,
+        }
+        stats: dict[str, Any] = {"caches": {name: cache.stats() for name, cache in caches.items()}}
+        if self.memory_budget is not None:
+            stats["memory_budget"] = self.memory_budget.stats()
+        return stats
+
+    def close(self) -> None:
+        """Release the resources held by the client."""
+        with self._refresh_lock:
+            if self._refresh_executor is not None:
+                self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+                self._refresh_executor = None
+        self.jira.close()
@@ -37,6 +37,21 @@ def is_atlassian_cloud_url(url: str) -> bool:
     return ".atlassian.net" in hostname or ".jira.com" in hostname or ".jira-dev.com" in hostname
 
 
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(value: str) -> int:
+    """Parse a number of bytes, optionally with a binary unit (e.g., "512M", "1.5G", or "64KB").
+
+    Raises:
+        ValueError: If the value is not a valid size
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:I?B)?\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
 @dataclass
 class JiraConfig:
     """Jira API configuration.
@@ -51,6 +66,21 @@ class JiraConfig:
     api_token: str | None = None  # API token (Cloud)
     personal_token: str | None = None  # Personal access token (Server/DC)
     projects_filter: str | None = None  # List of project keys to filter searches
+    routed_projects: str | None = None  # List of project keys whose issues are fetched from this site (multiple sites)
+    offload_threshold: int = 1_000_000  # Texts at least this long are converted in a process pool (0 disables)
+    offload_max_workers: int | None = None  # Size of the conversion process pool (None means CPU count)
+    pool_size: int = 10  # Maximum number of pooled HTTP connections
+    rate_limit: float | None = None  # Maximum number of requests per second (None means unlimited)
+    cache_ttl: float = 0.0  # Seconds before cached issues and prompts expire (0 disables caching)
+    cache_size: int = 256  # Maximum number of entries in each cache
+    field_cache_ttl: float = 3600.0  # Seconds before the field metadata is reloaded
+    adf: bool = False  # Fetch the rich-text fields as ADF documents via the REST API v3 (Cloud only)
+    timeout: float | None = 30.0  # Seconds before an HTTP request times out (None means never)
+    max_retries: int = 3  # Number of retries of the requests that failed with a recoverable error (within the deadline)
+    breaker_threshold: int = 5  # Consecutive failures that open the circuit breaker (0 disables it)
+    breaker_reset_timeout: float = 30.0  # Seconds before an open circuit breaker lets a trial request through
+    stale_ttl: float = 3600.0  # Seconds after expiry during which a cached prompt is served while being refreshed
+    memory_budget: int = 0  # Bytes the cached entries of the site may use in total (0 disables the budget)
 
     @property
     def is_cloud(self) -> bool:
@@ -62,25 +92,40 @@ class JiraConfig:
         """
         return is_atlassian_cloud_url(self.url)
 
+    @property
+    def use_adf(self) -> bool:
+        """Whether the rich-text fields are fetched as ADF documents (only supported by Jira Cloud)."""
+        return self.adf and self.is_cloud
+
+    @property
+    def projects(self) -> set[str]:
+        """The keys of the projects routed to this site."""
+        if not self.routed_projects:
+            return set()
+        return {x.strip().upper() for x in self.routed_projects.split(",") if x.strip()}
+
     @classmethod
-    def from_env(cls) -> "JiraConfig":
+    def from_env(cls, prefix: str = "JIRA_") -> "JiraConfig":
         """Create configuration from environment variables.
 
+        Args:
+            prefix: Prefix of the environment variables (e.g., "JIRA_DC_" reads JIRA_DC_URL, JIRA_DC_USERNAME, etc.)
+
         Returns:
             JiraConfig with values from environment variables
 
         Raises:
             ValueError: If required environment variables are missing or invalid
         """
-        url = os.getenv("JIRA_URL")
+        url = os.getenv(f"{prefix}URL")
         if not url:
-            error_msg = "Missing required JIRA_URL environment variable"
+            error_msg = f"Missing required {prefix}URL environment variable"
             raise ValueError(error_msg)
 
         # Determine authentication type based on available environment variables
-        username = os.getenv("JIRA_USERNAME")
-        api_token = os.getenv("JIRA_API_TOKEN")
-        personal_token = os.getenv("JIRA_PERSONAL_TOKEN")
+        username = os.getenv(f"{prefix}USERNAME")
+        api_token = os.getenv(f"{prefix}API_TOKEN")
+        personal_token = os.getenv(f"{prefix}PERSONAL_TOKEN")
 
         # Use the shared utility function directly
         is_cloud = is_atlassian_cloud_url(url)
@@ -89,7 +134,7 @@ class JiraConfig:
             if username and api_token:
                 auth_type = "basic"
             else:
-                error_msg = "Cloud authentication requires JIRA_USERNAME and JIRA_API_TOKEN"
+                error_msg = f"Cloud authentication requires {prefix}USERNAME and {prefix}API_TOKEN"
                 raise ValueError(error_msg)
         else:  # Server/Data Center
             if personal_token:
@@ -98,11 +143,39 @@ class JiraConfig:
                 # Allow basic auth for Server/DC too
                 auth_type = "basic"
             else:
-                error_msg = "Server/Data Center authentication requires JIRA_PERSONAL_TOKEN"
+                error_msg = f"Server/Data Center authentication requires {prefix}PERSONAL_TOKEN"
                 raise ValueError(error_msg)
 
         # Get the projects filter if provided
-        projects_filter = os.getenv("JIRA_PROJECTS_FILTER")
+        projects_filter = os.getenv(f"{prefix}PROJECTS_FILTER")
+        # The projects whose issues are fetched from this site (when serving multiple sites)
+        routed_projects = os.getenv(f"{prefix}PROJECTS")
+
+        # Connection settings
+        pool_size = int(os.getenv(f"{prefix}POOL_SIZE", "10"))
+        rate_limit_env = os.getenv(f"{prefix}RATE_LIMIT")
+        rate_limit = float(rate_limit_env) if rate_limit_env else None
+
+        # Resilience settings
+        timeout = float(os.getenv(f"{prefix}TIMEOUT", "30")) or None
+        max_retries = int(os.getenv(f"{prefix}MAX_RETRIES", "3"))
+        breaker_threshold = int(os.getenv(f"{prefix}BREAKER_THRESHOLD", "5"))
+        breaker_reset_timeout = float(os.getenv(f"{prefix}BREAKER_RESET_TIMEOUT", "30"))
+
+        # Cache settings
+        cache_ttl = float(os.getenv(f"{prefix}CACHE_TTL", "0"))
+        cache_size = int(os.getenv(f"{prefix}CACHE_SIZE", "256"))
+        field_cache_ttl = float(os.getenv(f"{prefix}FIELD_CACHE_TTL", "3600"))
+        stale_ttl = float(os.getenv(f"{prefix}STALE_TTL", "3600"))
+        memory_budget = parse_size(os.getenv(f"{prefix}MEMORY_BUDGET", "0"))
+
+        # Fetch the rich-text fields in the Atlassian Document Format (Cloud only)
+        adf = os.getenv(f"{prefix}ADF", "").strip().lower() in ("1", "true", "yes")
+
+        # Settings for converting huge issue bodies in the process pool shared by all sites (not prefixed)
+        offload_threshold = int(os.getenv("JIRA_OFFLOAD_THRESHOLD", "1000000"))
+        offload_max_workers_env = os.getenv("JIRA_OFFLOAD_MAX_WORKERS")
+        offload_max_workers = int(offload_max_workers_env) if offload_max_workers_env else None
 
         return cls(
             url=url,
@@ -111,4 +184,19 @@ class JiraConfig:
             api_token=api_token,
             personal_token=personal_token,
             projects_filter=projects_filter,
+            routed_projects=routed_projects,
+            offload_threshold=offload_threshold,
+            offload_max_workers=offload_max_workers,
+            pool_size=pool_size,
+            rate_limit=rate_limit,
+            cache_ttl=cache_ttl,
+            cache_size=cache_size,
+            field_cache_ttl=field_cache_ttl,
+            adf=adf,
+            timeout=timeout,
+            max_retries=max_retries,
+            breaker_threshold=breaker_threshold,
+            breaker_reset_timeout=breaker_reset_timeout,
+            stale_ttl=stale_ttl,
+            memory_budget=memory_budget,
         )
@@ -0,0 +1,6 @@
+from .issues import IssuesMixin
+from .sprints import SprintsMixin
+from .webhooks import WebhooksMixin
+
+
+class JiraFetcher(IssuesMixin, SprintsMixin, WebhooksMixin): ...
@@ -0,0 +1,72 @@
+"""Field metadata, for requesting custom fields by name."""
+
+import logging
+from typing import Iterable
+
+from .client import JiraClient
+from .records import FieldRecord
+
+LOGGER = logging.getLogger("jira_prompts.fields")
+
+
+class FieldMetadata:
+    """The fields of a Jira site, indexed by ID and by (case-insensitive) name."""
+
+    def __init__(self, fields: Iterable[FieldRecord]) -> None:
+        self.by_id: dict[str, FieldRecord] = {}
+        self.ids_by_name: dict[str, str] = {}
+        for field in fields:
+            self.by_id[field.id] = field
+            name = field.name.casefold()
+            if name in self.ids_by_name:
+                LOGGER.warning(
+                    f'Multiple fields are named "{field.name}" ({self.ids_by_name[name]}, {field.id});'
+                    " use the field ID to pick the other one"
+                )
+                continue
+            self.ids_by_name[name] = field.id
+
+    def resolve(self, name_or_id: str) -> FieldRecord | None:
+        """Find a field by its ID (e.g., "customfield_10016") or name (e.g., "Story Points")."""
+        name_or_id = name_or_id.strip()
+        if name_or_id in self.by_id:
+            return self.by_id[name_or_id]
+        field_id = self.ids_by_name.get(name_or_id.casefold())
+        return None if field_id is None else self.by_id[field_id]
+
+
+class FieldsMixin(JiraClient):
+    def get_field_metadata(self) -> FieldMetadata:
+        """Get the metadata of the fields, loading it from the `/field` endpoint at most once per TTL."""
+        metadata = self.field_cache.get("fields")
+        if metadata is None:
+            # Only one thread loads the metadata, the others wait for it
+            with self._field_metadata_lock:
+                metadata = self.field_cache.get("fields")
+                if metadata is None:
+                    metadata = FieldMetadata(FieldRecord.from_raw(entry) for entry in self.jira.fields())
+                    self.field_cache.set("fields", metadata)
+                    LOGGER.info(f"Loaded the metadata of {len(metadata.by_id)} fields")
+        return metadata
+
+    def resolve_fields(self, names: Iterable[str]) -> dict[str, FieldRecord]:
+        """Map field names (or IDs) to the fields. Unknown names are weeded out.
+
+        Args:
+            names: The names or IDs of the fields
+
+        Returns:
+            A mapping from the requested names to the fields, in the requested order
+        """
+        names = [x.strip() for x in names if x.strip()]
+        if not names:
+            return {}
+        metadata = self.get_field_metadata()
+        results = {}
+        for name in names:
+            field = metadata.resolve(name)
+            if field is None:
+                LOGGER.warning(f'Unknown field: "{name}"')
+                continue
+            results[name] = field
+        return results
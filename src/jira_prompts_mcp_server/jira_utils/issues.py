@@ -1,17 +1,39 @@
 from typing import Iterable, Any
 
-from jira.resources import Issue
+from .fields import FieldsMixin
+from .records import CommentRecord, IssueRecord, RelatedIssueRecord
+from .resilience import check_deadline
 
-from .client import JiraClient
+# Fields required to build an `IssueRecord`
+ISSUE_RECORD_FIELDS = (
+    "summary",
+    "description",
+    "status",
+    "priority",
+    "issuetype",
+    "assignee",
+    "reporter",
+    "labels",
+    "created",
+    "updated",
+    "parent",
+    "issuelinks",
+    "subtasks",
+    "comment",
+)
+# Fields required to build the `RelatedIssueRecord` of a child issue
+CHILD_ISSUE_FIELDS = ("summary", "status", "issuetype", "created", "updated")
+# The REST API v3 (Cloud only) returns the rich-text fields as Atlassian Document Format (ADF) documents
+ADF_BASE_URL = "{server}/rest/api/3/{path}"
 
 
-class IssuesMixin(JiraClient):
+class IssuesMixin(FieldsMixin):
     def collect_comments(
         self,
-        issue: Issue,
+        issue: IssueRecord,
         limit: int = -1,  # Set limit to -1 to collect all comments
     ) -> list[dict[str, Any]]:
-        comments = sorted(issue.fields.comment.comments, key=lambda x: x.created, reverse=True)
+        comments = sorted(issue.comments, key=lambda x: x.created, reverse=True)
         if limit > 0:
             comments = comments[:limit]
         return [
@@ -20,67 +42,95 @@ class IssuesMixin(JiraClient):
                 "author": entry.author,
                 "created": entry.created,
                 "updated": entry.updated,
-                "body": self.preprocessor.clean_jira_text(entry.body),
+                "body": self._convert_comment_body(entry),
             }
             for entry in comments
         ]
 
+    def _convert_comment_body(self, comment: CommentRecord) -> str:
+        cached = self.comment_cache.get(comment.id)
+        if cached is not None and cached[0] == comment.updated:
+            return cached[1]
+        # Converting the comments of a long thread can take a while, so give up when the request runs out of time
+        check_deadline()
+        body = self.preprocessor.clean_body(comment.body)
+        self.comment_cache.set(comment.id, (comment.updated, body))
+        return body
+
     @staticmethod
-    def collect_links(issue: Issue):
-        links = issue.fields.issuelinks
-        results = []
-        for entry in links:
-            try:
-                results.append(
-                    {
-                        "relationship": entry.type.inward,
-                        "key": entry.inwardIssue.key,
-                        "summary": entry.inwardIssue.fields.summary,
-                        "status": entry.inwardIssue.fields.status.name,
-                        "type": entry.inwardIssue.fields.issuetype.name,
-                    }
-                )
-            except AttributeError:
-                results.append(
-                    {
-                        "relationship": entry.type.outward,
-                        "key": entry.outwardIssue.key,
-                        "summary": entry.outwardIssue.fields.summary,
-                        "status": entry.outwardIssue.fields.status.name,
-                        "type": entry.outwardIssue.fields.issuetype.name,
-                    }
-                )
-        return results
+    def collect_links(issue: IssueRecord):
+        return [
+            {
+                "relationship": entry.relationship,
+                "key": entry.issue.key,
+                "summary": entry.issue.summary,
+                "status": entry.issue.status,
+                "type": entry.issue.issuetype,
+            }
+            for entry in issue.links
+        ]
 
     @staticmethod
-    def collect_subtasks(issue):
+    def collect_subtasks(issue: IssueRecord):
         return [
             {
                 "key": entry.key,
-                "summary": entry.fields.summary,
-                "status": entry.fields.status.name,
-                "type": entry.fields.issuetype.name,
+                "summary": entry.summary,
+                "status": entry.status,
+                "type": entry.issuetype,
             }
-            for entry in issue.fields.subtasks
+            for entry in issue.subtasks
         ]
 
-    def collect_epic_children(self, issue) -> list[dict[str, str]]:
-        assert issue.fields.issuetype.name == "Epic"
+    def collect_epic_children(self, issue: IssueRecord) -> list[dict[str, str]]:
+        assert issue.issuetype == "Epic"
+        search_results = self.jira.search_issues(
+            f'"parent" = "{issue.key}"', maxResults=256, fields=list(CHILD_ISSUE_FIELDS), json_result=True
+        )
+        assert isinstance(search_results, dict)
         results = []
-        for child_issue in self.jira.search_issues(f'"parent" = "{issue.key}"', maxResults=256):
-            assert isinstance(child_issue, Issue)
+        for raw_issue in search_results["issues"]:
+            child_issue = RelatedIssueRecord.from_raw(raw_issue)
             results.append(
                 {
                     "key": child_issue.key,
-                    "summary": child_issue.fields.summary,
-                    "status": child_issue.fields.status.name,
-                    "type": child_issue.fields.issuetype.name,
-                    "created": child_issue.fields.created,
-                    "updated": child_issue.fields.updated,
+                    "summary": child_issue.summary,
+                    "status": child_issue.status,
+                    "type": child_issue.issuetype,
+                    "created": child_issue.created,
+                    "updated": child_issue.updated,
                 }
             )
         return sorted(results, key=lambda x: x["created"])
 
+    def fetch_issue_record(self, issue_key: str, custom_field_ids: Iterable[str] = ()) -> IssueRecord:
+        """Fetch an issue (or get it from the cache) as a compact record.
+
+        Only the fields needed by the record (and the requested custom fields) are fetched.
+
+        Args:
+            issue_key: The key of the issue
+            custom_field_ids: The IDs of the extra fields to include in the record
+        """
+        custom_field_ids = frozenset(custom_field_ids)
+        # Issue keys are case-insensitive
+        issue = self.issue_cache.get(issue_key.upper())
+        if issue is None or not custom_field_ids <= issue.custom_field_ids:
+            if issue is not None:
+                # Keep the custom fields of the cached record, so requests for different fields don't evict each other
+                custom_field_ids |= issue.custom_field_ids
+            field_ids = tuple(sorted(custom_field_ids))
+            params = {"fields": ",".join(ISSUE_RECORD_FIELDS + field_ids)}
+            if self.config.use_adf:
+                raw = self.jira._get_json(f"issue/{issue_key}", params=params, base=ADF_BASE_URL)
+            else:
+                raw = self.jira._get_json(f"issue/{issue_key}", params=params)
+            issue = IssueRecord.from_raw(raw, custom_field_ids=field_ids)
+            self.issue_cache.set(issue.key, issue)
+            if issue.id:
+                self.issue_keys_by_id.set(issue.id, issue.key)
+        return issue
+
     def get_issue_and_core_fields(
         self,
         issue_key: str,
@@ -97,14 +147,35 @@ class IssuesMixin(JiraClient):
             "updated",
             "issuetype",
         ),
-    ) -> tuple[dict[str, Any], Issue]:
-        issue = self.jira.issue(issue_key)
+        custom_fields: str | Iterable[str] = (),
+    ) -> tuple[dict[str, Any], IssueRecord]:
+        """Get the core fields of an issue, along with the requested custom fields.
+
+        Args:
+            issue_key: The key of the issue
+            fields: The IDs of the core fields (the fields that have a counterpart in the issue record)
+            custom_fields: The names (e.g., "Story Points") or IDs (e.g., "customfield_10016") of other fields.
+                The values are keyed by the requested names. Unknown fields are weeded out.
+
+        Returns:
+            The field values and the issue record
+        """
         if isinstance(fields, str):
             fields = fields.split(",")
-        # Weed out any non-existent keys
-        fields = [x for x in fields if x in issue.fields.__dict__]
-        results = {field: getattr(issue.fields, field) for field in fields}
-        # Special rule for "description" as it requires a conversion from the Jira markup format to the markdown format
+        if isinstance(custom_fields, str):
+            custom_fields = custom_fields.split(",")
+        name_to_field = self.resolve_fields(custom_fields)
+        issue = self.fetch_issue_record(issue_key, custom_field_ids=[x.id for x in name_to_field.values()])
+        # Weed out any non-existent keys (only the fields that have a counterpart in the issue record are supported)
+        fields = [x for x in fields if x in issue.available_fields and x in IssueRecord.__dataclass_fields__]
+        results = {field: getattr(issue, field) for field in fields}
+        # Special rule for "description" as it requires a conversion from the Jira markup format (or ADF) to markdown
         if "description" in results:
-            results["description"] = self.preprocessor.clean_jira_text(results["description"])
+            results["description"] = self.preprocessor.clean_body(results["description"])
+        custom_values = dict(issue.custom_fields)
+        for name, field in name_to_field.items():
+            value = custom_values.get(field.id)
+            if field.is_rich_text and isinstance(value, (str, dict)):
+                value = self.preprocessor.clean_body(value)
+            results[name] = value
         return results, issue
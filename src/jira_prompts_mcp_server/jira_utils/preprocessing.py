@@ -3,6 +3,10 @@
 import re
 import logging
 import warnings
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from functools import lru_cache
 from typing import Any
 
@@ -12,8 +16,64 @@ from markdownify import markdownify as md
 from bs4 import BeautifulSoup, Tag
 from bs4.element import NavigableString
 
+from .adf import AdfRenderer
+from .cache import LRUCache
+from .resilience import CircuitOpenError, DeadlineExceeded, remaining_time
+
 LOGGER = logging.getLogger("jira_prompts.jira.preprocessor")
 
+try:
+    import lxml  # noqa: F401
+
+    # lxml is considerably faster than the pure-Python parser bundled with the standard library
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Anything that looks like an opening, closing or self-closing tag
+_TAG_PATTERN = re.compile(r"</?([a-zA-Z][\w:-]*)(?:\s[^<>]*)?/?>")
+# Tags emitted by `JiraPreprocessor.jira_to_markdown` itself
+_CONVERTER_TAG_PATTERN = re.compile(r"</?(?:cite|ins|sup|sub)>|<span style=\"color:[^\"<>]*\">|</span>")
+# Elements that indicate genuine user-supplied HTML which needs the full conversion
+_HTML_ELEMENTS = frozenset(
+    (
+        "a abbr b blockquote br caption code col colgroup dd del details dfn div dl dt em figcaption figure font "
+        "h1 h2 h3 h4 h5 h6 hr i img kbd li mark ol p pre q s samp small span strike strong summary table tbody td "
+        "tfoot th thead tr tt u ul var cite ins sup sub"
+    ).split()
+)
+
+_ISSUE_KEY_URL_PATTERN = re.compile(r"browse/([A-Z]+-\d+)")
+_CONFLUENCE_PAGE_URL_PATTERN = re.compile(r"wiki/spaces/.+?/pages/\d+/(.+?)(?:\?|$)")
+_PAGE_TITLE_KEY_PREFIX_PATTERN = re.compile(r"^[A-Z]+-\d+\s+")
+# The placeholders of the code set aside by the converters (private-use characters, which no markup rule touches)
+_VERBATIM_START, _VERBATIM_END = "\ue000", "\ue001"
+_VERBATIM_PATTERN = re.compile(f"{_VERBATIM_START}(\\d+){_VERBATIM_END}")
+
+
+def _restore_verbatim(text: str, verbatim: list[str]) -> str:
+    """Put the code set aside by a converter back in place of its placeholders."""
+    if not verbatim:
+        return text
+    return _VERBATIM_PATTERN.sub(lambda match: verbatim[int(match.group(1))], text)
+
+
+# The same URLs tend to appear many times (in a text and across the comments of an issue), so the parsing is memoized
+@lru_cache(maxsize=4096)
+def _issue_key_in_url(url: str) -> str | None:
+    """Extract the issue key from a link to a Jira issue."""
+    match = _ISSUE_KEY_URL_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+@lru_cache(maxsize=4096)
+def _confluence_page_title_in_url(url: str) -> str | None:
+    """Extract a readable page title from a link to a Confluence page."""
+    match = _CONFLUENCE_PAGE_URL_PATTERN.search(url)
+    if not match:
+        return None
+    return _PAGE_TITLE_KEY_PREFIX_PATTERN.sub("", match.group(1).replace("+", " "))
+
 
 class BasePreprocessor:
     """Base class for text preprocessing operations."""
@@ -118,34 +178,68 @@ class BasePreprocessor:
         user_element.replace_with(new_element)
 
     def _convert_html_to_markdown(self, text: str) -> str:
-        """Convert HTML content to markdown if needed."""
-        if re.search(r"<[^>]+>", text):
-            try:
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore", category=UserWarning)
-                    soup = BeautifulSoup(f"<div>{text}</div>", "html.parser")
-                    html = str(soup.div.decode_contents()) if soup.div else text
-                    text = md(html)
-            except Exception as e:
-                LOGGER.warning(f"Error converting HTML to markdown: {str(e)}")
+        """Convert HTML content to markdown if needed.
+
+        Text that only contains the tags produced by `jira_to_markdown` is handled by simply stripping
+        those tags, which is what markdownify would have done with them. The (much slower) BeautifulSoup
+        and markdownify round trip is reserved for text containing genuine HTML elements.
+        """
+        if "<" not in text:
+            return text
+        needs_soup = False
+        for match in _TAG_PATTERN.finditer(text):
+            if match.group(1).lower() not in _HTML_ELEMENTS:
+                # Not an HTML element (e.g. autolinks like <https://...> or mentions like @<John Doe>)
+                continue
+            if not _CONVERTER_TAG_PATTERN.fullmatch(match.group(0)):
+                needs_soup = True
+                break
+        if not needs_soup:
+            return _CONVERTER_TAG_PATTERN.sub("", text)
+        try:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=UserWarning)
+                soup = BeautifulSoup(f"<div>{text}</div>", HTML_PARSER)
+                html = str(soup.div.decode_contents()) if soup.div else text
+                text = md(html)
+        except Exception as e:
+            LOGGER.warning(f"Error converting HTML to markdown: {str(e)}")
         return text
 
 
 class JiraPreprocessor(BasePreprocessor):
     """Handles text preprocessing for Jira content."""
 
-    def __init__(self, jira_client: jira.JIRA, base_url: str = "", **kwargs: Any) -> None:
+    _MENTION_PATTERN = re.compile(r"\[~accountid:(.*?)\]")
+    _SMART_LINK_PATTERN = re.compile(r"\[(.*?)\|(.*?)\|smart-link\]")
+
+    def __init__(
+        self,
+        jira_client: jira.JIRA | None,
+        base_url: str = "",
+        offload_threshold: int = 0,
+        offload_max_workers: int | None = None,
+        user_cache: LRUCache[str, str] | None = None,
+        **kwargs: Any,
+    ) -> None:
         """
         Initialize the Jira text preprocessor.
 
         Args:
+            jira_client: Jira client used to resolve user mentions (None disables the lookups)
             base_url: Base URL for Jira API
+            offload_threshold: Texts with at least this many characters are converted in a process pool
+                (0 disables the offloading)
+            offload_max_workers: Maximum number of worker processes in the pool
+            user_cache: The cache of the display names of the users (created if not given)
             **kwargs: Additional arguments for the base class
         """
         super().__init__(base_url=base_url, **kwargs)
         self.jira_client = jira_client
-        # Create a method with LRU cache bound to this instance
-        self._find_user = self._create_cached_find_user()
+        self.offload_threshold = offload_threshold
+        self.offload_max_workers = offload_max_workers
+        self.user_cache: LRUCache[str, str] = user_cache if user_cache is not None else LRUCache(100)
+        self._adf_renderer = AdfRenderer(resolve_user=self._find_display_name if jira_client else None)
 
     def clean_jira_text(self, text: str) -> str:
         """
@@ -157,10 +251,33 @@ class JiraPreprocessor(BasePreprocessor):
         if not text:
             return ""
 
-        # Process user mentions
-        mention_pattern = r"\[~accountid:(.*?)\]"
-        text = self._process_mentions(text, mention_pattern)
+        # Process user mentions (requires the Jira client, so it always runs in this process)
+        text = self._process_mentions(text)
 
+        if self.offload_threshold > 0 and len(text) >= self.offload_threshold:
+            # Large bodies would hold the GIL for seconds; convert them in a worker process instead
+            LOGGER.debug(f"Offloading the conversion of a text with {len(text)} characters")
+            pool = _get_offload_pool(self.offload_max_workers, self.base_url)
+            future = pool.submit(_convert_in_worker, text, self.base_url)
+            try:
+                return future.result(timeout=remaining_time())
+            except FuturesTimeoutError:
+                future.cancel()
+                raise DeadlineExceeded("The deadline of the request has passed") from None
+        return self._convert_markup(text)
+
+    def clean_adf(self, doc: dict[str, Any] | None) -> str:
+        """Render an Atlassian Document Format (ADF) document (returned by the REST API v3) to markdown."""
+        return self._adf_renderer.render(doc)
+
+    def clean_body(self, body: str | dict[str, Any] | None) -> str:
+        """Convert a rich-text field to markdown, whether it is in the Jira markup format or an ADF document."""
+        if isinstance(body, dict):
+            return self.clean_adf(body)
+        return self.clean_jira_text(body or "")
+
+    def _convert_markup(self, text: str) -> str:
+        """Convert Jira markup (and any remaining HTML) to markdown. This step is CPU-bound only."""
         # Process Jira smart links
         text = self._process_smart_links(text)
 
@@ -172,67 +289,73 @@ class JiraPreprocessor(BasePreprocessor):
 
         return text.strip()
 
-    def _create_cached_find_user(self):
-        """Create a cached version of the find_user method."""
-
-        @lru_cache(maxsize=100)
-        def cached_find_user(account_id):
-            """Cached version of user lookup by account ID."""
+    def _find_display_name(self, account_id: str) -> str:
+        """Look up the display name of a user by account ID (cached)."""
+        display_name = self.user_cache.get(account_id)
+        if display_name is None:
             LOGGER.debug(f"Cache miss for user: {account_id}")
-            return self.jira_client.user(account_id)
-
-        return cached_find_user
+            assert self.jira_client is not None
+            display_name = self.jira_client.user(account_id).displayName
+            self.user_cache.set(account_id, display_name)
+        return display_name
 
-    def _process_mentions(self, text: str, pattern: str) -> str:
+    def _process_mentions(self, text: str, pattern: str | re.Pattern[str] | None = None) -> str:
         """
         Process user mentions in text.
 
         Args:
             text: The text containing mentions
-            pattern: Regular expression pattern to match mentions
+            pattern: Regular expression pattern to match mentions (the account ID is the first group)
 
         Returns:
             Text with mentions replaced with display names
         """
-        mentions = re.findall(pattern, text)
-        for account_id in mentions:
-            try:
-                display_name = f"@<{self.jira_client.user(account_id).displayName}>"
-                text = text.replace(f"[~accountid:{account_id}]", display_name)
-            except Exception as e:
-                LOGGER.error(f"Error processing mention for {account_id}: {str(e)}")
-        return text
+        if self.jira_client is None:
+            return text
+        pattern = self._MENTION_PATTERN if pattern is None else pattern
+        # Account ID -> the replacement (each user is looked up once per text)
+        replacements: dict[str, str] = {}
+        unavailable = False
+
+        def _replace(match: re.Match) -> str:
+            nonlocal unavailable
+            account_id = match.group(1)
+            if account_id in replacements:
+                return replacements[account_id]
+            replacement = match.group(0)
+            if not unavailable:
+                try:
+                    replacement = f"@<{self._find_display_name(account_id)}>"
+                except (CircuitOpenError, DeadlineExceeded) as e:
+                    # Jira is unavailable (or out of time): leave the remaining mentions as they are
+                    LOGGER.warning(f"Skipping the lookups of the mentions: {str(e)}")
+                    unavailable = True
+                except Exception as e:
+                    LOGGER.error(f"Error processing mention for {account_id}: {str(e)}")
+            replacements[account_id] = replacement
+            return replacement
+
+        return re.sub(pattern, _replace, text)
 
     def _process_smart_links(self, text: str) -> str:
         """Process Jira/Confluence smart links."""
         # Pattern matches: [text|url|smart-link]
-        link_pattern = r"\[(.*?)\|(.*?)\|smart-link\]"
-        matches = re.finditer(link_pattern, text)
-
-        for match in matches:
-            full_match = match.group(0)
-            link_text = match.group(1)
-            link_url = match.group(2)
-
-            # Extract issue key if it's a Jira issue link
-            issue_key_match = re.search(r"browse/([A-Z]+-\d+)", link_url)
-            # Check if it's a Confluence wiki link
-            confluence_match = re.search(r"wiki/spaces/.+?/pages/\d+/(.+?)(?:\?|$)", link_url)
-
-            if issue_key_match:
-                issue_key = issue_key_match.group(1)
-                clean_url = f"{self.base_url}/browse/{issue_key}"
-                text = text.replace(full_match, f"[{issue_key}]({clean_url})")
-            elif confluence_match:
-                url_title = confluence_match.group(1)
-                readable_title = url_title.replace("+", " ")
-                readable_title = re.sub(r"^[A-Z]+-\d+\s+", "", readable_title)
-                text = text.replace(full_match, f"[{readable_title}]({link_url})")
-            else:
-                clean_url = link_url.split("?")[0]
-                text = text.replace(full_match, f"[{link_text}]({clean_url})")
-
-        return text
+        return self._SMART_LINK_PATTERN.sub(self._replace_smart_link, text)
+
+    def _replace_smart_link(self, match: re.Match) -> str:
+        link_text = match.group(1)
+        link_url = match.group(2)
+
+        # Jira issue link
+        issue_key = _issue_key_in_url(link_url)
+        if issue_key:
+            return f"[{issue_key}]({self.base_url}/browse/{issue_key})"
+        # Confluence wiki link
+        page_title = _confluence_page_title_in_url(link_url)
+        if page_title is not None:
+            return f"[{page_title}]({link_url})"
+        clean_url = link_url.split("?")[0]
+        return f"[{link_text}]({clean_url})"
 
     def jira_to_markdown(self, input_text: str) -> str:
         """
@@ -247,12 +370,31 @@ class JiraPreprocessor(BasePreprocessor):
         if not input_text:
             return ""
 
+        # Code blocks (with optional language specification), no format blocks, and inline code are converted first and
+        # set aside, so the markup in them is left alone
+        verbatim: list[str] = []
+
+        def _set_aside(text: str) -> str:
+            verbatim.append(text)
+            return f"{_VERBATIM_START}{len(verbatim) - 1}{_VERBATIM_END}"
+
+        output = re.sub(
+            r"\{code(?::([a-z]+))?\}\n?([\s\S]*?)\n?\{code\}",
+            lambda match: _set_aside(f"```{match.group(1) or ''}\n{match.group(2)}\n```"),
+            input_text,
+        )
+        output = re.sub(
+            r"\{noformat\}\n?([\s\S]*?)\n?\{noformat\}", lambda match: _set_aside(f"```\n{match.group(1)}\n```"), output
+        )
+        output = re.sub(r"\{\{([^}]+)\}\}", lambda match: _set_aside(f"`{match.group(1)}`"), output)
+
         # Block quotes
-        output = re.sub(r"^bq\.(.*?)$", r"> \1\n", input_text, flags=re.MULTILINE)
+        output = re.sub(r"^bq\.(.*?)$", r"> \1\n", output, flags=re.MULTILINE)
 
-        # Text formatting (bold, italic)
+        # Text formatting (bold, italic). The opening marker must be followed by text, so the markers of bulleted lists
+        # ("* item", "** nested item") are left alone
         output = re.sub(
-            r"(?<![a-zA-Z0-9])([*_])(.*?)\1",
+            r"(?<![a-zA-Z0-9])([*_])(?![\s*_])(.*?)\1",
             lambda match: ("**" if match.group(1) == "*" else "*")
             + match.group(2)
             + ("**" if match.group(1) == "*" else "*"),
@@ -275,34 +417,18 @@ class JiraPreprocessor(BasePreprocessor):
             flags=re.MULTILINE,
         )
 
-        # Inline code
-        output = re.sub(r"\{\{([^}]+)\}\}", r"`\1`", output)
-
-        # Citation
-        output = re.sub(r"\?\?((?:.[^?]|[^?].)+)\?\?", r"<cite>\1</cite>", output)
+        # Citation (the content is a sequence of character pairs other than "??" and two line breaks; the lookahead
+        # keeps the pairs unambiguous, or the backtracking would be exponential in the length of an unclosed citation)
+        output = re.sub(r"\?\?((?:(?!\?\?|\n\n)[\s\S]{2})+)\?\?", r"<cite>\1</cite>", output)
 
-        # Inserted text
-        output = re.sub(r"\+([^+]*)\+", r"<ins>\1</ins>", output)
-
-        # Superscript
-        output = re.sub(r"\^([^^]*)\^", r"<sup>\1</sup>", output)
-
-        # Subscript
-        output = re.sub(r"~([^~]*)~", r"<sub>\1</sub>", output)
-
-        # Strikethrough
-        output = re.sub(r"-([^-]*)-", r"-\1-", output)
-
-        # Code blocks with optional language specification
-        output = re.sub(
-            r"\{code(?::([a-z]+))?\}([\s\S]*?)\{code\}",
-            r"```\1\n\2\n```",
-            output,
-            flags=re.MULTILINE,
-        )
-
-        # No format
-        output = re.sub(r"\{noformat\}([\s\S]*?)\{noformat\}", r"```\n\1\n```", output)
+        # Inserted text, superscript, subscript, and strikethrough. The text between the markers stays on one line and
+        # neither starts nor ends with a space. The "+" and "-" markers must also be at word boundaries, unlike those in
+        # "ACME-12+Checkout+Runbook", and "[~" starts a mention rather than a subscript. Each pattern starts with
+        # its marker (the lookbehinds come after it), so the regex engine can skip to the markers.
+        output = re.sub(r"\+(?<![\w+]\+)([^\s+](?:[^+\n]*?[^\s+])?)\+(?![\w+])", r"<ins>\1</ins>", output)
+        output = re.sub(r"\^([^\s^](?:[^^\n]*?[^\s^])?)\^", r"<sup>\1</sup>", output)
+        output = re.sub(r"~(?<!\[~)([^\s~](?:[^~\n]*?[^\s~])?)~", r"<sub>\1</sub>", output)
+        output = re.sub(r"-(?<![\w-]-)([^\s-](?:[^-\n]*?[^\s-])?)-(?![\w-])", r"~~\1~~", output)
 
         # Quote blocks
         output = re.sub(
@@ -325,14 +451,16 @@ class JiraPreprocessor(BasePreprocessor):
         # Images without parameters
         output = re.sub(r"!([^\n\s!]+)!", r"![](\1)", output)
 
-        # Links
-        output = re.sub(r"\[([^|]+)\|(.+?)\]", r"[\1](\2)", output)
-        output = re.sub(r"\[(.+?)\]([^\(]+)", r"<\1>\2", output)
+        # Links (the text of a link stays on its line and before the closing bracket; otherwise every "[" without a "|"
+        # after it scans to the end of the text, which is quadratic in the length of the text)
+        output = re.sub(r"\[([^|\]\n]+)\|(.+?)\]", r"[\1](\2)", output)
+        # Any other bracketed text is a URL (or a mention)
+        output = re.sub(r"\[([^\[\]\n]+)\](?!\()", r"<\1>", output)
 
         # Colored text
         output = re.sub(
             r"\{color:([^}]+)\}([\s\S]*?)\{color\}",
-            r"<span style=\"color:\1\">\2</span>",
+            r'<span style="color:\1">\2</span>',
             output,
             flags=re.MULTILINE,
         )
@@ -359,7 +487,7 @@ class JiraPreprocessor(BasePreprocessor):
         # Rejoin the lines
         output = "\n".join(lines)
 
-        return output
+        return _restore_verbatim(output, verbatim)
 
     def markdown_to_jira(self, input_text: str) -> str:
         """
@@ -374,9 +502,8 @@ class JiraPreprocessor(BasePreprocessor):
         if not input_text:
             return ""
 
-        # Save code blocks to prevent recursive processing
-        code_blocks = []
-        inline_codes = []
+        # Save code blocks to prevent recursive processing (they are replaced with placeholders until the end)
+        code_blocks: list[str] = []
 
         # Extract code blocks
         def save_code_block(match: re.Match) -> str:
@@ -394,9 +521,9 @@ class JiraPreprocessor(BasePreprocessor):
             code = "{code"
             if syntax:
                 code += ":" + syntax
-            code += "}" + content + "{code}"
+            code += "}\n" + content + "{code}"
             code_blocks.append(code)
-            return str(code)  # Ensure we return a string
+            return f"{_VERBATIM_START}{len(code_blocks) - 1}{_VERBATIM_END}"
 
         # Extract inline code
         def save_inline_code(match: re.Match) -> str:
@@ -411,8 +538,8 @@ class JiraPreprocessor(BasePreprocessor):
             """
             content = match.group(1)
             code = "{{" + content + "}}"
-            inline_codes.append(code)
-            return str(code)  # Ensure we return a string
+            code_blocks.append(code)
+            return f"{_VERBATIM_START}{len(code_blocks) - 1}{_VERBATIM_END}"
 
         # Save code sections temporarily
         output = re.sub(r"```(\w*)\n([\s\S]+?)```", save_code_block, input_text)
@@ -443,21 +570,18 @@ class JiraPreprocessor(BasePreprocessor):
             output,
         )
 
-        # Multi-level bulleted list
+        # Multi-level bulleted list: two spaces of indentation per level become one more marker ("** nested item"). The
+        # indentation must not span lines, or the blank line before a list is consumed.
         output = re.sub(
-            r"^(\s*)- (.*)$",
-            lambda match: (
-                "* " + match.group(2)
-                if not match.group(1)
-                else "  " * (len(match.group(1)) // 2) + "* " + match.group(2)
-            ),
+            r"^([ \t]*)- (.*)$",
+            lambda match: "*" * (len(match.group(1)) // 2 + 1) + " " + match.group(2),
             output,
             flags=re.MULTILINE,
         )
 
         # Multi-level numbered list
         output = re.sub(
-            r"^(\s+)1\. (.*)$",
+            r"^([ \t]+)1\. (.*)$",
             lambda match: "#" * (int(len(match.group(1)) / 4) + 2) + " " + match.group(2),
             output,
             flags=re.MULTILINE,
@@ -504,7 +628,7 @@ class JiraPreprocessor(BasePreprocessor):
         # Rejoin the lines
         output = "\n".join(lines)
 
-        return output
+        return _restore_verbatim(output, code_blocks)
 
     def _convert_jira_list_to_markdown(self, match: re.Match) -> str:
         """
@@ -528,3 +652,67 @@ class JiraPreprocessor(BasePreprocessor):
         prefix = "1." if last_char == "#" else "-"
 
         return f"{indent}{prefix} {content}"
+
+
+# The conversion process pool, shared by the preprocessors of all the sites
+_OFFLOAD_POOL: ProcessPoolExecutor | None = None
+_OFFLOAD_LOCK = threading.Lock()
+
+
+def _get_offload_pool(max_workers: int | None, base_url: str) -> ProcessPoolExecutor:
+    """Create the conversion process pool on first use. The workers stay alive until `shutdown_offload_pool` is called.
+
+    Args:
+        max_workers: Maximum number of worker processes (only used when the pool is created)
+        base_url: The base URL of the site creating the pool, whose preprocessor the workers build when they start
+    """
+    global _OFFLOAD_POOL
+    with _OFFLOAD_LOCK:
+        if _OFFLOAD_POOL is None:
+            LOGGER.info(f"Starting the conversion process pool (max_workers={max_workers})")
+            _OFFLOAD_POOL = ProcessPoolExecutor(
+                max_workers=max_workers,
+                # Avoid forking a process that is running an event loop and threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_offload_worker,
+                initargs=(base_url,),
+            )
+        return _OFFLOAD_POOL
+
+
+def shutdown_offload_pool() -> None:
+    """Shut down the conversion process pool if it has been started."""
+    global _OFFLOAD_POOL
+    with _OFFLOAD_LOCK:
+        if _OFFLOAD_POOL is not None:
+            _OFFLOAD_POOL.shutdown(cancel_futures=True)
+            _OFFLOAD_POOL = None
+
+
+# The preprocessors owned by a conversion worker process, one per base URL (the sites share the pool)
+_WORKER_PREPROCESSORS: dict[str, JiraPreprocessor] = {}
+
+
+def _init_offload_worker(base_url: str) -> None:
+    """Build the preprocessor of a site when a worker process starts.
+
+    This imports the converters (and their dependencies) in the new process, so the first offloaded conversion
+    doesn't pay for it while a request is waiting.
+    """
+    _WORKER_PREPROCESSORS[base_url] = JiraPreprocessor(jira_client=None, base_url=base_url)
+
+
+def _convert_in_worker(text: str, base_url: str) -> str:
+    """Convert a text from the Jira markup to markdown in a worker process of the conversion pool.
+
+    The mentions have been processed by the caller, as the lookups need the Jira client. The preprocessors of the
+    other sites sharing the pool are built on their first conversion.
+
+    Args:
+        text: The text to convert
+        base_url: The base URL of the site of the text
+    """
+    preprocessor = _WORKER_PREPROCESSORS.get(base_url)
+    if preprocessor is None:
+        preprocessor = _WORKER_PREPROCESSORS[base_url] = JiraPreprocessor(jira_client=None, base_url=base_url)
+    return preprocessor._convert_markup(text)
@@ -0,0 +1,223 @@
+"""Compact, immutable records built from the raw JSON returned by the Jira REST API.
+
+The `jira.resources.Issue` objects keep the raw JSON alive along with a nested tree of
+`PropertyHolder` objects for every field. These records only keep the values the prompts need.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+# The custom field types whose values are in the Jira markup format (the other text fields are plain text)
+RICH_TEXT_CUSTOM_FIELD_TYPES = frozenset({"com.atlassian.jira.plugin.system.customfieldtypes:textarea"})
+# The system fields whose values are in the Jira markup format
+RICH_TEXT_SYSTEM_FIELDS = frozenset({"description", "environment"})
+# Jira Server/DC returns sprints as strings like "com.atlassian.greenhopper.service.sprint.Sprint@1a2b[id=1,name=...]"
+_SPRINT_NAME_PATTERN = re.compile(r"\bname=([^,\]]*)")
+
+
+def _name_of(raw: dict[str, Any] | None) -> str | None:
+    """Extract the name of a named entity (status, priority, issue type, etc.)."""
+    if not raw:
+        return None
+    return raw.get("name")
+
+
+def simplify_field_value(value: Any) -> Any:
+    """Reduce the raw value of a (custom) field to what the prompts show.
+
+    Options, users, versions, sprints, and other entities are reduced to their names. Lists become tuples.
+    """
+    if isinstance(value, list):
+        return tuple(simplify_field_value(x) for x in value)
+    if isinstance(value, dict):
+        for key in ("value", "displayName", "name", "key"):
+            if key in value:
+                if key == "value" and "child" in value:
+                    # A cascading select option
+                    return f"{value['value']} - {simplify_field_value(value['child'])}"
+                return value[key]
+        return value
+    if isinstance(value, str) and value.startswith("com.atlassian.greenhopper.service.sprint.Sprint@"):
+        match = _SPRINT_NAME_PATTERN.search(value)
+        return match.group(1) if match else value
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class FieldRecord:
+    """The metadata of a field returned by the `/field` endpoint."""
+
+    id: str
+    name: str
+    custom: bool
+    schema_type: str | None  # e.g., "string", "number", "array"
+    schema_custom: str | None  # The type of a custom field (e.g., "...customfieldtypes:textarea")
+
+    @property
+    def is_rich_text(self) -> bool:
+        """Whether the values are in the Jira markup format, and need to be converted to Markdown."""
+        if self.custom:
+            return self.schema_custom in RICH_TEXT_CUSTOM_FIELD_TYPES
+        return self.id in RICH_TEXT_SYSTEM_FIELDS
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any]) -> "FieldRecord":
+        schema = raw.get("schema") or {}
+        return cls(
+            id=raw["id"],
+            name=raw.get("name") or raw["id"],
+            custom=bool(raw.get("custom")),
+            schema_type=schema.get("type"),
+            schema_custom=schema.get("custom"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    """A Jira user."""
+
+    account_id: str | None  # Account ID (Cloud) or username (Server/DC)
+    display_name: str
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any] | None) -> "UserRecord | None":
+        if not raw:
+            return None
+        return cls(
+            account_id=raw.get("accountId") or raw.get("name"),
+            display_name=raw.get("displayName") or raw.get("name") or "",
+        )
+
+    def __str__(self) -> str:
+        return self.display_name
+
+
+@dataclass(frozen=True, slots=True)
+class RelatedIssueRecord:
+    """An issue referenced by another issue (parent, subtask, linked issue, or child issue of an epic)."""
+
+    key: str
+    summary: str | None
+    status: str | None
+    issuetype: str | None
+    created: str | None = None
+    updated: str | None = None
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any]) -> "RelatedIssueRecord":
+        fields = raw.get("fields") or {}
+        return cls(
+            key=raw["key"],
+            summary=fields.get("summary"),
+            status=_name_of(fields.get("status")),
+            issuetype=_name_of(fields.get("issuetype")),
+            created=fields.get("created"),
+            updated=fields.get("updated"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LinkRecord:
+    """A link from an issue to another issue."""
+
+    relationship: str
+    issue: RelatedIssueRecord
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any]) -> "LinkRecord":
+        if "inwardIssue" in raw:
+            return cls(relationship=raw["type"]["inward"], issue=RelatedIssueRecord.from_raw(raw["inwardIssue"]))
+        return cls(relationship=raw["type"]["outward"], issue=RelatedIssueRecord.from_raw(raw["outwardIssue"]))
+
+
+@dataclass(frozen=True, slots=True)
+class CommentRecord:
+    """A comment on an issue. The body is kept in the Jira markup format (or as an ADF document in the ADF mode)."""
+
+    id: str
+    author: UserRecord | None
+    created: str
+    updated: str
+    body: str | dict[str, Any]
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any]) -> "CommentRecord":
+        return cls(
+            id=raw["id"],
+            author=UserRecord.from_raw(raw.get("author")),
+            created=raw["created"],
+            updated=raw["updated"],
+            body=raw.get("body") or "",
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class IssueRecord:
+    """The core fields of an issue, along with its links, subtasks, and comments.
+
+    The attribute names of the core fields match the Jira field IDs. The description is kept in the Jira markup format
+    (or as an ADF document in the ADF mode).
+    """
+
+    key: str
+    id: str | None
+    summary: str | None
+    description: str | dict[str, Any] | None
+    status: str | None
+    priority: str | None
+    issuetype: str | None
+    assignee: UserRecord | None
+    reporter: UserRecord | None
+    labels: tuple[str, ...]
+    created: str | None
+    updated: str | None
+    parent: RelatedIssueRecord | None
+    links: tuple[LinkRecord, ...]
+    subtasks: tuple[RelatedIssueRecord, ...]
+    comments: tuple[CommentRecord, ...]
+    available_fields: frozenset[str]  # The fields returned by Jira (i.e., the fields that exist in the issue)
+    # The simplified values of the requested extra (custom) fields, by field ID (None if the issue does not have it)
+    custom_fields: tuple[tuple[str, Any], ...] = ()
+
+    @property
+    def related_keys(self) -> set[str]:
+        """The keys of the parent, linked issues, and subtasks."""
+        keys = {entry.issue.key for entry in self.links} | {entry.key for entry in self.subtasks}
+        if self.parent is not None:
+            keys.add(self.parent.key)
+        return keys
+
+    @property
+    def custom_field_ids(self) -> frozenset[str]:
+        """The IDs of the extra fields that were requested when the issue was fetched."""
+        return frozenset(field_id for field_id, _ in self.custom_fields)
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any], custom_field_ids: tuple[str, ...] = ()) -> "IssueRecord":
+        fields = raw.get("fields") or {}
+        parent = fields.get("parent")
+        return cls(
+            key=raw["key"],
+            id=raw.get("id"),
+            summary=fields.get("summary"),
+            description=fields.get("description"),
+            status=_name_of(fields.get("status")),
+            priority=_name_of(fields.get("priority")),
+            issuetype=_name_of(fields.get("issuetype")),
+            assignee=UserRecord.from_raw(fields.get("assignee")),
+            reporter=UserRecord.from_raw(fields.get("reporter")),
+            labels=tuple(fields.get("labels") or ()),
+            created=fields.get("created"),
+            updated=fields.get("updated"),
+            parent=RelatedIssueRecord.from_raw(parent) if parent else None,
+            links=tuple(LinkRecord.from_raw(entry) for entry in fields.get("issuelinks") or ()),
+            subtasks=tuple(RelatedIssueRecord.from_raw(entry) for entry in fields.get("subtasks") or ()),
+            comments=tuple(
+                CommentRecord.from_raw(entry) for entry in (fields.get("comment") or {}).get("comments") or ()
+            ),
+            available_fields=frozenset(fields),
+            custom_fields=tuple(
+                (field_id, simplify_field_value(fields.get(field_id))) for field_id in custom_field_ids
+            ),
+        )
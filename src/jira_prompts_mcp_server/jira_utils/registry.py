@@ -0,0 +1,133 @@
+"""Registry of the Jira sites (instances or accounts) served by one server."""
+
+import os
+import logging
+import threading
+from typing import Any
+
+from .config import JiraConfig
+from .fetcher import JiraFetcher
+from .preprocessing import shutdown_offload_pool
+
+LOGGER = logging.getLogger("jira_prompts.registry")
+
+DEFAULT_SITE = "default"
+
+
+class JiraSiteRegistry:
+    """Holds one lazily created `JiraFetcher` per site and routes requests to them.
+
+    Each fetcher has its own HTTP connection pool, rate limiter, and caches. The process pool that converts huge texts
+    is shared by all the sites.
+    """
+
+    def __init__(self, configs: dict[str, JiraConfig], default_site: str | None = None) -> None:
+        """
+        Args:
+            configs: Mapping from site names to their configurations
+            default_site: The site used when neither the site nor the project of the issue key routes to one
+                (defaults to the first site)
+
+        Raises:
+            ValueError: If no sites are configured, the default site is unknown, or a project is mapped to
+                multiple sites
+        """
+        if not configs:
+            raise ValueError("At least one Jira site is required")
+        self.configs = configs
+        self.default_site = default_site or next(iter(configs))
+        if self.default_site not in configs:
+            raise ValueError(f"Unknown default Jira site: {self.default_site}")
+        # Map project keys (the prefixes of issue keys) to sites
+        self.project_to_site: dict[str, str] = {}
+        for site, config in configs.items():
+            for project in config.projects:
+                if project in self.project_to_site:
+                    raise ValueError(f"Project {project} is mapped to both {self.project_to_site[project]} and {site}")
+                self.project_to_site[project] = site
+        self._fetchers: dict[str, JiraFetcher] = {}
+        # Guards `_fetchers` only. Connecting to a site can take a while (or time out), so it is done under the lock of
+        # the site, and the requests to the other sites don't wait for it.
+        self._lock = threading.Lock()
+        self._site_locks = {site: threading.Lock() for site in configs}
+
+    @classmethod
+    def from_env(cls) -> "JiraSiteRegistry":
+        """Create the registry from environment variables.
+
+        When JIRA_SITES (a comma-separated list of site names) is not set, the only site is configured by the
+        JIRA_* variables. Otherwise, the site named "dc" is configured by the JIRA_DC_* variables, and so on.
+        The projects in the JIRA_<SITE>_PROJECTS variable are routed to the site. JIRA_DEFAULT_SITE picks the
+        site for everything else (defaults to the first site).
+
+        Raises:
+            ValueError: If required environment variables are missing or invalid
+        """
+        sites = [x.strip() for x in os.getenv("JIRA_SITES", "").split(",") if x.strip()]
+        if not sites:
+            return cls({DEFAULT_SITE: JiraConfig.from_env()})
+        configs = {site: JiraConfig.from_env(prefix=f"JIRA_{site.upper()}_") for site in sites}
+        return cls(configs, default_site=os.getenv("JIRA_DEFAULT_SITE"))
+
+    def resolve_site(self, site: str | None = None, issue_key: str | None = None) -> str:
+        """Find the site of a request.
+
+        Args:
+            site: The explicitly requested site (takes precedence)
+            issue_key: The issue key whose project is used to look up the site
+
+        Raises:
+            ValueError: If the requested site is unknown
+        """
+        if site:
+            if site not in self.configs:
+                raise ValueError(f"Unknown Jira site: {site} (available: {', '.join(self.configs)})")
+            return site
+        if issue_key:
+            project = issue_key.split("-", 1)[0].strip().upper()
+            if project in self.project_to_site:
+                return self.project_to_site[project]
+        return self.default_site
+
+    def get(self, site: str | None = None, issue_key: str | None = None) -> JiraFetcher:
+        """Get the fetcher of a site, creating it on first use. See `resolve_site` for the arguments."""
+        site = self.resolve_site(site, issue_key)
+        with self._lock:
+            fetcher = self._fetchers.get(site)
+        if fetcher is not None:
+            return fetcher
+        with self._site_locks[site]:
+            with self._lock:
+                fetcher = self._fetchers.get(site)
+            if fetcher is None:
+                LOGGER.info(f"Connecting to Jira site {site}: {self.configs[site].url}")
+                fetcher = JiraFetcher(self.configs[site])
+                with self._lock:
+                    self._fetchers[site] = fetcher
+        return fetcher
+
+    def active_fetchers(self, site: str | None = None, issue_key: str | None = None) -> list[JiraFetcher]:
+        """Get the fetchers that have been created, without creating new ones.
+
+        When neither the site nor the issue key is given, all the created fetchers are returned. Otherwise, the
+        fetcher of the resolved site is returned if it has been created (see `resolve_site` for the arguments).
+        """
+        with self._lock:
+            if site is None and issue_key is None:
+                return list(self._fetchers.values())
+            fetcher = self._fetchers.get(self.resolve_site(site, issue_key))
+        return [] if fetcher is None else [fetcher]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """The cache statistics of the sites that have been connected to."""
+        with self._lock:
+            fetchers = dict(self._fetchers)
+        return {site: fetcher.cache_stats() for site, fetcher in fetchers.items()}
+
+    def close(self) -> None:
+        """Release the resources held by all the fetchers."""
+        with self._lock:
+            for fetcher in self._fetchers.values():
+                fetcher.close()
+            self._fetchers.clear()
+        shutdown_offload_pool()
@@ -0,0 +1,132 @@
+"""Failing fast when Jira is slow or down: a circuit breaker and per-request deadlines."""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import requests
+
+LOGGER = logging.getLogger("jira_prompts.resilience")
+
+# The monotonic time by which the current request must finish (None means no deadline). It is propagated to the
+# worker threads by asyncio.to_thread.
+_DEADLINE: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+# Neither error is a `requests.ConnectionError`, so the HTTP adapter of the client does not sleep and retry on them
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when the deadline of the current request has passed."""
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """Set the deadline of the code in the block (and of the threads started by asyncio.to_thread in it).
+
+    Args:
+        seconds: The time budget (None or 0 disables the deadline)
+    """
+    token = _DEADLINE.set(time.monotonic() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining_time() -> float | None:
+    """The number of seconds left before the deadline (None if there is no deadline)."""
+    deadline = _DEADLINE.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    """Raise `DeadlineExceeded` if the deadline has passed."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded("The deadline of the request has passed")
+
+
+def clamp_timeout(timeout):
+    """Shorten the timeout of an HTTP request (a number or a (connect, read) tuple) to the remaining time.
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded("The deadline of the request has passed")
+    if isinstance(timeout, tuple):
+        return tuple(remaining if x is None else min(x, remaining) for x in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+class CircuitBreaker:
+    """A thread-safe circuit breaker.
+
+    After `failure_threshold` consecutive failures, the circuit opens and the requests fail immediately. After
+    `reset_timeout` seconds, one trial request is let through (half-open): the circuit closes if it succeeds, and
+    opens again if it fails.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Args:
+            failure_threshold: The number of consecutive failures that opens the circuit
+            reset_timeout: Seconds before a trial request is let through an open circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the requests are being rejected (the trial request of a half-open circuit may still pass)."""
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_request(self) -> None:
+        """Reserve a request.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or half-open with a trial request in flight)
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if not self._trial_in_flight and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._trial_in_flight = True
+                return
+            retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0)
+        raise CircuitOpenError(f"Jira is unavailable (circuit open, retrying in {retry_in:.0f} seconds)")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                LOGGER.info("Jira is available again; closing the circuit")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give up a reserved request without an outcome (e.g., it was cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or (self._opened_at is None and self._failures >= self.failure_threshold):
+                LOGGER.warning(f"Opening the circuit after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
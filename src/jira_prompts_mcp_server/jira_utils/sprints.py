@@ -0,0 +1,215 @@
+"""Summaries of sprints (or any set of issues matched by a JQL query) for stand-ups."""
+
+import re
+import logging
+from collections import Counter
+from typing import Any, Iterator
+
+import requests
+
+from .fields import FieldsMixin
+from .records import RelatedIssueRecord, UserRecord
+
+LOGGER = logging.getLogger("jira_prompts.sprints")
+
+# The fields fetched by the searches of the summaries (only what the aggregation needs)
+SPRINT_SUMMARY_FIELDS = ("summary", "status", "issuetype", "assignee", "issuelinks")
+# Issues flagged as impediments (in the boards) have a value in this field
+FLAGGED_FIELD = "Flagged"
+# The link type of the "is blocked by" links created by default
+BLOCKS_LINK_TYPE = "Blocks"
+UNASSIGNED = "Unassigned"
+# The quoted strings are matched as well, so the "order by" in them (e.g., summary ~ "order by") can be skipped
+_ORDER_BY_PATTERN = re.compile(r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|\b(order\s+by)\b""", re.IGNORECASE)
+
+
+def _find_order_by(jql: str) -> int | None:
+    """The position of the ORDER BY clause of a JQL query (None if there is none)."""
+    starts = [match.start(1) for match in _ORDER_BY_PATTERN.finditer(jql) if match.group(1)]
+    return starts[-1] if starts else None
+
+
+def split_order_by(jql: str) -> tuple[str, str]:
+    """Split a JQL query into its filter and its ORDER BY clause (empty if there is none), which comes last.
+
+    Example: "project = PROJ ORDER BY created DESC" -> ("project = PROJ", "ORDER BY created DESC")
+    """
+    start = _find_order_by(jql)
+    if start is None:
+        return jql.strip(), ""
+    return jql[:start].strip(), jql[start:].strip()
+
+
+def with_stable_order(jql: str) -> str:
+    """Order the results by key unless the query orders them, so the pages don't shift between requests."""
+    if _find_order_by(jql) is not None:
+        return jql
+    return f"{jql} ORDER BY key ASC"
+
+
+def _status_category(raw_status: dict[str, Any] | None) -> str | None:
+    """The key of the category of a status ("new", "indeterminate", or "done")."""
+    return ((raw_status or {}).get("statusCategory") or {}).get("key")
+
+
+class SprintSummary:
+    """Aggregates the issues of a sprint in a single pass.
+
+    The raw issues are not kept: only the counts and the compact rows of the in-progress and blocked issues (at most
+    `max_items` of each), so the memory use does not grow with the number of issues.
+    """
+
+    def __init__(self, max_items: int = 50, flagged_field_id: str | None = None) -> None:
+        """
+        Args:
+            max_items: The maximum number of issues listed as in progress or blocked (the rest are only counted)
+            flagged_field_id: The ID of the "Flagged" field (None if the site does not have it)
+        """
+        self.max_items = max_items
+        self.flagged_field_id = flagged_field_id
+        self.total = 0
+        self.by_status: Counter[str] = Counter()
+        self.by_assignee: Counter[str] = Counter()
+        self.in_progress: list[dict[str, Any]] = []
+        self.blocked: list[dict[str, Any]] = []
+        self.in_progress_count = 0
+        self.blocked_count = 0
+
+    def add(self, raw: dict[str, Any]) -> None:
+        """Count an issue (the raw JSON returned by the search)."""
+        fields = raw.get("fields") or {}
+        issue = RelatedIssueRecord.from_raw(raw)
+        assignee = UserRecord.from_raw(fields.get("assignee"))
+        assignee_name = assignee.display_name if assignee is not None else UNASSIGNED
+        self.total += 1
+        self.by_status[issue.status or "N/A"] += 1
+        self.by_assignee[assignee_name] += 1
+        # The same row shape as the subtasks of the jira-issue-full prompt, along with the assignee
+        row = {
+            "key": issue.key,
+            "summary": issue.summary,
+            "status": issue.status,
+            "type": issue.issuetype,
+            "assignee": assignee_name,
+        }
+        blocked_by = self._blocked_by(fields)
+        if blocked_by is not None:
+            self.blocked_count += 1
+            if len(self.blocked) < self.max_items:
+                self.blocked.append(row | {"blocked_by": blocked_by} if blocked_by else row)
+        elif _status_category(fields.get("status")) == "indeterminate":
+            self.in_progress_count += 1
+            if len(self.in_progress) < self.max_items:
+                self.in_progress.append(row)
+
+    def _blocked_by(self, fields: dict[str, Any]) -> list[str] | None:
+        """Find out whether an issue is blocked.
+
+        An issue is blocked if its status is named like "Blocked", it is flagged, or it is blocked by an unresolved
+        issue.
+
+        Returns:
+            The keys of the unresolved blocking issues (possibly empty), or None if the issue is not blocked
+        """
+        blocked_by = []
+        for link in fields.get("issuelinks") or ():
+            if (link.get("type") or {}).get("name") != BLOCKS_LINK_TYPE or "inwardIssue" not in link:
+                continue
+            blocker = link["inwardIssue"]
+            if _status_category((blocker.get("fields") or {}).get("status")) != "done":
+                blocked_by.append(blocker["key"])
+        if blocked_by:
+            return blocked_by
+        status = ((fields.get("status") or {}).get("name") or "").casefold()
+        if "blocked" in status or (self.flagged_field_id is not None and fields.get(self.flagged_field_id)):
+            return blocked_by
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        results: dict[str, Any] = {
+            "total": self.total,
+            "by_status": dict(self.by_status.most_common()),
+            "by_assignee": dict(self.by_assignee.most_common()),
+            "in_progress": self.in_progress,
+            "blocked": self.blocked,
+        }
+        omitted = {
+            name: count - len(rows)
+            for name, count, rows in (
+                ("in_progress", self.in_progress_count, self.in_progress),
+                ("blocked", self.blocked_count, self.blocked),
+            )
+            if count > len(rows)
+        }
+        if omitted:
+            results["omitted_items"] = omitted
+        return results
+
+
+class SprintsMixin(FieldsMixin):
+    def get_sprint(self, sprint_id: int) -> dict[str, Any]:
+        """Get the name, state, dates, and goal of a sprint."""
+        raw = self.jira._get_json(f"sprint/{sprint_id}", base=self.jira.AGILE_BASE_URL)
+        return self._sprint_info(raw)
+
+    def get_active_sprints(self, board_id: int) -> list[dict[str, Any]]:
+        """Get the active sprints of a board (a board can have parallel sprints)."""
+        raw = self.jira._get_json(f"board/{board_id}/sprint", params={"state": "active"}, base=self.jira.AGILE_BASE_URL)
+        return [self._sprint_info(entry) for entry in raw.get("values") or ()]
+
+    @staticmethod
+    def _sprint_info(raw: dict[str, Any]) -> dict[str, Any]:
+        info = {key: raw.get(key) for key in ("id", "name", "state", "startDate", "endDate")}
+        if raw.get("goal"):
+            info["goal"] = raw["goal"]
+        return info
+
+    def iter_search_results(self, jql: str, fields: tuple[str, ...], page_size: int = 100) -> Iterator[dict[str, Any]]:
+        """Page through the issues matched by a JQL query, only fetching the given fields.
+
+        Yields:
+            The raw JSON of the issues, one page in memory at a time
+        """
+        start = 0
+        while True:
+            results = self.jira.search_issues(
+                jql, startAt=start, maxResults=page_size, fields=list(fields), json_result=True
+            )
+            assert isinstance(results, dict)
+            issues = results.get("issues") or []
+            if not issues:
+                return
+            yield from issues
+            start += len(issues)
+            total = results.get("total")
+            if total is not None and start >= total:
+                return
+
+    def summarize_issues(self, jql: str, max_items: int = 50, page_size: int = 100) -> dict[str, Any]:
+        """Summarize the issues matched by a JQL query: the counts per status and per assignee, and the lists of the
+        in-progress and blocked issues.
+
+        If Jira stops responding (or the deadline of the request passes) after some issues have been counted, the
+        partial summary is returned with "incomplete" set.
+
+        Args:
+            jql: The JQL query
+            max_items: The maximum number of issues listed as in progress or blocked
+            page_size: The number of issues in each page of search results
+        """
+        jql = with_stable_order(jql)
+        flagged_field = self.get_field_metadata().resolve(FLAGGED_FIELD)
+        fields = SPRINT_SUMMARY_FIELDS
+        if flagged_field is not None:
+            fields += (flagged_field.id,)
+        summary = SprintSummary(max_items=max_items, flagged_field_id=flagged_field and flagged_field.id)
+        try:
+            for raw in self.iter_search_results(jql, fields, page_size=page_size):
+                summary.add(raw)
+        except requests.RequestException as e:
+            # Includes the open circuit breaker and the exceeded deadline
+            if not summary.total:
+                raise
+            LOGGER.warning(f"Summarizing only the first {summary.total} issues of {jql}: {e}")
+            return summary.to_dict() | {"incomplete": True}
+        return summary.to_dict()
@@ -0,0 +1,103 @@
+"""Apply Jira webhook events to the caches of a fetcher."""
+
+import logging
+import dataclasses
+from typing import Any, Iterable
+
+from .client import JiraClient
+from .records import CommentRecord, IssueRecord
+
+LOGGER = logging.getLogger("jira_prompts.webhooks")
+
+ISSUE_EVENTS = ("jira:issue_created", "jira:issue_updated", "jira:issue_deleted")
+COMMENT_EVENTS = ("comment_created", "comment_updated", "comment_deleted")
+ISSUE_LINK_EVENTS = ("issuelink_created", "issuelink_deleted")
+
+
+def _related_keys_in_payload(raw_issue: dict[str, Any]) -> set[str]:
+    """Collect the keys of the parent, linked issues, and subtasks of an issue in a webhook payload."""
+    fields = raw_issue.get("fields") or {}
+    keys = set()
+    if fields.get("parent"):
+        keys.add(fields["parent"]["key"])
+    for entry in fields.get("issuelinks") or ():
+        linked_issue = entry.get("inwardIssue") or entry.get("outwardIssue")
+        if linked_issue:
+            keys.add(linked_issue["key"])
+    for entry in fields.get("subtasks") or ():
+        keys.add(entry["key"])
+    return keys
+
+
+class WebhooksMixin(JiraClient):
+    def invalidate_issue(self, issue_key: str) -> None:
+        """Remove an issue and the prompts rendered from it from the caches."""
+        issue_key = issue_key.upper()
+        self.issue_cache.pop(issue_key)
+        self.prompt_cache.pop_where(lambda key: key[1] == issue_key)
+
+    def _invalidate_issue_and_related(self, issue_key: str, extra_keys: Iterable[str] = ()) -> set[str]:
+        """Invalidate an issue and the issues that show its summary or status (parent, linked issues, and subtasks)."""
+        keys = {issue_key, *extra_keys}
+        cached = self.issue_cache.get(issue_key.upper())
+        if cached is not None:
+            keys |= cached.related_keys
+        for key in keys:
+            self.invalidate_issue(key)
+        return keys
+
+    def _patch_comments(self, issue_key: str, comment_id: str, comment: CommentRecord | None) -> bool:
+        """Apply a comment event to the cached issue record instead of dropping it.
+
+        Args:
+            issue_key: The key of the commented issue
+            comment_id: The ID of the comment
+            comment: The new version of the comment (None if it was deleted)
+        """
+
+        def _patch(issue: IssueRecord) -> IssueRecord:
+            comments = tuple(entry for entry in issue.comments if entry.id != comment_id)
+            if comment is not None:
+                comments += (comment,)
+            return dataclasses.replace(issue, comments=comments)
+
+        return self.issue_cache.replace(issue_key.upper(), _patch)
+
+    def handle_webhook_event(self, payload: dict[str, Any]) -> bool:
+        """Invalidate or patch the cache entries affected by a Jira webhook event.
+
+        Args:
+            payload: The JSON body of the webhook request
+
+        Returns:
+            Whether the event was recognized
+        """
+        event = payload.get("webhookEvent", "")
+        if event in ISSUE_EVENTS:
+            raw_issue = payload["issue"]
+            keys = self._invalidate_issue_and_related(raw_issue["key"], _related_keys_in_payload(raw_issue))
+            if event == "jira:issue_deleted":
+                self.issue_keys_by_id.pop(str(raw_issue.get("id")))
+            LOGGER.info(f"{event}: invalidated {', '.join(sorted(keys))}")
+            return True
+        if event in COMMENT_EVENTS:
+            issue_key = payload["issue"]["key"].upper()
+            comment_id = str(payload["comment"]["id"])
+            comment = None if event == "comment_deleted" else CommentRecord.from_raw(payload["comment"])
+            self.comment_cache.pop(comment_id)
+            patched = self._patch_comments(issue_key, comment_id, comment)
+            self.prompt_cache.pop_where(lambda key: key[1] == issue_key)
+            LOGGER.info(f"{event}: {'patched' if patched else 'invalidated'} {issue_key} (comment {comment_id})")
+            return True
+        if event in ISSUE_LINK_EVENTS:
+            link = payload["issueLink"]
+            keys = set()
+            for issue_id in (link.get("sourceIssueId"), link.get("destinationIssueId")):
+                issue_key = self.issue_keys_by_id.get(str(issue_id))
+                if issue_key is not None:
+                    keys.add(issue_key)
+                    self.invalidate_issue(issue_key)
+            LOGGER.info(f"{event}: invalidated {', '.join(sorted(keys)) or 'nothing'}")
+            return True
+        LOGGER.debug(f"Ignoring webhook event {event}")
+        return False
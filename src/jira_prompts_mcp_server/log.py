@@ -0,0 +1,166 @@
+"""Non-blocking logging setup.
+
+The log records are put on a queue by the request threads and written to the console and to size-rotated
+JSON log files by a background thread, so logging never waits on disk I/O.
+"""
+
+import os
+import re
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+LOG_FORMAT = "[%(asctime)s][%(levelname)s][%(name)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+LOG_FILE_PREFIX = "jira_prompts_mcp_"
+# The name of the log files of a server run (without the ".log" suffix and the rotation number): the start time and the
+# process ID (missing from the names used by older versions)
+_RUN_PATTERN = re.compile(rf"{LOG_FILE_PREFIX}(\d{{14}})(?:_(\d+))?")
+# The log files of the runs that can't be checked for a running process are removed after this many seconds without
+# being written to
+LOG_IDLE_SECONDS = 24 * 3600
+
+# The ID of the prompt invocation being handled (propagated to the worker threads by asyncio.to_thread)
+REQUEST_ID: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the ID of the current prompt invocation to the log records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = REQUEST_ID.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as JSON lines, including the structured fields passed via `extra`."""
+
+    EXTRA_FIELDS = ("request_id", "prompt", "site", "issue_key", "duration_ms", "outcome")
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self.EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        # The traceback is formatted before the record is queued (see `StructuredQueueHandler`)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """A queue handler that keeps the traceback out of the message.
+
+    `QueueHandler.prepare` merges the formatted traceback into the message and clears `exc_info`, so the JSON log files
+    would get it inside "message". The message and the traceback are formatted here instead (the traceback objects must
+    not be held until the record is written), and the traceback is kept in `exc_text`, where both the console formatter
+    and `JsonFormatter` pick it up.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user
+        return True
+    return True
+
+
+def _is_active_run(run: str, paths: list[Path]) -> bool:
+    """Whether the log files of a server run may still be written to.
+
+    On POSIX systems, the run is active if its process is running. Otherwise (or for the files of older versions, whose
+    names have no process ID), it is active if a file has been written to in the last `LOG_IDLE_SECONDS` seconds.
+    """
+    match = _RUN_PATTERN.fullmatch(run)
+    if match and match.group(2) and os.name == "posix":
+        return _process_exists(int(match.group(2)))
+    try:
+        last_write = max(path.stat().st_mtime for path in paths)
+    except OSError:
+        return True
+    return time.time() - last_write < LOG_IDLE_SECONDS
+
+
+def _remove_old_log_files(log_dir: Path, retention: int) -> None:
+    """Only keep the log files (including the rotated ones) of the latest `retention` server runs.
+
+    Several servers may share the directory (e.g., one per editor window in the stdio mode), so the files of the runs
+    that may still be written to are never removed.
+    """
+    runs: dict[str, list[Path]] = {}
+    for path in log_dir.glob(f"{LOG_FILE_PREFIX}*.log*"):
+        runs.setdefault(path.name.split(".log")[0], []).append(path)
+    for run in sorted(runs, reverse=True)[retention:]:
+        if _is_active_run(run, runs[run]):
+            continue
+        for path in runs[run]:
+            path.unlink(missing_ok=True)
+
+
+def setup_logging(
+    log_dir: Path = Path("/tmp"), max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3, retention: int = 10
+) -> QueueListener:
+    """Route the log records through a queue to the console and to a rotating JSON log file.
+
+    Args:
+        log_dir: The directory of the log files
+        max_bytes: The size at which a log file is rotated
+        backup_count: The number of rotated files kept for this server run
+        retention: The number of server runs whose log files are kept
+
+    Returns:
+        The started queue listener (it is stopped at exit)
+    """
+    log_dir.mkdir(parents=True, exist_ok=True)
+    _remove_old_log_files(log_dir, max(retention - 1, 0))
+    # The process ID tells the servers started in the same second apart
+    log_file = log_dir / f"{LOG_FILE_PREFIX}{datetime.now().strftime('%Y%m%d%H%M%S')}_{os.getpid()}.log"
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    # The filter runs in the thread that logs, where the request ID is available
+    queue_handler.addFilter(RequestIdFilter())
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
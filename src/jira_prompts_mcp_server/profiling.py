@@ -0,0 +1,150 @@
+"""Profile selected prompt invocations on demand.
+
+Profiling is enabled by JIRA_PROMPTS_PROFILE_COUNT (profile the next N invocations) and/or
+JIRA_PROMPTS_PROFILE_PATTERN (profile the invocations whose issue key matches a regular expression). When neither is
+set, no profiler is created and the prompts are rendered exactly as before.
+"""
+
+import io
+import os
+import re
+import sys
+import pstats
+import logging
+import cProfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from .log import REQUEST_ID
+
+LOGGER = logging.getLogger("jira_prompts.profiling")
+
+T = TypeVar("T")
+
+
+def current_rss() -> int:
+    """The resident set size of the process in bytes (the peak RSS where the current one is not available)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # In kilobytes on Linux, in bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class PromptProfiler:
+    """Runs the selected prompt invocations under cProfile, and writes the profiles to a directory.
+
+    For each profiled invocation, two files are written: a `.prof` file (readable by `pstats`, snakeviz, etc.) and a
+    `.txt` file with the top functions by cumulative and by internal time.
+
+    Only one invocation is profiled at a time (Python allows only one active profiler). An invocation that is selected
+    while another one is being profiled is rendered without profiling, and does not use up the count. Note that the
+    profile also includes the other threads that run while the invocation is being profiled.
+    """
+
+    def __init__(self, output_dir: Path, count: int = 0, pattern: str | None = None, top: int = 30) -> None:
+        """
+        Args:
+            output_dir: The directory of the profile artifacts
+            count: The number of invocations to profile (0 means no limit when a pattern is given)
+            pattern: Only profile the invocations whose issue key fully matches this regular expression
+                (case-insensitive)
+            top: The number of functions listed in the summaries
+
+        Raises:
+            ValueError: If neither the count nor the pattern is given
+        """
+        if count <= 0 and not pattern:
+            raise ValueError("Either a positive count or an issue key pattern is required")
+        self.output_dir = output_dir
+        self.remaining: int | None = count if count > 0 else None
+        self.pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.top = top
+        self._lock = threading.Lock()
+        self._active = False
+
+    @classmethod
+    def from_env(cls) -> "PromptProfiler | None":
+        """Create a profiler from the environment variables, or return None if profiling is not enabled.
+
+        Raises:
+            ValueError: If the environment variables are invalid
+        """
+        count = int(os.getenv("JIRA_PROMPTS_PROFILE_COUNT", "0"))
+        pattern = os.getenv("JIRA_PROMPTS_PROFILE_PATTERN") or None
+        if count <= 0 and not pattern:
+            return None
+        return cls(
+            output_dir=Path(os.getenv("JIRA_PROMPTS_PROFILE_DIR", "/tmp/jira_prompts_profiles")),
+            count=count,
+            pattern=pattern,
+            top=int(os.getenv("JIRA_PROMPTS_PROFILE_TOP", "30")),
+        )
+
+    def _acquire(self, issue_key: str) -> bool:
+        """Decide whether to profile an invocation, and reserve the profiler if so."""
+        if self.pattern is not None and not self.pattern.fullmatch(issue_key):
+            return False
+        with self._lock:
+            if self._active or self.remaining == 0:
+                return False
+            self._active = True
+            if self.remaining is not None:
+                self.remaining -= 1
+            return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active = False
+
+    def run(self, prompt: str, issue_key: str, func: Callable[..., T], *args) -> T:
+        """Call `func(*args)`, profiling it if the invocation is selected.
+
+        Args:
+            prompt: The name of the prompt
+            issue_key: The issue key of the invocation
+            func: The function rendering the prompt
+        """
+        if not self._acquire(issue_key):
+            return func(*args)
+        profiler = cProfile.Profile()
+        try:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler (e.g., a debugger or coverage) is active
+                LOGGER.warning(f"Cannot profile {prompt} for {issue_key}: another profiler is active")
+                return func(*args)
+            try:
+                return func(*args)
+            finally:
+                profiler.disable()
+                self._write(profiler, prompt, issue_key)
+        finally:
+            self._release()
+
+    def _write(self, profiler: cProfile.Profile, prompt: str, issue_key: str) -> None:
+        """Write the profile and its summary to the output directory."""
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            parts = (datetime.now().strftime("%Y%m%d%H%M%S"), prompt, issue_key.upper(), REQUEST_ID.get())
+            stem = re.sub(r"[^\w.-]", "_", "_".join(x for x in parts if x))
+            profile_path = self.output_dir / f"{stem}.prof"
+            profiler.dump_stats(profile_path)
+            buffer = io.StringIO()
+            stats = pstats.Stats(profiler, stream=buffer).strip_dirs()
+            buffer.write(f"{prompt} for {issue_key}\n\n# Top functions by cumulative time\n")
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            buffer.write("\n# Top functions by internal time\n")
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+            summary_path = self.output_dir / f"{stem}.txt"
+            summary_path.write_text(buffer.getvalue(), encoding="utf-8")
+            LOGGER.info(f"Wrote the profile of {prompt} for {issue_key} to {profile_path}")
+        except OSError as e:
+            LOGGER.warning(f"Failed to write the profile of {prompt} for {issue_key}: {e}")
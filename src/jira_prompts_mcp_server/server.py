@@ -1,15 +1,32 @@
 import os
 import json
+import asyncio
 import logging
-from collections.abc import AsyncIterator
+import time
+import uuid
+import weakref
+import threading
+import functools
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
+from typing import Any, Literal
 
+import requests
+import uvicorn
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_context
 from mcp.types import PromptMessage, TextContent
 from pydantic import Field
+from sse_starlette.sse import AppStatus
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
-from .jira_utils import JiraFetcher
+from .jira_utils import JiraFetcher, JiraSiteRegistry
+from .jira_utils.client import RefreshState
+from .jira_utils.resilience import deadline_scope
+from .jira_utils.sprints import split_order_by
+from .log import REQUEST_ID
+from .profiling import PromptProfiler, current_rss
 
 LOGGER = logging.getLogger("jira_prompts")
 
@@ -58,48 +75,193 @@ class StrFallbackEncoder(json.JSONEncoder):
             return json.JSONEncoder.default(self, o)
 
 
+# The Jira sites shared by all client sessions (and the webhook receiver, which runs in another thread)
+_JIRA_SITES: JiraSiteRegistry | None = None
+_JIRA_SITES_LOCK = threading.Lock()
+
+
+def get_jira_sites() -> JiraSiteRegistry:
+    """Get the registry of Jira sites shared by all client sessions, creating it on first use."""
+    global _JIRA_SITES
+    if _JIRA_SITES is None:
+        with _JIRA_SITES_LOCK:
+            # Another thread may have created it while this one was waiting for the lock
+            if _JIRA_SITES is None:
+                jira_sites = JiraSiteRegistry.from_env()
+
+                # Log the startup information
+                LOGGER.info("Starting Jira Prompts MCP server")
+                os.system("notify-send 'Jira Prompts MCP server is starting'")
+
+                for site, config in jira_sites.configs.items():
+                    LOGGER.info(f"Jira URL ({site}): {config.url}")
+                _JIRA_SITES = jira_sites
+    return _JIRA_SITES
+
+
 @asynccontextmanager
-async def server_lifespan(server: FastMCP) -> AsyncIterator[JiraFetcher]:
-    """Initialize and clean up application resources."""
-    jira_url = os.getenv("JIRA_URL")
-    if jira_url is None:
-        raise ValueError("JIRA_URL environment variable is not set")
+async def server_lifespan(server: FastMCP) -> AsyncIterator[JiraSiteRegistry]:
+    """Initialize application resources.
 
-    try:
-        jira = JiraFetcher()
+    The lifespan is entered once per client session (i.e., once per client when served over HTTP). The registry of
+    Jira sites is created by the first session and shared by the following ones, so they share the connection pools
+    and caches of the sites. Call `close_jira_sites` to clean it up when the server stops.
+    """
+    # Provide context to the application
+    yield get_jira_sites()
+
+
+def close_jira_sites() -> None:
+    """Clean up the shared Jira sites."""
+    global _JIRA_SITES
+    with _JIRA_SITES_LOCK:
+        if _JIRA_SITES is not None:
+            _JIRA_SITES.close()
+            _JIRA_SITES = None
 
-        # Log the startup information
-        LOGGER.info("Starting Jira Prompts MCP server")
-        os.system("notify-send 'Jira Prompts MCP server is starting'")
 
-        jira_url = jira.config.url
-        LOGGER.info(f"Jira URL: {jira_url}")
+class PromptGate:
+    """Limits the number of concurrent prompt invocations per client and tracks the in-flight ones.
+
+    The in-flight invocations are drained before the server shuts down.
+    """
+
+    def __init__(self) -> None:
+        self.closing = False
+        self._semaphores: weakref.WeakKeyDictionary[Any, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
 
-        # Provide context to the application
-        yield jira
+    @asynccontextmanager
+    async def slot(self, client: Any) -> AsyncIterator[None]:
+        """Wait for a free slot of the client, and hold it while the prompt is being rendered.
+
+        Args:
+            client: An object identifying the client (e.g., its session)
+        """
+        if self.closing:
+            raise RuntimeError("The server is shutting down")
+        semaphore = self._semaphores.get(client)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(int(os.getenv("JIRA_PROMPTS_MAX_CONCURRENCY_PER_CLIENT", "4")))
+            self._semaphores[client] = semaphore
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            async with semaphore:
+                yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting new prompt invocations, and wait for the in-flight ones to finish."""
+        self.closing = True
+        if self._in_flight:
+            LOGGER.info(f"Waiting for {self._in_flight} in-flight prompt(s) to finish")
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except TimeoutError:
+            LOGGER.warning(f"{self._in_flight} prompt(s) are still running after {timeout} seconds")
+
+
+PROMPT_GATE = PromptGate()
+
+
+@asynccontextmanager
+async def track_prompt(prompt: str, issue_key: str, site: str | None) -> AsyncIterator[None]:
+    """Assign a request ID to a prompt invocation, and log its outcome and duration."""
+    token = REQUEST_ID.set(uuid.uuid4().hex[:12])
+    start_time = time.perf_counter()
+    extra: dict[str, Any] = {"prompt": prompt, "issue_key": issue_key, "site": site}
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
     finally:
-        # Cleanup resources if needed
-        pass
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        extra |= {"duration_ms": duration_ms, "outcome": outcome}
+        if outcome == "ok":
+            LOGGER.info(f"Rendered {prompt} for {issue_key} in {duration_ms} ms", extra=extra)
+        else:
+            LOGGER.warning(f"Failed to render {prompt} for {issue_key} after {duration_ms} ms", extra=extra)
+        REQUEST_ID.reset(token)
+
+
+class _DrainingServer(uvicorn.Server):
+    """A Uvicorn server that drains the in-flight prompts before shutting down."""
+
+    def __init__(self, config: uvicorn.Config, drain_timeout: float) -> None:
+        super().__init__(config)
+        self.drain_timeout = drain_timeout
+
+    def handle_exit(self, sig, frame) -> None:
+        # When it is imported, sse_starlette 2.x replaces `uvicorn.Server.handle_exit` with a handler that closes all
+        # the event streams right away, which would cut off the responses of the in-flight prompts. Call the original
+        # handler it saved instead, and let the streams be closed when the server shuts down. This relies on the
+        # private `AppStatus.original_handler`, which is why sse-starlette is pinned below 3 in pyproject.toml.
+        if getattr(AppStatus, "original_handler", None) is not None:
+            AppStatus.original_handler(self, sig, frame)
+        else:
+            super().handle_exit(sig, frame)
+
+    async def shutdown(self, sockets=None) -> None:
+        await PROMPT_GATE.drain(self.drain_timeout)
+        await super().shutdown(sockets=sockets)
+
+
+async def serve_http(
+    transport: Literal["streamable-http", "sse"], host: str, port: int, shutdown_timeout: float
+) -> None:
+    """Serve the prompts over HTTP, so multiple clients can share one server process.
+
+    Args:
+        transport: Either "streamable-http" or "sse"
+        host: Host address to bind to
+        port: Port to bind to
+        shutdown_timeout: Seconds to wait for the in-flight prompts to finish when shutting down
+    """
+    config = uvicorn.Config(
+        APP.http_app(transport=transport),
+        host=host,
+        port=port,
+        # lifespan is required for streamable http
+        lifespan="on",
+        # The remaining connections are idle event streams once the prompts have been drained
+        timeout_graceful_shutdown=1,
+        log_level=APP.settings.log_level.lower(),
+    )
+    await _DrainingServer(config, drain_timeout=shutdown_timeout).serve()
 
 
 APP = FastMCP("jira-prompts-mcp", lifespan=server_lifespan)
 
 
+def collect_stats() -> dict[str, Any]:
+    """Collect the memory use of the process and the cache statistics of the connected Jira sites."""
+    return {"rss_bytes": current_rss(), "sites": _JIRA_SITES.stats() if _JIRA_SITES is not None else {}}
+
+
+@APP.custom_route("/stats", methods=["GET"])
+async def stats(request: Request) -> JSONResponse:
+    """Report the memory use and the cache statistics (HTTP transports only)."""
+    return JSONResponse(collect_stats())
+
+
 def _postprocessing_for_issue_fields_(field_to_value):
-    for name_field in ("status", "priority", "issuetype"):
-        if name_field in field_to_value:
-            field_to_value[name_field] = field_to_value[name_field].name
     for user_field in ("assignee", "reporter"):
         if user_field in field_to_value:
             if field_to_value[user_field] is None:
                 field_to_value[user_field] = "N/A"
             else:
-                field_to_value[user_field] = field_to_value[user_field].displayName
-    if "parent" in field_to_value:
+                field_to_value[user_field] = field_to_value[user_field].display_name
+    if "parent" in field_to_value and field_to_value["parent"] is not None:
         field_to_value["parent"] = {
             "key": field_to_value["parent"].key,
-            "summary": field_to_value["parent"].fields.summary,
-            "status": field_to_value["parent"].fields.status.name,
+            "summary": field_to_value["parent"].summary,
+            "status": field_to_value["parent"].status,
         }
 
 
@@ -108,41 +270,275 @@ def get_issue_and_core_fields(jira_fetcher: JiraFetcher, arguments: dict[str, st
         raise ValueError("Argument `issue_key` is required")
     issue_key = arguments.get("issue_key", "")
     assert issue_key
-    field_to_value, issue = jira_fetcher.get_issue_and_core_fields(issue_key)
+    field_to_value, issue = jira_fetcher.get_issue_and_core_fields(
+        issue_key, custom_fields=arguments.get("custom_fields") or ()
+    )
     field_to_value["issue_key"] = issue_key
     _postprocessing_for_issue_fields_(field_to_value)
     return field_to_value, issue
 
 
+def _normalize_custom_fields(custom_fields: str | None) -> str:
+    """Normalize a comma-separated list of custom field names (used in the prompt cache keys)."""
+    return ",".join(x.strip() for x in (custom_fields or "").split(",") if x.strip())
+
+
+# Prepended to the prompts whose optional sections were omitted
+INCOMPLETE_NOTE = "Note: some sections were omitted because Jira did not respond in time"
+
+
+def _format_age(seconds: float) -> str:
+    if seconds < 120:
+        return f"{seconds:.0f} seconds"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f} minutes"
+    return f"{seconds / 3600:.1f} hours"
+
+
+def _get_or_render(jira_fetcher: JiraFetcher, cache_key: tuple[str, str, str], render: Callable[[], str]) -> str:
+    """Get a rendered prompt from the cache, or render it.
+
+    A prompt that expired no longer than `stale_ttl` seconds ago is served right away with a note about its age,
+    while it is refreshed in the background. Incomplete renders (with omitted sections) are not cached.
+    """
+
+    def _render_and_store() -> str:
+        text = render()
+        if not text.startswith(INCOMPLETE_NOTE):
+            jira_fetcher.prompt_cache.set(cache_key, text)
+        return text
+
+    cached = jira_fetcher.prompt_cache.get_with_age(cache_key, max_stale=jira_fetcher.config.stale_ttl)
+    if cached is None:
+        return _render_and_store()
+    text, age, fresh = cached
+    if fresh:
+        return text
+    state = jira_fetcher.refresh_in_background(cache_key, _render_and_store)
+    reason = "Jira is currently unavailable" if state is RefreshState.UNAVAILABLE else "it is being refreshed"
+    LOGGER.info(f"Serving {cache_key[0]} for {cache_key[1]} cached {_format_age(age)} ago ({reason})")
+    return f"Note: this information was cached {_format_age(age)} ago and may be outdated ({reason}).\n\n{text}"
+
+
+def render_issue_brief(jira_fetcher: JiraFetcher, issue_key: str, custom_fields: str | None = None) -> str:
+    custom_fields = _normalize_custom_fields(custom_fields)
+
+    def _render():
+        field_to_value, issue = get_issue_and_core_fields(
+            jira_fetcher, {"issue_key": issue_key, "custom_fields": custom_fields}
+        )
+        return json.dumps(field_to_value, cls=StrFallbackEncoder, indent=4)
+
+    return _get_or_render(jira_fetcher, ("jira-issue-brief", issue_key.upper(), custom_fields), _render)
+
+
+def collect_issue_full(jira_fetcher: JiraFetcher, issue_key: str, custom_fields: str | None = None) -> dict[str, Any]:
+    """Collect the content of the jira-issue-full prompt.
+
+    The child tasks of epics and the comments are optional: if Jira is unavailable or the deadline of the request
+    passes while they are collected, they are left out and listed under "omitted_sections".
+    """
+    field_to_value, issue = get_issue_and_core_fields(
+        jira_fetcher, {"issue_key": issue_key, "custom_fields": custom_fields or ""}
+    )
+    field_to_value["links"] = jira_fetcher.collect_links(issue)
+    # The comments (no API calls when cached) are collected before the child tasks (a search)
+    sections: list[tuple[str, Callable[[], Any]]] = [("comments", lambda: jira_fetcher.collect_comments(issue))]
+    if field_to_value["issuetype"] != "Epic":
+        field_to_value["subtasks"] = jira_fetcher.collect_subtasks(issue)
+    else:
+        sections.append(("child_tasks", lambda: jira_fetcher.collect_epic_children(issue)))
+    omitted_sections = []
+    for name, collect in sections:
+        try:
+            field_to_value[name] = collect()
+        except requests.RequestException as e:
+            # Includes the open circuit breaker and the exceeded deadline
+            LOGGER.warning(f"Omitting the {name} of {issue_key}: {e}")
+            omitted_sections.append(name)
+    if "comments" in field_to_value:
+        # Keep the comments last
+        field_to_value["comments"] = field_to_value.pop("comments")
+    if omitted_sections:
+        field_to_value["omitted_sections"] = omitted_sections
+    return field_to_value
+
+
+def render_issue_full(jira_fetcher: JiraFetcher, issue_key: str, custom_fields: str | None = None) -> str:
+    custom_fields = _normalize_custom_fields(custom_fields)
+
+    def _render():
+        content = collect_issue_full(jira_fetcher, issue_key, custom_fields)
+        text = json.dumps(content, cls=StrFallbackEncoder, indent=4)
+        if "omitted_sections" in content:
+            return f"{INCOMPLETE_NOTE} ({', '.join(content['omitted_sections'])}).\n\n{text}"
+        return text
+
+    return _get_or_render(jira_fetcher, ("jira-issue-full", issue_key.upper(), custom_fields), _render)
+
+
+def _parse_id(name: str, value: str | None) -> int | None:
+    if value is None or not str(value).strip():
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Argument `{name}` must be a number: {value}") from None
+
+
+def collect_sprint_summary(
+    jira_fetcher: JiraFetcher, board_id: str | None = None, sprint_id: str | None = None, jql: str | None = None
+) -> dict[str, Any]:
+    """Collect the content of the jira-sprint-summary prompt.
+
+    The issues are picked by the sprint, by the active sprints of the board, or by the JQL query. When a JQL query is
+    given along with a sprint or board, it narrows down the issues of the sprint (e.g., "project = PROJ").
+
+    Raises:
+        ValueError: If none of the arguments is given, or the board has no active sprint
+    """
+    board = _parse_id("board_id", board_id)
+    sprint = _parse_id("sprint_id", sprint_id)
+    jql = (jql or "").strip()
+    if sprint is not None:
+        sprints = [jira_fetcher.get_sprint(sprint)]
+    elif board is not None:
+        sprints = jira_fetcher.get_active_sprints(board)
+        if not sprints:
+            raise ValueError(f"Board {board} has no active sprint")
+    elif jql:
+        sprints = []
+    else:
+        raise ValueError("One of the arguments `board_id`, `sprint_id`, and `jql` is required")
+    if sprints:
+        sprint_clause = f"sprint in ({', '.join(str(x['id']) for x in sprints)})"
+        # The ORDER BY clause of the query must stay at the end
+        jql_filter, order_by = split_order_by(jql)
+        jql = f"{sprint_clause} AND ({jql_filter})" if jql_filter else sprint_clause
+        if order_by:
+            jql = f"{jql} {order_by}"
+    results: dict[str, Any] = {}
+    if sprints:
+        results["sprints"] = sprints
+    results["jql"] = jql
+    return results | jira_fetcher.summarize_issues(jql)
+
+
+def render_sprint_summary(
+    jira_fetcher: JiraFetcher, board_id: str | None = None, sprint_id: str | None = None, jql: str | None = None
+) -> str:
+    content = collect_sprint_summary(jira_fetcher, board_id, sprint_id, jql)
+    text = json.dumps(content, cls=StrFallbackEncoder, indent=4)
+    if content.get("incomplete"):
+        note = f"Note: only the first {content['total']} issues were counted because Jira did not respond in time"
+        return f"{note}.\n\n{text}"
+    return text
+
+
+def get_prompt_deadline() -> float:
+    """The time budget of a prompt invocation in seconds (0 means no deadline)."""
+    return float(os.getenv("JIRA_PROMPTS_DEADLINE", "25"))
+
+
+@functools.cache
+def get_prompt_profiler() -> PromptProfiler | None:
+    """Get the profiler of the prompt invocations (None unless profiling is enabled by the environment variables)."""
+    profiler = PromptProfiler.from_env()
+    if profiler is not None:
+        LOGGER.info(f"Profiling prompt invocations to {profiler.output_dir}")
+    return profiler
+
+
+def render_prompt(prompt: str, render: Callable[..., str], jira_fetcher: JiraFetcher, issue_key: str, *args) -> str:
+    """Render a prompt, profiling it if the invocation is selected by the prompt profiler.
+
+    Args:
+        prompt: The name of the prompt
+        render: The function rendering the prompt (called with the fetcher, the issue key, and `args`)
+        jira_fetcher: The fetcher of the Jira site
+        issue_key: The key of the issue
+    """
+    profiler = get_prompt_profiler()
+    if profiler is None:
+        return render(jira_fetcher, issue_key, *args)
+    return profiler.run(prompt, issue_key, render, jira_fetcher, issue_key, *args)
+
+
 @APP.prompt(
     name="jira-issue-brief",
 )
-def jira_issu_brief(issue_key: str = Field(description="The key/ID of the issue")):
+async def jira_issu_brief(
+    issue_key: str = Field(description="The key/ID of the issue"),
+    site: str | None = Field(
+        default=None, description="The Jira site to use (defaults to the site the project of the issue belongs to)"
+    ),
+    custom_fields: str | None = Field(
+        default=None,
+        description='Comma-separated names or IDs of custom fields to include (e.g., "Story Points,Sprint")',
+    ),
+):
     "Get the core information about a Jira issue, including its description, parent, status, type, priority, and assignee."
     ctx = get_context()
-    # TODO: this is probably not best way to get the Jira fetcher instance
-    jira_fetcher = ctx.request_context.lifespan_context
-    field_to_value, issue = get_issue_and_core_fields(jira_fetcher, {"issue_key": issue_key})
-    return PromptMessage(
-        role="user", content=TextContent(type="text", text=json.dumps(field_to_value, cls=StrFallbackEncoder, indent=4))
-    )
+    # TODO: this is probably not best way to get the Jira sites
+    jira_sites: JiraSiteRegistry = ctx.request_context.lifespan_context
+    async with track_prompt("jira-issue-brief", issue_key, site), PROMPT_GATE.slot(ctx.session):
+        # Connecting to Jira, the API calls, and the text conversion are blocking, so keep them off the event loop
+        # (the worker threads inherit the deadline)
+        with deadline_scope(get_prompt_deadline()):
+            jira_fetcher = await asyncio.to_thread(jira_sites.get, site, issue_key)
+            text = await asyncio.to_thread(
+                render_prompt, "jira-issue-brief", render_issue_brief, jira_fetcher, issue_key, custom_fields
+            )
+    return PromptMessage(role="user", content=TextContent(type="text", text=text))
 
 
 @APP.prompt(
     name="jira-issue-full",
 )
-def jira_issu_full(issue_key: str = Field(description="The key/ID of the issue")):
+async def jira_issu_full(
+    issue_key: str = Field(description="The key/ID of the issue"),
+    site: str | None = Field(
+        default=None, description="The Jira site to use (defaults to the site the project of the issue belongs to)"
+    ),
+    custom_fields: str | None = Field(
+        default=None,
+        description='Comma-separated names or IDs of custom fields to include (e.g., "Story Points,Sprint")',
+    ),
+):
     "Get the full information about a Jira issue, including core information, linked issues, child tasks/sub tasks, and comments."
     ctx = get_context()
-    # TODO: this is probably not best way to get the Jira fetcher instance
-    jira_fetcher = ctx.request_context.lifespan_context
-    field_to_value, issue = get_issue_and_core_fields(jira_fetcher, {"issue_key": issue_key})
-    field_to_value["links"] = jira_fetcher.collect_links(issue)
-    if field_to_value["issuetype"] != "Epic":
-        field_to_value["subtasks"] = jira_fetcher.collect_subtasks(issue)
-    else:
-        field_to_value["child_tasks"] = jira_fetcher.collect_epic_children(issue)
-    field_to_value["comments"] = jira_fetcher.collect_comments(issue)
-    return PromptMessage(
-        role="user", content=TextContent(type="text", text=json.dumps(field_to_value, cls=StrFallbackEncoder, indent=4))
-    )
+    # TODO: this is probably not best way to get the Jira sites
+    jira_sites: JiraSiteRegistry = ctx.request_context.lifespan_context
+    async with track_prompt("jira-issue-full", issue_key, site), PROMPT_GATE.slot(ctx.session):
+        # Connecting to Jira, the API calls, and the text conversion are blocking, so keep them off the event loop
+        # (the worker threads inherit the deadline)
+        with deadline_scope(get_prompt_deadline()):
+            jira_fetcher = await asyncio.to_thread(jira_sites.get, site, issue_key)
+            text = await asyncio.to_thread(
+                render_prompt, "jira-issue-full", render_issue_full, jira_fetcher, issue_key, custom_fields
+            )
+    return PromptMessage(role="user", content=TextContent(type="text", text=text))
+
+
+@APP.prompt(
+    name="jira-sprint-summary",
+)
+async def jira_sprint_summary(
+    board_id: str | None = Field(default=None, description="The ID of a board (its active sprints are summarized)"),
+    sprint_id: str | None = Field(default=None, description="The ID of a sprint"),
+    jql: str | None = Field(
+        default=None,
+        description="A JQL query picking the issues (narrows down the issues of the sprint if one is given)",
+    ),
+    site: str | None = Field(default=None, description="The Jira site to use (defaults to the default site)"),
+):
+    "Summarize a sprint (or the issues matched by a JQL query) for stand-ups: the number of issues per status and per assignee, and the in-progress and blocked issues."
+    ctx = get_context()
+    # TODO: this is probably not best way to get the Jira sites
+    jira_sites: JiraSiteRegistry = ctx.request_context.lifespan_context
+    target = f"sprint {sprint_id}" if sprint_id else (f"board {board_id}" if board_id else "jql")
+    async with track_prompt("jira-sprint-summary", target, site), PROMPT_GATE.slot(ctx.session):
+        with deadline_scope(get_prompt_deadline()):
+            jira_fetcher = await asyncio.to_thread(jira_sites.get, site)
+            text = await asyncio.to_thread(render_sprint_summary, jira_fetcher, board_id, sprint_id, jql)
+    return PromptMessage(role="user", content=TextContent(type="text", text=text))
@@ -0,0 +1,90 @@
+"""A local HTTP endpoint receiving Jira webhook events, which keep the caches fresh without polling Jira.
+
+Register `http://<host>:<port>/webhooks/jira` (or `/webhooks/jira/<site>` when serving multiple sites) as a webhook
+in Jira for the issue, comment, and issue link events. The cache statistics are served at `/stats`.
+
+The issue link events only carry the numeric IDs of the issues, which are not unique across sites. When serving
+multiple sites, they are rejected unless they are sent to the path of their site.
+"""
+
+import hmac
+import asyncio
+import hashlib
+import logging
+import threading
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from .jira_utils.webhooks import ISSUE_LINK_EVENTS
+from .server import collect_stats, get_jira_sites
+
+LOGGER = logging.getLogger("jira_prompts.webhooks")
+
+
+def _verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Verify the `X-Hub-Signature` header Jira sends when the webhook has a secret."""
+    if not signature:
+        return False
+    method, _, digest = signature.partition("=")
+    if method not in ("sha256", "sha1"):
+        return False
+    expected = hmac.new(secret.encode(), body, getattr(hashlib, method)).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+
+def create_webhook_app(secret: str | None = None) -> Starlette:
+    """Create the Starlette app receiving the webhook events.
+
+    Args:
+        secret: The secret of the webhook (requests without a valid signature are rejected when it is set)
+    """
+
+    async def receive(request: Request) -> JSONResponse:
+        body = await request.body()
+        if secret and not _verify_signature(secret, body, request.headers.get("x-hub-signature")):
+            return JSONResponse({"error": "invalid signature"}, status_code=401)
+        try:
+            payload = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "invalid JSON"}, status_code=400)
+        site = request.path_params.get("site")
+        issue_key = (payload.get("issue") or {}).get("key")
+        jira_sites = get_jira_sites()
+        if site is None and payload.get("webhookEvent") in ISSUE_LINK_EVENTS and len(jira_sites.configs) > 1:
+            # Without the site, the IDs of the linked issues would invalidate unrelated issues of the other sites
+            return JSONResponse(
+                {"error": "issue link events need the site in the path (/webhooks/jira/<site>)"}, status_code=400
+            )
+        try:
+            fetchers = jira_sites.active_fetchers(site=site, issue_key=issue_key)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=404)
+        handled = False
+        for fetcher in fetchers:
+            handled = fetcher.handle_webhook_event(payload) or handled
+        return JSONResponse({"handled": handled})
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse(collect_stats())
+
+    return Starlette(
+        routes=[
+            Route("/stats", stats, methods=["GET"]),
+            Route("/webhooks/jira", receive, methods=["POST"]),
+            Route("/webhooks/jira/{site}", receive, methods=["POST"]),
+        ]
+    )
+
+
+def start_webhook_receiver(host: str, port: int, secret: str | None = None) -> threading.Thread:
+    """Serve the webhook endpoint in a background thread, next to the MCP server of any transport."""
+    config = uvicorn.Config(create_webhook_app(secret), host=host, port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),), name="jira-webhooks", daemon=True)
+    thread.start()
+    LOGGER.info(f"Receiving Jira webhook events at http://{host}:{port}/webhooks/jira")
+    return thread
@@ -0,0 +1,53 @@
+import os
+from collections.abc import Callable, Iterator
+
+import pytest
+
+from jira_prompts_mcp_server.jira_utils import JiraFetcher
+from jira_prompts_mcp_server.jira_utils import client as client_module
+from jira_prompts_mcp_server.jira_utils.config import JiraConfig
+
+from .fakes import FakeJira
+
+BASE_URL = "https://example.atlassian.net"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-golden",
+        action="store_true",
+        help="Record the current outputs and times of the converters as the expected ones (see test_converters.py)",
+    )
+
+
+@pytest.fixture
+def make_fetcher(monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[..., JiraFetcher]]:
+    """Build fetchers backed by `FakeJira`. The keyword arguments override the fields of the `JiraConfig`."""
+    monkeypatch.setattr(client_module, "JIRA", FakeJira)
+    fetchers = []
+
+    def _make(**config_fields) -> JiraFetcher:
+        config = JiraConfig(url=BASE_URL, auth_type="basic", username="bot@example.com", api_token="secret")
+        for name, value in config_fields.items():
+            setattr(config, name, value)
+        fetcher = JiraFetcher(config)
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield _make
+    for fetcher in fetchers:
+        fetcher.close()
+
+
+@pytest.fixture
+def env(monkeypatch: pytest.MonkeyPatch) -> Callable[..., None]:
+    """Clear the JIRA_* environment variables, and return a function setting some."""
+    for name in list(os.environ):
+        if name.startswith("JIRA_"):
+            monkeypatch.delenv(name)
+
+    def _set(**variables: str) -> None:
+        for name, value in variables.items():
+            monkeypatch.setenv(name, value)
+
+    return _set
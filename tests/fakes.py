@@ -0,0 +1,48 @@
+"""A stand-in for `jira.JIRA` that serves recorded responses instead of talking to a Jira site."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import requests
+from jira.exceptions import JIRAError
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(path: str) -> dict[str, Any]:
+    """Load a JSON file of the fixtures directory (e.g., "webhooks/comment_created.json")."""
+    return json.loads((FIXTURES_DIR / path).read_text(encoding="utf-8"))
+
+
+class FakeJira:
+    """Serves the issues in `fixtures/issues` (the responses of `GET /rest/api/2/issue/<key>`).
+
+    The requests to the REST API v3 (with a `base` URL) are served from `fixtures/issues_v3`, whose rich-text fields
+    are ADF documents. Only the methods used by the fetchers are implemented. The requested paths are recorded in
+    `requests`, and their base URLs (None for the REST API v2) in `bases`.
+    """
+
+    def __init__(self, server: str, **kwargs: Any) -> None:
+        self.server_url = server
+        # The client mounts its HTTP adapter on the session
+        self._session = requests.Session()
+        self.requests: list[str] = []
+        self.bases: list[str | None] = []
+
+    def _get_json(self, path: str, params: dict[str, Any] | None = None, base: str | None = None) -> dict[str, Any]:
+        self.requests.append(path)
+        self.bases.append(base)
+        issue_key = path.rsplit("/", 1)[-1]
+        directory = "issues_v3" if base else "issues"
+        if not path.startswith("issue/") or not (FIXTURES_DIR / directory / f"{issue_key}.json").exists():
+            raise JIRAError(status_code=404, text=f"No fixture for {path}")
+        return load_fixture(f"{directory}/{issue_key}.json")
+
+    def fields(self) -> list[dict[str, Any]]:
+        """The response of `GET /rest/api/2/field` (in `fixtures/fields.json`)."""
+        self.requests.append("field")
+        return json.loads((FIXTURES_DIR / "fields.json").read_text(encoding="utf-8"))
+
+    def close(self) -> None:
+        self._session.close()
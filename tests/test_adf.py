@@ -0,0 +1,100 @@
+"""Check the rendering of ADF documents (the rich-text fields of the REST API v3) to Markdown.
+
+Each document of `fixtures/adf` is rendered and compared with its expected Markdown (`<name>.expected.md`). After an
+intended change to the outputs, review the differences and run the tests with `--update-golden` to record them.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from jira_prompts_mcp_server.jira_utils.adf import AdfRenderer
+from jira_prompts_mcp_server.jira_utils.issues import ADF_BASE_URL
+from jira_prompts_mcp_server.jira_utils.preprocessing import JiraPreprocessor
+
+from .conftest import BASE_URL
+from .fakes import FIXTURES_DIR, load_fixture
+
+ADF_DIR = FIXTURES_DIR / "adf"
+DOCUMENTS = sorted(ADF_DIR.glob("*.json"))
+
+
+def _resolve_user(account_id: str) -> str | None:
+    """Knows acc-1, fails for acc-error, and finds no one else."""
+    if account_id == "acc-error":
+        raise RuntimeError("Jira is down")
+    return {"acc-1": "Sam Okafor"}.get(account_id)
+
+
+@pytest.mark.parametrize("path", DOCUMENTS, ids=lambda path: path.stem)
+def test_output(path: Path, request: pytest.FixtureRequest):
+    output = AdfRenderer(resolve_user=_resolve_user).render(load_fixture(f"adf/{path.name}"))
+
+    expected_path = path.with_suffix(".expected.md")
+    if request.config.getoption("--update-golden"):
+        expected_path.write_text(output + "\n", encoding="utf-8")
+    assert output + "\n" == expected_path.read_text(encoding="utf-8")
+
+
+def test_mentions_without_a_lookup():
+    doc = load_fixture("adf/inline.json")
+
+    output = AdfRenderer().render(doc)
+
+    assert "Mentions: @<Sam Okafor>, @<acc-1>, @<acc-2>, @<acc-error>, @<unknown>" in output
+
+
+def test_empty_documents():
+    renderer = AdfRenderer()
+
+    assert renderer.render(None) == ""
+    assert renderer.render({"type": "doc", "version": 1, "content": []}) == ""
+
+
+def test_the_body_is_converted_by_its_format():
+    preprocessor = JiraPreprocessor(jira_client=None, base_url=BASE_URL)
+    doc = load_fixture("adf/lists.json")
+    text = "h2. Summary\nCheckout fails with a *500 error*."
+
+    assert preprocessor.clean_body(doc) == preprocessor.clean_adf(doc)
+    assert (
+        preprocessor.clean_body(text)
+        == preprocessor.clean_jira_text(text)
+        == "## Summary\nCheckout fails with a **500 error**."
+    )
+    assert preprocessor.clean_body(None) == ""
+
+
+def test_cloud_sites_fetch_adf_documents_when_enabled(make_fetcher):
+    fetcher = make_fetcher(adf=True)
+
+    results, issue = fetcher.get_issue_and_core_fields("ACME-12", fields="summary,description")
+    comments = fetcher.collect_comments(issue)
+
+    assert fetcher.jira.bases == [ADF_BASE_URL]
+    assert isinstance(issue.description, dict)
+    assert results["description"] == (
+        "## Summary\n\n"
+        "Checkout fails with a **500 error** when the cart contains more than *50 items*.\n\n"
+        "```java\n"
+        "java.lang.IllegalStateException: Cart exceeds the maximum batch size (50)\n"
+        "```"
+    )
+    assert comments[0]["body"] == (
+        f"The limit comes from [ACME-15]({BASE_URL}/browse/ACME-15); @<Dana Whitfield> has to land it first."
+    )
+
+
+@pytest.mark.parametrize(
+    "config_fields",
+    [{}, {"adf": True, "url": "https://jira.example.com", "auth_type": "token", "personal_token": "secret"}],
+    ids=["disabled", "server"],
+)
+def test_the_markup_is_fetched_otherwise(make_fetcher, config_fields):
+    fetcher = make_fetcher(**config_fields)
+
+    results, issue = fetcher.get_issue_and_core_fields("ACME-12", fields="description")
+
+    assert fetcher.jira.bases == [None]
+    assert isinstance(issue.description, str)
+    assert results["description"].startswith("## Summary\nCheckout fails with a **500 error**")
@@ -0,0 +1,97 @@
+import pytest
+
+from jira_prompts_mcp_server.jira_utils.config import JiraConfig, parse_size
+
+
+def test_cloud_sites_use_basic_authentication(env):
+    env(JIRA_URL="https://acme.atlassian.net", JIRA_USERNAME="bot@example.com", JIRA_API_TOKEN="secret")
+
+    config = JiraConfig.from_env()
+
+    assert (config.url, config.auth_type, config.username, config.api_token) == (
+        "https://acme.atlassian.net",
+        "basic",
+        "bot@example.com",
+        "secret",
+    )
+    assert config.is_cloud
+    assert (config.pool_size, config.rate_limit, config.cache_ttl, config.memory_budget) == (10, None, 0.0, 0)
+
+
+def test_the_variables_of_a_site_are_read_with_its_prefix(env):
+    env(
+        JIRA_URL="https://acme.atlassian.net",
+        JIRA_DC_URL="https://jira.example.com",
+        JIRA_DC_PERSONAL_TOKEN="secret",
+        JIRA_DC_PROJECTS="ops, infra,",
+        JIRA_DC_PROJECTS_FILTER="OPS",
+        JIRA_DC_RATE_LIMIT="2.5",
+        JIRA_DC_CACHE_TTL="600",
+        JIRA_DC_TIMEOUT="0",
+        JIRA_DC_ADF="true",
+        JIRA_CACHE_TTL="60",
+    )
+
+    config = JiraConfig.from_env(prefix="JIRA_DC_")
+
+    assert (config.url, config.auth_type, config.personal_token) == ("https://jira.example.com", "token", "secret")
+    assert config.projects == {"OPS", "INFRA"}
+    assert config.projects_filter == "OPS"
+    assert (config.rate_limit, config.cache_ttl, config.timeout) == (2.5, 600.0, None)
+    # ADF is only supported by Jira Cloud
+    assert config.adf and not config.use_adf
+
+
+def test_the_projects_filter_does_not_route_projects(env):
+    env(JIRA_URL="https://jira.example.com", JIRA_PERSONAL_TOKEN="secret", JIRA_PROJECTS_FILTER="OPS")
+
+    assert JiraConfig.from_env().projects == set()
+
+
+@pytest.mark.parametrize(
+    "variables, message",
+    [
+        ({}, "Missing required JIRA_DC_URL"),
+        ({"JIRA_DC_URL": "https://acme.atlassian.net", "JIRA_DC_USERNAME": "bot"}, "JIRA_DC_API_TOKEN"),
+        ({"JIRA_DC_URL": "https://jira.example.com"}, "JIRA_DC_PERSONAL_TOKEN"),
+    ],
+)
+def test_missing_variables(env, variables, message):
+    env(**variables)
+
+    with pytest.raises(ValueError, match=message):
+        JiraConfig.from_env(prefix="JIRA_DC_")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("0", 0),
+        ("1048576", 1 << 20),
+        ("512K", 512 << 10),
+        ("64KB", 64 << 10),
+        ("256M", 256 << 20),
+        ("256mib", 256 << 20),
+        (" 1.5G ", 3 << 29),
+        ("2 GiB", 2 << 30),
+        ("100B", 100),
+    ],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "M", "-1M", "1T", "1.5.0M", "256 MBs", "lots"])
+def test_invalid_sizes(value):
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size(value)
+
+
+def test_the_memory_budget_is_read_as_a_size(env):
+    env(JIRA_URL="https://acme.atlassian.net", JIRA_USERNAME="bot", JIRA_API_TOKEN="secret", JIRA_MEMORY_BUDGET="64M")
+
+    assert JiraConfig.from_env().memory_budget == 64 << 20
+
+    env(JIRA_MEMORY_BUDGET="64 megabytes")
+    with pytest.raises(ValueError, match="Invalid size: 64 megabytes"):
+        JiraConfig.from_env()
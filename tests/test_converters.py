@@ -0,0 +1,223 @@
+"""Check the text converters against a golden corpus, for both the output and the speed.
+
+The corpus (`fixtures/converters`) holds anonymized real-world issue descriptions and comments, along with their
+expected conversions. Each case of `manifest.json` converts an input file with one of the converters of
+`JiraPreprocessor` (`clean_jira_text`, `jira_to_markdown`, or `markdown_to_jira`), optionally repeated to make a large
+text. The output is compared with the expected file (or its SHA-256 for the large texts), and the conversion time with
+the time recorded along with it. The recorded times are scaled by a calibration workload that measures the speed of
+the machine, so the check is meaningful on other machines.
+
+After an intended change to the outputs (or to the speed), review the differences and run the tests with
+`--update-golden` to record the new outputs and times.
+
+On top of the corpus, random Markdown documents are converted to the Jira markup and back, which should give back the
+same documents.
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+from typing import Any, Callable
+
+import pytest
+
+from jira_prompts_mcp_server.jira_utils.preprocessing import JiraPreprocessor
+
+from .fakes import FIXTURES_DIR
+
+CORPUS_DIR = FIXTURES_DIR / "converters"
+MANIFEST: dict[str, Any] = json.loads((CORPUS_DIR / "manifest.json").read_text(encoding="utf-8"))
+CONVERTERS = ("clean_jira_text", "jira_to_markdown", "markdown_to_jira")
+# The allowed slowdown relative to the recorded times (0.5 means 50% slower). Slowdowns of less than NOISE_FLOOR_MS
+# milliseconds are considered noise.
+TOLERANCE = 0.5
+NOISE_FLOOR_MS = 1.0
+# The number of timings of each case (the shortest one counts)
+RUNS = 5
+
+
+def _best_time_ms(func: Callable[[], Any], runs: int = RUNS) -> float:
+    """The shortest of `runs` timings of a function, in milliseconds."""
+    best = float("inf")
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start_time)
+    return best * 1000
+
+
+def calibrate() -> float:
+    """Time a fixed workload (regex and string processing, like the converters) on this machine, in milliseconds."""
+    text = "The *quick* brown fox [jumps|https://example.com] over the {{lazy}} dog.\n" * 2000
+
+    def _workload():
+        words = re.findall(r"\w+", text)
+        counts: dict[str, int] = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        re.sub(r"\[([^|]+)\|(.+?)\]", r"[\1](\2)", text)
+        "\n".join(sorted(text.split("\n")))
+
+    return _best_time_ms(_workload)
+
+
+def _save_manifest() -> None:
+    (CORPUS_DIR / "manifest.json").write_text(json.dumps(MANIFEST, indent=2) + "\n", encoding="utf-8")
+
+
+def _read_input(case: dict[str, Any]) -> str:
+    text = (CORPUS_DIR / case["input"]).read_text(encoding="utf-8")
+    repeat = case.get("repeat", 1)
+    return "\n\n".join([text] * repeat) if repeat > 1 else text
+
+
+@pytest.fixture(scope="module")
+def update_golden(request: pytest.FixtureRequest) -> bool:
+    return request.config.getoption("--update-golden")
+
+
+@pytest.fixture(scope="module")
+def preprocessor() -> JiraPreprocessor:
+    return JiraPreprocessor(jira_client=None, base_url=MANIFEST["base_url"])
+
+
+@pytest.fixture(scope="module")
+def recorded_calibration_ms(update_golden: bool) -> float:
+    """The time of the calibration workload on the machine that recorded the times."""
+    if update_golden:
+        MANIFEST["calibration_ms"] = round(calibrate(), 3)
+        _save_manifest()
+    return MANIFEST["calibration_ms"]
+
+
+@pytest.fixture(params=MANIFEST["cases"], ids=lambda case: case["name"])
+def case(request: pytest.FixtureRequest) -> dict[str, Any]:
+    if request.param["converter"] not in CONVERTERS:
+        raise ValueError(f"Unknown converter of {request.param['name']}: {request.param['converter']}")
+    return request.param
+
+
+def test_output(case, preprocessor, update_golden):
+    output = getattr(preprocessor, case["converter"])(_read_input(case))
+
+    if case.get("repeat", 1) > 1:
+        sha256 = hashlib.sha256(output.encode("utf-8")).hexdigest()
+        if update_golden:
+            case["expected_sha256"] = sha256
+            _save_manifest()
+        assert sha256 == case["expected_sha256"], f"The SHA-256 of the output of {case['name']} changed"
+        return
+    if update_golden:
+        suffix = ".jira" if case["converter"] == "markdown_to_jira" else ".md"
+        case.setdefault("expected", f"{case['name']}.expected{suffix}")
+        (CORPUS_DIR / case["expected"]).write_text(output, encoding="utf-8")
+        _save_manifest()
+    assert output == (CORPUS_DIR / case["expected"]).read_text(encoding="utf-8")
+
+
+def test_speed(case, preprocessor, recorded_calibration_ms, update_golden):
+    convert = getattr(preprocessor, case["converter"])
+    text = _read_input(case)
+    convert(text)
+
+    # How much slower this machine is than the one that recorded the times. It is measured next to each case, as the
+    # speed of a (shared) machine drifts.
+    speed_scale = calibrate() / recorded_calibration_ms
+    elapsed_ms = _best_time_ms(lambda: convert(text))
+
+    if update_golden:
+        case["baseline_ms"] = round(elapsed_ms / speed_scale, 3)
+        _save_manifest()
+        return
+    baseline_ms = case["baseline_ms"] * speed_scale
+    allowed_ms = max(baseline_ms * (1 + TOLERANCE), baseline_ms + NOISE_FLOOR_MS)
+    assert elapsed_ms <= allowed_ms, f"{case['name']} took {elapsed_ms:.2f} ms (allowed: {allowed_ms:.2f} ms)"
+
+
+# Random documents for the round-trip check, made of the constructs both converters support
+_WORDS = ("order", "cart", "deploy", "queue", "latency", "customer", "invoice", "retry", "cache", "index", "v2", "2024")
+# Lines of code that look like markup, which the converters must leave alone
+_CODE_LINES = (
+    "total = cart[0] * 2  # retry",
+    "SELECT * FROM orders WHERE id = 1;",
+    "- not a list item",
+    "h2. not a heading",
+    "def deploy(*args, **kwargs):",
+    "cache_key = {'order': [1, 2]}",
+    "x = a+b+c - y-z",
+)
+
+
+def _random_inline(rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(3, 12)):
+        word = rng.choice(_WORDS)
+        kind = rng.random()
+        if kind < 0.1:
+            word = f"**{word}**"
+        elif kind < 0.2:
+            word = f"*{word}*"
+        elif kind < 0.3:
+            word = f"`{word}`"
+        elif kind < 0.35:
+            word = f"[{word}](https://example.com/{word})"
+        elif kind < 0.4:
+            word = f"~~{word}~~"
+        elif kind < 0.45:
+            word = f"<https://example.com/{word}>"
+        words.append(word)
+    return " ".join(words)
+
+
+def _random_block(rng: random.Random) -> str:
+    kind = rng.randrange(9)
+    if kind == 0:
+        return "#" * rng.randint(1, 4) + " " + _random_inline(rng)
+    if kind == 1:
+        return "\n".join(f"- {_random_inline(rng)}" for _ in range(rng.randint(1, 4)))
+    if kind == 2:
+        return "\n".join(f"1. {_random_inline(rng)}" for _ in range(rng.randint(1, 4)))
+    if kind == 3:
+        width = rng.randint(2, 4)
+        rows = [[rng.choice(_WORDS) for _ in range(width)] for _ in range(rng.randint(2, 4))]
+        lines = ["| " + " | ".join(row) + " |" for row in rows]
+        lines.insert(1, "|" + "---|" * width)
+        return "\n".join(lines)
+    if kind == 4:
+        return f"> {_random_inline(rng)}"
+    if kind == 5:
+        word = rng.choice(_WORDS)
+        return f"![{word if rng.random() < 0.5 else ''}](https://example.com/{word}.png)"
+    if kind == 6:
+        # A nested bulleted list (two spaces per level)
+        levels = [0]
+        for _ in range(rng.randint(1, 4)):
+            levels.append(rng.randint(0, min(levels[-1] + 1, 2)))
+        return "\n".join("  " * level + f"- {_random_inline(rng)}" for level in levels)
+    if kind == 7:
+        language = rng.choice(("", "python", "sql"))
+        code = "\n".join(rng.choice(_CODE_LINES) for _ in range(rng.randint(1, 4)))
+        return f"```{language}\n{code}\n```"
+    return _random_inline(rng)
+
+
+def random_markdown(rng: random.Random) -> str:
+    """Generate a random Markdown document that the converters should round-trip."""
+    return "\n\n".join(_random_block(rng) for _ in range(rng.randint(1, 8)))
+
+
+def test_round_trips(preprocessor):
+    rng = random.Random(0)
+    documents = [random_markdown(rng) for _ in range(300)]
+
+    failures = [
+        (document, result)
+        for document in documents
+        if (result := preprocessor.jira_to_markdown(preprocessor.markdown_to_jira(document))) != document
+    ]
+
+    assert not failures, (
+        f"{len(failures)} of {len(documents)} documents changed, e.g.:\n{failures[0][0]}\n--- became:\n{failures[0][1]}"
+    )
@@ -0,0 +1,141 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from jira_prompts_mcp_server import export as export_module
+from jira_prompts_mcp_server.export import CHECKPOINT_SUFFIX, ExportCheckpoint, export_issues
+from jira_prompts_mcp_server.jira_utils.resilience import CircuitOpenError
+
+KEYS = [f"ACME-{number}" for number in range(1, 8)]
+
+
+class _SearchJira:
+    """Pages through the search results of KEYS, and records the offsets of the pages."""
+
+    def __init__(self) -> None:
+        self.offsets: list[int] = []
+
+    def search_issues(self, jql: str, startAt: int, maxResults: int, fields: str, json_result: bool) -> dict:
+        self.offsets.append(startAt)
+        return {"issues": [{"key": key} for key in KEYS[startAt : startAt + maxResults]], "total": len(KEYS)}
+
+
+class _ExportFetcher:
+    def __init__(self) -> None:
+        self.jira = _SearchJira()
+
+
+class _Renderer:
+    """Stands in for `collect_issue_full`: fails or omits sections for the configured issues, and records the renders."""
+
+    def __init__(self, failed=(), partial=(), unavailable=()) -> None:
+        self.failed, self.partial, self.unavailable = set(failed), set(partial), set(unavailable)
+        self.rendered: list[str] = []
+
+    def __call__(self, jira_fetcher, issue_key: str, custom_fields: str | None) -> dict:
+        if issue_key in self.unavailable:
+            raise CircuitOpenError("The circuit breaker is open")
+        if issue_key in self.failed:
+            raise ValueError("Broken issue")
+        self.rendered.append(issue_key)
+        content = {"key": issue_key, "custom_fields": custom_fields}
+        if issue_key in self.partial:
+            content["omitted_sections"] = ["comments"]
+        return content
+
+
+@pytest.fixture
+def output(tmp_path: Path) -> Path:
+    return tmp_path / "issues.jsonl.gz"
+
+
+def _exported_keys(output: Path) -> list[str]:
+    with gzip.open(output, "rt", encoding="utf-8") as f:
+        return [json.loads(line)["key"] for line in f]
+
+
+def _export(output: Path, renderer: _Renderer, monkeypatch: pytest.MonkeyPatch, **kwargs) -> ExportCheckpoint:
+    monkeypatch.setattr(export_module, "collect_issue_full", renderer)
+    kwargs.setdefault("jira_fetcher", _ExportFetcher())
+    return export_issues(jql="project = ACME", output=output, page_size=3, concurrency=2, **kwargs)
+
+
+def test_every_issue_is_exported(output, monkeypatch):
+    checkpoint = _export(output, _Renderer(), monkeypatch)
+
+    assert _exported_keys(output) == KEYS
+    assert checkpoint.exported == len(KEYS) and checkpoint.complete
+    assert not output.with_name(output.name + CHECKPOINT_SUFFIX).exists()
+
+
+def test_failed_and_partial_issues_are_retried_on_resume(output, monkeypatch):
+    checkpoint_path = output.with_name(output.name + CHECKPOINT_SUFFIX)
+
+    checkpoint = _export(output, _Renderer(failed=["ACME-2"], partial=["ACME-6"]), monkeypatch)
+
+    assert _exported_keys(output) == ["ACME-1", "ACME-3", "ACME-4", "ACME-5", "ACME-7"]
+    assert (checkpoint.failed_keys, checkpoint.partial_keys) == (["ACME-2"], ["ACME-6"])
+    assert ExportCheckpoint.load(checkpoint_path) == checkpoint
+
+    fetcher = _ExportFetcher()
+    renderer = _Renderer()
+    checkpoint = _export(output, renderer, monkeypatch, jira_fetcher=fetcher, resume=True)
+
+    # Only the failed and partial issues are rendered again, and the search goes on from the end of the results
+    assert renderer.rendered == ["ACME-2", "ACME-6"]
+    assert fetcher.jira.offsets == [len(KEYS)]
+    assert sorted(_exported_keys(output)) == sorted(KEYS)
+    assert checkpoint.exported == len(KEYS) and checkpoint.complete
+    assert not checkpoint_path.exists()
+
+
+def test_the_export_stops_when_jira_is_unavailable(output, monkeypatch):
+    checkpoint_path = output.with_name(output.name + CHECKPOINT_SUFFIX)
+
+    with pytest.raises(CircuitOpenError):
+        _export(output, _Renderer(failed=["ACME-1"], unavailable=["ACME-5"]), monkeypatch)
+
+    # The second page was not written, and the checkpoint is the one of the first page
+    checkpoint = ExportCheckpoint.load(checkpoint_path)
+    assert checkpoint is not None
+    assert (checkpoint.next_start, checkpoint.exported, checkpoint.failed_keys) == (3, 2, ["ACME-1"])
+    assert checkpoint.output_size == output.stat().st_size
+    assert _exported_keys(output) == ["ACME-2", "ACME-3"]
+
+    fetcher = _ExportFetcher()
+    _export(output, _Renderer(), monkeypatch, jira_fetcher=fetcher, resume=True)
+
+    assert fetcher.jira.offsets == [3, 6]
+    assert _exported_keys(output) == ["ACME-2", "ACME-3", "ACME-1", "ACME-4", "ACME-5", "ACME-6", "ACME-7"]
+
+
+def test_resuming_drops_the_data_written_after_the_checkpoint(output, monkeypatch):
+    checkpoint_path = output.with_name(output.name + CHECKPOINT_SUFFIX)
+    with pytest.raises(CircuitOpenError):
+        _export(output, _Renderer(unavailable=["ACME-4"]), monkeypatch)
+    # An export interrupted while writing a page leaves a partial gzip member behind
+    with output.open("ab") as f:
+        f.write(gzip.compress(b'{"key": "ACME-4"}\n{"key": "ACME-5"}\n')[:20])
+    assert output.stat().st_size > ExportCheckpoint.load(checkpoint_path).output_size
+
+    _export(output, _Renderer(), monkeypatch, resume=True)
+
+    assert _exported_keys(output) == KEYS
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [{"jql": "project = BOOM"}, {"custom_fields": "Story Points"}, {"output_format": "jsonl"}],
+    ids=["jql", "custom_fields", "output_format"],
+)
+def test_a_resumed_export_must_match_the_checkpoint(output, monkeypatch, changes):
+    checkpoint_path = output.with_name(output.name + CHECKPOINT_SUFFIX)
+    saved = ExportCheckpoint(jql="project = ACME ORDER BY key ASC", output_format="jsonl.gz", next_start=3)
+    for name, value in changes.items():
+        setattr(saved, name, value)
+    saved.save(checkpoint_path)
+
+    with pytest.raises(ValueError, match=next(iter(changes))):
+        _export(output, _Renderer(), monkeypatch, resume=True)
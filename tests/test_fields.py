@@ -0,0 +1,102 @@
+import pytest
+
+from jira_prompts_mcp_server.jira_utils.fields import FieldMetadata
+from jira_prompts_mcp_server.jira_utils.records import FieldRecord, simplify_field_value
+
+from .fakes import load_fixture
+
+
+def test_fields_are_resolved_by_id_or_case_insensitive_name():
+    metadata = FieldMetadata(FieldRecord.from_raw(entry) for entry in load_fixture("fields.json"))
+
+    assert metadata.ids_by_name["story points"] == "customfield_10016"
+    for name_or_id in ("Story Points", "story points", " STORY POINTS ", "customfield_10016"):
+        assert metadata.resolve(name_or_id).id == "customfield_10016"
+    assert metadata.resolve("Story") is None
+    assert metadata.resolve("CUSTOMFIELD_10016") is None
+
+
+def test_the_first_of_the_fields_with_the_same_name_wins(caplog):
+    metadata = FieldMetadata(FieldRecord.from_raw(entry) for entry in load_fixture("fields.json"))
+
+    # "Team" and "team" are different fields
+    assert metadata.resolve("team").id == metadata.resolve("TEAM").id == "customfield_10030"
+    assert metadata.resolve("customfield_10031").name == "team"
+    assert 'Multiple fields are named "team" (customfield_10030, customfield_10031)' in caplog.text
+
+
+def test_custom_fields_are_fetched_by_name(make_fetcher):
+    fetcher = make_fetcher()
+
+    results, issue = fetcher.get_issue_and_core_fields(
+        "ACME-12",
+        fields="summary",
+        custom_fields="story points,Sprint,Team,customfield_10031,Acceptance Criteria,Category,Flagged,No Such Field",
+    )
+
+    assert results == {
+        "summary": "Checkout fails for carts with more than 50 items",
+        "story points": 5.0,
+        "Sprint": ("Sprint 7",),
+        "Team": "Payments",
+        "customfield_10031": "Checkout squad",
+        # Multi-line text fields are converted to Markdown
+        "Acceptance Criteria": "- Carts with **51 items** check out\n- The limit is configurable",
+        "Category": "Backend - API",
+        "Flagged": None,
+    }
+    assert issue.custom_field_ids == {f"customfield_100{x}" for x in (16, 20, 30, 31, 40, 50, 21)}
+
+
+def test_the_field_metadata_is_loaded_once(make_fetcher):
+    fetcher = make_fetcher()
+
+    fetcher.resolve_fields(["Story Points"])
+    fetcher.resolve_fields(["Sprint", "Team"])
+
+    assert fetcher.jira.requests.count("field") == 1
+    # Nothing to resolve, nothing to load
+    assert make_fetcher().resolve_fields([" ", ""]) == {}
+
+
+def test_the_field_metadata_is_not_evicted_by_the_memory_budget(make_fetcher):
+    fetcher = make_fetcher(cache_ttl=3600, memory_budget=64 << 10)
+    fetcher.get_field_metadata()
+
+    # Fill the budget many times over
+    for i in range(100):
+        fetcher.prompt_cache.set(("jira-issue-full", f"ACME-{i}", ""), "x" * 4096)
+    fetcher.get_field_metadata()
+
+    assert fetcher.memory_budget.evictions > 0
+    assert fetcher.jira.requests.count("field") == 1
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        (5.0, 5.0),
+        ("plain text", "plain text"),
+        ({"value": "Payments", "id": "10100"}, "Payments"),
+        ({"value": "Backend", "child": {"value": "API"}}, "Backend - API"),
+        ({"displayName": "Dana Whitfield", "name": "dana"}, "Dana Whitfield"),
+        ({"name": "1.4.0", "id": "10000"}, "1.4.0"),
+        ({"key": "ACME-10", "id": "10010"}, "ACME-10"),
+        ({"id": "10010"}, {"id": "10010"}),
+        ([{"value": "Impediment"}], ("Impediment",)),
+        ([{"name": "Sprint 6"}, {"name": "Sprint 7"}], ("Sprint 6", "Sprint 7")),
+        (
+            [
+                "com.atlassian.greenhopper.service.sprint.Sprint@1a2b[id=7,rapidViewId=3,state=ACTIVE,name=Sprint 7,goal=]"
+            ],
+            ("Sprint 7",),
+        ),
+        (
+            "com.atlassian.greenhopper.service.sprint.Sprint@1a2b[id=7]",
+            "com.atlassian.greenhopper.service.sprint.Sprint@1a2b[id=7]",
+        ),
+    ],
+)
+def test_simplify_field_value(value, expected):
+    assert simplify_field_value(value) == expected
@@ -0,0 +1,69 @@
+import io
+import os
+import json
+import time
+import queue
+import logging
+import subprocess
+import sys
+from logging.handlers import QueueListener
+
+from jira_prompts_mcp_server.log import LOG_IDLE_SECONDS, JsonFormatter, StructuredQueueHandler, _remove_old_log_files
+
+
+def test_tracebacks_survive_the_queue():
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    output = io.StringIO()
+    file_handler = logging.StreamHandler(output)
+    file_handler.setFormatter(JsonFormatter())
+    listener = QueueListener(log_queue, file_handler)
+    logger = logging.getLogger("jira_prompts.tests.log")
+    logger.propagate = False
+    logger.addHandler(StructuredQueueHandler(log_queue))
+    listener.start()
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed to render %s", "ACME-12")
+    finally:
+        listener.stop()
+        logger.handlers.clear()
+
+    data = json.loads(output.getvalue())
+    assert data["message"] == "Failed to render ACME-12"
+    assert data["exc_info"].startswith("Traceback")
+    assert "ValueError: boom" in data["exc_info"]
+
+
+def _exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_only_the_files_of_finished_runs_are_removed(tmp_path):
+    def touch(name: str, age: float = 0.0):
+        path = tmp_path / name
+        path.write_text("{}\n")
+        os.utime(path, (time.time() - age, time.time() - age))
+
+    # The newest run (kept by the retention), and older runs of a running and an exited server
+    touch(f"jira_prompts_mcp_20250305120000_{_exited_pid()}.log")
+    touch(f"jira_prompts_mcp_20250301120000_{os.getpid()}.log", age=30 * 24 * 3600)
+    exited_pid = _exited_pid()
+    touch(f"jira_prompts_mcp_20250302120000_{exited_pid}.log")
+    touch(f"jira_prompts_mcp_20250302120000_{exited_pid}.log.1")
+    # Runs of older versions (without process IDs) are judged by the time of their last write
+    touch("jira_prompts_mcp_20250303120000.log", age=LOG_IDLE_SECONDS / 2)
+    touch("jira_prompts_mcp_20250228120000.log", age=LOG_IDLE_SECONDS * 2)
+
+    _remove_old_log_files(tmp_path, retention=1)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        [
+            f"jira_prompts_mcp_20250301120000_{os.getpid()}.log",
+            "jira_prompts_mcp_20250303120000.log",
+            next(path.name for path in tmp_path.glob("jira_prompts_mcp_20250305120000_*.log")),
+        ]
+    )
@@ -0,0 +1,65 @@
+"""An offline version of the `memory-soak` command: render many large issues under a small memory budget."""
+
+import copy
+import itertools
+from typing import Any
+
+from jira.exceptions import JIRAError
+
+from jira_prompts_mcp_server.jira_utils import client as client_module
+from jira_prompts_mcp_server.profiling import current_rss
+from jira_prompts_mcp_server.server import render_issue_full
+
+from .fakes import FakeJira, load_fixture
+
+ISSUES = 300
+BUDGET = 4 << 20
+# The share of the budget by which the RSS may grow beyond it (the allocator overhead and the render in flight)
+TOLERANCE = 0.5
+
+
+class GeneratedJira(FakeJira):
+    """Serves ACME-1 to ACME-<ISSUES>, copies of ACME-12 with long descriptions and comments (about 60 KB each)."""
+
+    def _get_json(self, path: str, params: dict[str, Any] | None = None, base: str | None = None) -> dict[str, Any]:
+        self.requests.append(path)
+        issue_key = path.rsplit("/", 1)[-1]
+        number = int(issue_key.partition("-")[2] or 0) if path.startswith("issue/ACME-") else 0
+        if not 1 <= number <= ISSUES:
+            raise JIRAError(status_code=404, text=f"No issue for {path}")
+        raw = copy.deepcopy(_TEMPLATE)
+        raw["key"], raw["id"] = issue_key, str(20000 + number)
+        raw["fields"]["description"] = f"h2. {issue_key}\n" + "*Checkout* fails for {{cart}} items, see ACME-7.\n" * 400
+        for i, comment in enumerate(raw["fields"]["comment"]["comments"]):
+            comment["id"] = f"{number}{i:02d}"
+            comment["body"] = f"Still happening on {issue_key} with _51 items_. " * 200
+        return raw
+
+
+_TEMPLATE = load_fixture("issues/ACME-12.json")
+
+
+def test_the_caches_stay_within_the_budget(make_fetcher, monkeypatch):
+    monkeypatch.setattr(client_module, "JIRA", GeneratedJira)
+    # The caches are large enough to hold every entry, so only the budget evicts them
+    fetcher = make_fetcher(cache_ttl=3600, cache_size=10 * ISSUES, memory_budget=BUDGET)
+    keys = [f"ACME-{number}" for number in range(1, ISSUES + 1)]
+    # Warm up (the imports and the first allocations are not part of the cached data)
+    for key in keys[:10]:
+        render_issue_full(fetcher, key)
+    baseline = peak = current_rss()
+
+    for key in itertools.islice(itertools.cycle(keys), 2 * ISSUES):
+        render_issue_full(fetcher, key)
+        assert fetcher.memory_budget.used <= BUDGET
+        peak = max(peak, current_rss())
+
+    stats = fetcher.cache_stats()
+    assert stats["memory_budget"]["evictions"] > 0
+    # Every cache holding the converted data gave up entries to the others
+    assert len(fetcher.issue_cache) < ISSUES
+    assert len(fetcher.prompt_cache) < ISSUES
+    assert len(fetcher.comment_cache) < ISSUES * len(_TEMPLATE["fields"]["comment"]["comments"])
+    # The field metadata is not part of the budget
+    assert sum(cache.get("size_bytes", 0) for cache in stats["caches"].values()) == fetcher.memory_budget.used
+    assert peak - baseline <= BUDGET * (1 + TOLERANCE)
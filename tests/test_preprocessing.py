@@ -0,0 +1,78 @@
+from concurrent.futures import Future
+
+import pytest
+
+from jira_prompts_mcp_server.jira_utils import preprocessing
+from jira_prompts_mcp_server.jira_utils.preprocessing import JiraPreprocessor, shutdown_offload_pool
+
+from .conftest import BASE_URL
+
+THRESHOLD = 1000
+TEXT = "h2. Checkout\nFails with a *500 error* for [ACME-15|https://example.atlassian.net/browse/ACME-15].\n"
+
+
+class _InlinePool:
+    """Stands in for the process pool: runs the tasks right away in this process, and records them."""
+
+    def __init__(self) -> None:
+        self.tasks: list[tuple] = []
+
+    def submit(self, function, *args) -> Future:
+        self.tasks.append((function, *args))
+        future: Future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> _InlinePool:
+    inline_pool = _InlinePool()
+    monkeypatch.setattr(preprocessing, "_get_offload_pool", lambda max_workers, base_url: inline_pool)
+    monkeypatch.setattr(preprocessing, "_WORKER_PREPROCESSORS", {})
+    return inline_pool
+
+
+def test_only_large_texts_are_offloaded(pool):
+    preprocessor = JiraPreprocessor(jira_client=None, base_url=BASE_URL, offload_threshold=THRESHOLD)
+    small_text = TEXT
+    large_text = TEXT * (THRESHOLD // len(TEXT) + 1)
+
+    small = preprocessor.clean_jira_text(small_text)
+    assert pool.tasks == []
+
+    large = preprocessor.clean_jira_text(large_text)
+    assert pool.tasks == [(preprocessing._convert_in_worker, large_text, BASE_URL)]
+    assert large == preprocessor._convert_markup(large_text)
+    assert small == preprocessor._convert_markup(small_text)
+
+
+def test_offloading_is_disabled_by_a_zero_threshold(pool):
+    preprocessor = JiraPreprocessor(jira_client=None, base_url=BASE_URL, offload_threshold=0)
+
+    preprocessor.clean_jira_text(TEXT * 1000)
+
+    assert pool.tasks == []
+
+
+def test_the_workers_convert_like_the_preprocessor(monkeypatch):
+    monkeypatch.setattr(preprocessing, "_WORKER_PREPROCESSORS", {})
+    other_url = "https://other.atlassian.net"
+
+    preprocessing._init_offload_worker(BASE_URL)
+    assert list(preprocessing._WORKER_PREPROCESSORS) == [BASE_URL]
+    for base_url in (BASE_URL, other_url):
+        expected = JiraPreprocessor(jira_client=None, base_url=base_url)._convert_markup(TEXT)
+        assert preprocessing._convert_in_worker(TEXT, base_url) == expected
+    # The preprocessors of the other sites are built on their first conversion
+    assert list(preprocessing._WORKER_PREPROCESSORS) == [BASE_URL, other_url]
+
+
+def test_the_process_pool_converts_large_texts():
+    preprocessor = JiraPreprocessor(
+        jira_client=None, base_url=BASE_URL, offload_threshold=THRESHOLD, offload_max_workers=1
+    )
+    large_text = TEXT * (THRESHOLD // len(TEXT) + 1)
+    try:
+        assert preprocessor.clean_jira_text(large_text) == preprocessor._convert_markup(large_text)
+    finally:
+        shutdown_offload_pool()
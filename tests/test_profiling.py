@@ -0,0 +1,120 @@
+import pstats
+import threading
+from pathlib import Path
+
+import pytest
+
+from jira_prompts_mcp_server.log import REQUEST_ID
+from jira_prompts_mcp_server.profiling import PromptProfiler
+
+
+def _render(issue_key: str) -> str:
+    return "\n".join(f"line {i} of {issue_key}" for i in range(100))
+
+
+def _profiled_keys(output_dir: Path) -> list[str]:
+    """The issue keys of the profiles in a directory (in the order they were written)."""
+    paths = sorted(output_dir.glob("*.prof"), key=lambda x: x.stat().st_mtime_ns)
+    return [path.stem.split("_")[2] for path in paths]
+
+
+def test_the_next_invocations_are_profiled(tmp_path):
+    profiler = PromptProfiler(tmp_path, count=2)
+
+    for issue_key in ("ACME-1", "ACME-2", "ACME-3"):
+        assert profiler.run("jira-issue-brief", issue_key, _render, issue_key) == _render(issue_key)
+
+    assert sorted(_profiled_keys(tmp_path)) == ["ACME-1", "ACME-2"]
+    assert profiler.remaining == 0
+
+
+@pytest.mark.parametrize(
+    "count, expected",
+    [(0, ["ACME-12", "ACME-13", "ACME-14"]), (2, ["ACME-12", "ACME-13"])],
+    ids=["no-count", "count"],
+)
+def test_only_the_issue_keys_matching_the_pattern_are_profiled(tmp_path, count, expected):
+    profiler = PromptProfiler(tmp_path, count=count, pattern=r"acme-1\d")
+
+    for issue_key in ("ACME-1", "ACME-12", "ACME-123", "ACME-13", "BOOM-14", "ACME-14"):
+        profiler.run("jira-issue-brief", issue_key, _render, issue_key)
+
+    assert sorted(_profiled_keys(tmp_path)) == expected
+
+
+def test_only_one_invocation_is_profiled_at_a_time(tmp_path):
+    profiler = PromptProfiler(tmp_path, count=2)
+    started, release = threading.Event(), threading.Event()
+
+    def _slow_render(issue_key: str) -> str:
+        started.set()
+        release.wait(5)
+        return _render(issue_key)
+
+    thread = threading.Thread(target=profiler.run, args=("jira-issue-brief", "ACME-1", _slow_render, "ACME-1"))
+    thread.start()
+    try:
+        assert started.wait(5)
+        # Rendered without profiling while ACME-1 is being profiled, and without using up the count
+        assert profiler.run("jira-issue-brief", "ACME-2", _render, "ACME-2") == _render("ACME-2")
+        assert profiler.remaining == 1
+    finally:
+        release.set()
+        thread.join(5)
+
+    profiler.run("jira-issue-brief", "ACME-3", _render, "ACME-3")
+    assert sorted(_profiled_keys(tmp_path)) == ["ACME-1", "ACME-3"]
+
+
+def test_the_profiler_is_released_when_the_render_fails(tmp_path):
+    profiler = PromptProfiler(tmp_path, count=2)
+
+    def _fail(issue_key: str) -> str:
+        raise ValueError(issue_key)
+
+    with pytest.raises(ValueError):
+        profiler.run("jira-issue-brief", "ACME-1", _fail, "ACME-1")
+    profiler.run("jira-issue-brief", "ACME-2", _render, "ACME-2")
+
+    # The failed invocation is profiled too
+    assert sorted(_profiled_keys(tmp_path)) == ["ACME-1", "ACME-2"]
+
+
+def test_the_profile_and_its_summary_are_written_to_the_output_dir(tmp_path):
+    output_dir = tmp_path / "profiles" / "today"
+    profiler = PromptProfiler(output_dir, count=1, top=5)
+
+    token = REQUEST_ID.set("req-42")
+    try:
+        profiler.run("jira-issue-full", "acme-12", _render, "acme-12")
+    finally:
+        REQUEST_ID.reset(token)
+
+    profile_path, summary_path = sorted(output_dir.iterdir())
+    assert (profile_path.suffix, summary_path.suffix) == (".prof", ".txt")
+    assert profile_path.stem == summary_path.stem
+    assert profile_path.stem.endswith("_jira-issue-full_ACME-12_req-42")
+    # The profile is readable by pstats, and includes the render
+    functions = {name for _, _, name in pstats.Stats(str(profile_path)).stats}
+    assert "_render" in functions
+    summary = summary_path.read_text(encoding="utf-8")
+    assert summary.startswith("jira-issue-full for acme-12\n")
+    assert "# Top functions by cumulative time" in summary and "# Top functions by internal time" in summary
+    assert "_render" in summary
+
+
+def test_the_profiler_is_created_from_the_environment(env, tmp_path):
+    env()
+    assert PromptProfiler.from_env() is None
+
+    env(JIRA_PROMPTS_PROFILE_PATTERN="ACME-.*", JIRA_PROMPTS_PROFILE_DIR=str(tmp_path), JIRA_PROMPTS_PROFILE_TOP="10")
+    profiler = PromptProfiler.from_env()
+    assert (profiler.output_dir, profiler.remaining, profiler.pattern.pattern, profiler.top) == (
+        tmp_path,
+        None,
+        "ACME-.*",
+        10,
+    )
+
+    with pytest.raises(ValueError):
+        PromptProfiler(tmp_path)
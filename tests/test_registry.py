@@ -0,0 +1,134 @@
+import time
+import threading
+
+import pytest
+
+from jira_prompts_mcp_server.jira_utils import registry as registry_module
+from jira_prompts_mcp_server.jira_utils.config import JiraConfig
+from jira_prompts_mcp_server.jira_utils.registry import JiraSiteRegistry
+
+
+def _config(url: str, projects: str | None = None) -> JiraConfig:
+    return JiraConfig(url=url, auth_type="token", personal_token="secret", routed_projects=projects)
+
+
+@pytest.fixture
+def registry() -> JiraSiteRegistry:
+    return JiraSiteRegistry(
+        {
+            "cloud": _config("https://acme.atlassian.net"),
+            "dc": _config("https://jira.example.com", projects="OPS,infra"),
+        },
+        default_site="cloud",
+    )
+
+
+@pytest.mark.parametrize(
+    "site, issue_key, expected",
+    [
+        ("dc", None, "dc"),
+        # The explicit site takes precedence over the project
+        ("cloud", "OPS-1", "cloud"),
+        (None, "OPS-1", "dc"),
+        (None, "infra-12", "dc"),
+        (None, "ACME-12", "cloud"),
+        (None, None, "cloud"),
+    ],
+)
+def test_resolve_site(registry, site, issue_key, expected):
+    assert registry.resolve_site(site, issue_key) == expected
+
+
+def test_unknown_sites_are_rejected(registry):
+    with pytest.raises(ValueError, match="Unknown Jira site: staging"):
+        registry.resolve_site("staging")
+
+
+def test_the_default_site_is_the_first_one():
+    registry = JiraSiteRegistry(
+        {"dc": _config("https://jira.example.com"), "cloud": _config("https://a.atlassian.net")}
+    )
+
+    assert registry.resolve_site() == "dc"
+
+
+@pytest.mark.parametrize(
+    "configs, default_site, message",
+    [
+        ({}, None, "At least one Jira site"),
+        ({"dc": _config("https://jira.example.com")}, "cloud", "Unknown default Jira site"),
+        (
+            {"dc": _config("https://jira.example.com", "OPS"), "dc2": _config("https://jira2.example.com", "ops")},
+            None,
+            "Project OPS is mapped to both dc and dc2",
+        ),
+    ],
+)
+def test_invalid_registries(configs, default_site, message):
+    with pytest.raises(ValueError, match=message):
+        JiraSiteRegistry(configs, default_site=default_site)
+
+
+def test_the_sites_are_read_from_the_environment(env):
+    env(
+        JIRA_SITES="cloud, dc",
+        JIRA_DEFAULT_SITE="dc",
+        JIRA_CLOUD_URL="https://acme.atlassian.net",
+        JIRA_CLOUD_USERNAME="bot@example.com",
+        JIRA_CLOUD_API_TOKEN="secret",
+        JIRA_CLOUD_PROJECTS="ACME",
+        JIRA_DC_URL="https://jira.example.com",
+        JIRA_DC_PERSONAL_TOKEN="secret",
+    )
+
+    registry = JiraSiteRegistry.from_env()
+
+    assert list(registry.configs) == ["cloud", "dc"]
+    assert registry.resolve_site(issue_key="ACME-12") == "cloud"
+    assert registry.resolve_site(issue_key="OPS-1") == "dc"
+
+
+class _SlowFetcher:
+    """Stands in for `JiraFetcher`: connecting to the "dc" site waits until `connected` is set."""
+
+    connected = threading.Event()
+    created: list[str] = []
+
+    def __init__(self, config: JiraConfig) -> None:
+        if "jira.example.com" in config.url:
+            assert self.connected.wait(5)
+        self.created.append(config.url)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def slow_fetchers(monkeypatch: pytest.MonkeyPatch) -> type[_SlowFetcher]:
+    monkeypatch.setattr(registry_module, "JiraFetcher", _SlowFetcher)
+    monkeypatch.setattr(_SlowFetcher, "connected", threading.Event())
+    monkeypatch.setattr(_SlowFetcher, "created", [])
+    yield _SlowFetcher
+    _SlowFetcher.connected.set()
+
+
+def test_connecting_to_a_site_does_not_block_the_others(registry, slow_fetchers):
+    dc_fetchers = []
+    threads = [threading.Thread(target=lambda: dc_fetchers.append(registry.get("dc"))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+
+    # The "dc" site is still connecting
+    started = time.monotonic()
+    cloud_fetcher = registry.get("cloud")
+    assert time.monotonic() - started < 1
+    assert registry.active_fetchers() == [cloud_fetcher]
+
+    slow_fetchers.connected.set()
+    for thread in threads:
+        thread.join()
+
+    # The requests waiting for the "dc" site share the fetcher created by the first one
+    assert len(dc_fetchers) == 3 and all(fetcher is dc_fetchers[0] for fetcher in dc_fetchers)
+    assert sorted(slow_fetchers.created) == ["https://acme.atlassian.net", "https://jira.example.com"]
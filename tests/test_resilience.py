@@ -0,0 +1,146 @@
+"""Talk to a local port that refuses the connections, and to a local server that asks the client to back off."""
+
+import json
+import time
+import socket
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from jira_prompts_mcp_server.jira_utils import JiraFetcher
+from jira_prompts_mcp_server.jira_utils import client as client_module
+from jira_prompts_mcp_server.jira_utils.config import JiraConfig
+from jira_prompts_mcp_server.jira_utils.resilience import CircuitOpenError, DeadlineExceeded, deadline_scope
+
+
+def make_fetcher(url: str, **config_fields) -> JiraFetcher:
+    config = JiraConfig(url=url, auth_type="basic", username="bot@example.com", api_token="secret")
+    for name, value in config_fields.items():
+        setattr(config, name, value)
+    return JiraFetcher(config)
+
+
+@pytest.fixture
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record the waits before the retries instead of sleeping."""
+    recorded: list[float] = []
+    monkeypatch.setattr(client_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_the_client_sends_no_request_when_created(closed_port_url):
+    started = time.monotonic()
+    fetcher = make_fetcher(closed_port_url)
+    fetcher.close()
+
+    assert time.monotonic() - started < 1
+
+
+def test_retries_do_not_wait_past_the_deadline(closed_port_url):
+    fetcher = make_fetcher(closed_port_url, breaker_threshold=5)
+    started = time.monotonic()
+    with deadline_scope(3), pytest.raises(requests.ConnectionError):
+        fetcher.fetch_issue_record("ACME-12")
+    fetcher.close()
+
+    # The first retry would wait 10 to 20 seconds
+    assert time.monotonic() - started < 1
+
+
+def test_retries_stop_when_the_circuit_opens(closed_port_url, sleeps):
+    fetcher = make_fetcher(closed_port_url, breaker_threshold=2, max_retries=3)
+    with pytest.raises(requests.ConnectionError):
+        fetcher.fetch_issue_record("ACME-12")
+
+    assert len(sleeps) == 1
+    assert fetcher.circuit_breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        fetcher.fetch_issue_record("ACME-12")
+    fetcher.close()
+
+
+class _BusyHandler(BaseHTTPRequestHandler):
+    """Answers 429 (Retry-After: 1) to the first request, and an empty list of fields afterwards."""
+
+    requests_served = 0
+
+    def do_GET(self) -> None:
+        type(self).requests_served += 1
+        if self.requests_served == 1:
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps([]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def busy_server_url() -> Iterator[str]:
+    _BusyHandler.requests_served = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BusyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_rate_limited_requests_are_retried_after_the_requested_delay(busy_server_url, sleeps):
+    fetcher = make_fetcher(busy_server_url)
+
+    assert fetcher.jira.fields() == []
+    assert _BusyHandler.requests_served == 2
+    assert len(sleeps) == 1 and 1 <= sleeps[0] <= 2
+    fetcher.close()
+
+
+def test_the_rate_limiter_does_not_wait_past_the_deadline(sleeps):
+    rate_limiter = client_module.RateLimiter(rate=0.1)
+    rate_limiter.acquire()
+
+    # The next request is allowed in 10 seconds
+    with deadline_scope(3), pytest.raises(DeadlineExceeded):
+        rate_limiter.acquire()
+    assert sleeps == []
+
+
+def test_the_rate_limiter_waits_within_the_deadline():
+    rate_limiter = client_module.RateLimiter(rate=20, burst=1)
+    rate_limiter.acquire()
+    started = time.monotonic()
+
+    with deadline_scope(3):
+        rate_limiter.acquire()
+
+    assert 0.02 <= time.monotonic() - started < 1
+
+
+def test_waiting_for_the_rate_limit_past_the_deadline_does_not_open_the_circuit(closed_port_url):
+    fetcher = make_fetcher(closed_port_url, rate_limit=0.1, breaker_threshold=1, max_retries=0)
+    fetcher.rate_limiter.acquire()
+
+    with deadline_scope(3), pytest.raises(DeadlineExceeded):
+        fetcher.fetch_issue_record("ACME-12")
+
+    assert not fetcher.circuit_breaker.is_open
+    fetcher.close()
@@ -0,0 +1,38 @@
+import time
+import threading
+
+from jira_prompts_mcp_server import server
+from jira_prompts_mcp_server.jira_utils.config import JiraConfig
+from jira_prompts_mcp_server.jira_utils.registry import DEFAULT_SITE, JiraSiteRegistry
+
+from .conftest import BASE_URL
+
+
+def test_the_jira_sites_are_created_once(monkeypatch):
+    created = []
+
+    def _from_env() -> JiraSiteRegistry:
+        # Slow enough for the other threads to find the registry missing
+        time.sleep(0.05)
+        config = JiraConfig(url=BASE_URL, auth_type="basic", username="bot@example.com", api_token="secret")
+        created.append(JiraSiteRegistry({DEFAULT_SITE: config}))
+        return created[-1]
+
+    monkeypatch.setattr(server, "_JIRA_SITES", None)
+    monkeypatch.setattr(server.JiraSiteRegistry, "from_env", _from_env)
+    monkeypatch.setattr(server.os, "system", lambda command: 0)
+    results = []
+    barrier = threading.Barrier(8)
+
+    def _get():
+        barrier.wait()
+        results.append(server.get_jira_sites())
+
+    threads = [threading.Thread(target=_get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert len(results) == 8 and all(result is created[0] for result in results)
@@ -0,0 +1,174 @@
+import pytest
+
+from jira_prompts_mcp_server.jira_utils.sprints import SprintSummary, split_order_by, with_stable_order
+from jira_prompts_mcp_server.server import collect_sprint_summary
+
+
+class _SprintFetcher:
+    """Serves sprint 7 (and board 3, whose active sprint it is), and records the JQL queries of the summaries."""
+
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    def get_sprint(self, sprint_id: int) -> dict:
+        return {"id": sprint_id, "name": f"Sprint {sprint_id}", "state": "active"}
+
+    def get_active_sprints(self, board_id: int) -> list[dict]:
+        return [self.get_sprint(7)]
+
+    def summarize_issues(self, jql: str) -> dict:
+        self.queries.append(jql)
+        return {"total": 0}
+
+
+@pytest.mark.parametrize(
+    "jql, expected",
+    [
+        ("project = ACME", ("project = ACME", "")),
+        ("project = ACME order by created DESC", ("project = ACME", "order by created DESC")),
+        ('summary ~ "order by" ORDER BY rank', ('summary ~ "order by"', "ORDER BY rank")),
+        ("ORDER BY key", ("", "ORDER BY key")),
+        ('summary ~ "sort order by date"', ('summary ~ "sort order by date"', "")),
+        ("summary ~ 'order by' order by rank", ("summary ~ 'order by'", "order by rank")),
+        ('summary ~ "say \\"order by\\"" ORDER BY key', ('summary ~ "say \\"order by\\""', "ORDER BY key")),
+    ],
+)
+def test_split_order_by(jql, expected):
+    assert split_order_by(jql) == expected
+
+
+@pytest.mark.parametrize(
+    "jql, expected",
+    [
+        (None, "sprint in (7)"),
+        ("project = ACME", "sprint in (7) AND (project = ACME)"),
+        ("project = ACME ORDER BY priority DESC", "sprint in (7) AND (project = ACME) ORDER BY priority DESC"),
+        ("ORDER BY rank", "sprint in (7) ORDER BY rank"),
+    ],
+)
+def test_the_query_narrows_down_the_sprint(jql, expected):
+    fetcher = _SprintFetcher()
+
+    results = collect_sprint_summary(fetcher, board_id="3", jql=jql)
+
+    assert results["jql"] == fetcher.queries[0] == expected
+
+
+def test_the_order_of_the_query_is_kept():
+    jql = "sprint in (7) AND (project = ACME) ORDER BY priority DESC"
+
+    assert with_stable_order(jql) == jql
+    assert with_stable_order("sprint in (7)") == "sprint in (7) ORDER BY key ASC"
+    assert with_stable_order('summary ~ "order by"') == 'summary ~ "order by" ORDER BY key ASC'
+
+
+_CATEGORIES = {"To Do": "new", "In Progress": "indeterminate", "In Review": "indeterminate", "Done": "done"}
+
+
+def _status(name: str) -> dict:
+    return {"name": name, "statusCategory": {"key": _CATEGORIES.get(name, "indeterminate")}}
+
+
+def _issue(key: str, status: str, assignee: str | None = None, links=(), **fields) -> dict:
+    """The raw JSON of an issue as returned by the search of the summaries."""
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Summary of {key}",
+            "status": _status(status),
+            "issuetype": {"name": "Story"},
+            "assignee": {"accountId": assignee, "displayName": assignee} if assignee else None,
+            "issuelinks": list(links),
+            **fields,
+        },
+    }
+
+
+def _blocks_link(direction: str, key: str, status: str, link_type: str = "Blocks") -> dict:
+    """A link to another issue ("inwardIssue" blocks this issue, "outwardIssue" is blocked by it)."""
+    return {"type": {"name": link_type}, direction: {"key": key, "fields": {"status": _status(status)}}}
+
+
+def _summarize(issues, **kwargs) -> dict:
+    summary = SprintSummary(**kwargs)
+    for raw in issues:
+        summary.add(raw)
+    return summary.to_dict()
+
+
+def test_the_issues_are_counted_by_status_and_assignee():
+    results = _summarize(
+        [
+            _issue("ACME-1", "In Progress", "Dana"),
+            _issue("ACME-2", "In Progress", "Sam"),
+            _issue("ACME-3", "Done", "Dana"),
+            _issue("ACME-4", "To Do"),
+            _issue("ACME-5", "In Review", "Dana"),
+        ]
+    )
+
+    assert results["total"] == 5
+    assert results["by_status"] == {"In Progress": 2, "Done": 1, "To Do": 1, "In Review": 1}
+    assert list(results["by_status"])[0] == "In Progress"
+    assert results["by_assignee"] == {"Dana": 3, "Sam": 1, "Unassigned": 1}
+    assert [row["key"] for row in results["in_progress"]] == ["ACME-1", "ACME-2", "ACME-5"]
+    assert results["in_progress"][0] == {
+        "key": "ACME-1",
+        "summary": "Summary of ACME-1",
+        "status": "In Progress",
+        "type": "Story",
+        "assignee": "Dana",
+    }
+    assert results["blocked"] == []
+    assert "omitted_items" not in results
+
+
+def test_blocked_issues():
+    results = _summarize(
+        [
+            # Blocked by unresolved issues (the resolved blocker is left out)
+            _issue(
+                "ACME-1",
+                "In Progress",
+                links=[
+                    _blocks_link("inwardIssue", "ACME-7", "To Do"),
+                    _blocks_link("inwardIssue", "ACME-8", "Done"),
+                    _blocks_link("inwardIssue", "ACME-9", "In Progress"),
+                ],
+            ),
+            # Only blocked by resolved issues, blocking another issue, or related to another issue: not blocked
+            _issue("ACME-2", "In Progress", links=[_blocks_link("inwardIssue", "ACME-8", "Done")]),
+            _issue("ACME-3", "In Progress", links=[_blocks_link("outwardIssue", "ACME-7", "To Do")]),
+            _issue("ACME-4", "In Progress", links=[_blocks_link("inwardIssue", "ACME-7", "To Do", "Relates")]),
+            # Flagged, or in a status named like "Blocked"
+            _issue("ACME-5", "To Do", customfield_10021=[{"value": "Impediment"}]),
+            _issue("ACME-6", "Blocked - Waiting for Vendor"),
+        ],
+        flagged_field_id="customfield_10021",
+    )
+
+    assert [(row["key"], row.get("blocked_by")) for row in results["blocked"]] == [
+        ("ACME-1", ["ACME-7", "ACME-9"]),
+        ("ACME-5", None),
+        ("ACME-6", None),
+    ]
+    # The blocked issues are not listed as in progress
+    assert [row["key"] for row in results["in_progress"]] == ["ACME-2", "ACME-3", "ACME-4"]
+
+
+def test_the_flagged_field_is_ignored_when_the_site_does_not_have_it():
+    results = _summarize([_issue("ACME-5", "To Do", customfield_10021=[{"value": "Impediment"}])])
+
+    assert results["blocked"] == []
+
+
+def test_the_lists_are_cut_at_max_items():
+    issues = [_issue(f"ACME-{i}", "In Progress") for i in range(1, 6)]
+    issues += [_issue(f"ACME-{i}", "Blocked") for i in range(6, 9)]
+
+    results = _summarize(issues, max_items=2)
+
+    assert results["total"] == 8
+    assert [row["key"] for row in results["in_progress"]] == ["ACME-1", "ACME-2"]
+    assert [row["key"] for row in results["blocked"]] == ["ACME-6", "ACME-7"]
+    assert results["omitted_items"] == {"in_progress": 3, "blocked": 1}
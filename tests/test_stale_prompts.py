@@ -0,0 +1,68 @@
+import time
+import threading
+
+import pytest
+
+from jira_prompts_mcp_server.jira_utils.client import RefreshState
+from jira_prompts_mcp_server.server import _get_or_render
+
+CACHE_KEY = ("jira-issue-brief", "ACME-12", "")
+
+
+@pytest.fixture
+def release() -> threading.Event:
+    """Holds the refreshes until it is set (it is set at the end of the test in any case)."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def _stale_fetcher(make_fetcher):
+    fetcher = make_fetcher(cache_ttl=0.05, stale_ttl=3600)
+    fetcher.prompt_cache.set(CACHE_KEY, "old prompt")
+    time.sleep(0.1)
+    return fetcher
+
+
+def test_the_refresh_states(make_fetcher, release):
+    fetcher = make_fetcher(breaker_threshold=1)
+
+    assert fetcher.refresh_in_background("a", release.wait) is RefreshState.STARTED
+    assert fetcher.refresh_in_background("a", release.wait) is RefreshState.RUNNING
+    assert fetcher.refresh_in_background("b", release.wait) is RefreshState.STARTED
+    fetcher.circuit_breaker.record_failure()
+    assert fetcher.refresh_in_background("c", release.wait) is RefreshState.UNAVAILABLE
+
+
+def test_stale_prompts_are_served_while_refreshed(make_fetcher, release):
+    fetcher = _stale_fetcher(make_fetcher)
+    renders = []
+
+    def _render() -> str:
+        renders.append(1)
+        release.wait()
+        return "new prompt"
+
+    first = _get_or_render(fetcher, CACHE_KEY, _render)
+    # The refresh started by the first request is still running
+    second = _get_or_render(fetcher, CACHE_KEY, _render)
+
+    for text in (first, second):
+        assert text.startswith("Note: this information was cached")
+        assert "(it is being refreshed)" in text and text.endswith("old prompt")
+    assert len(renders) == 1
+    release.set()
+    give_up = time.monotonic() + 5
+    while fetcher.prompt_cache.get_with_age(CACHE_KEY, max_stale=3600)[0] != "new prompt":
+        assert time.monotonic() < give_up, "The prompt was not refreshed"
+        time.sleep(0.01)
+
+
+def test_stale_prompts_are_served_while_jira_is_unavailable(make_fetcher):
+    fetcher = _stale_fetcher(make_fetcher)
+    for _ in range(fetcher.config.breaker_threshold):
+        fetcher.circuit_breaker.record_failure()
+
+    text = _get_or_render(fetcher, CACHE_KEY, lambda: pytest.fail("Jira is unavailable"))
+
+    assert "(Jira is currently unavailable)" in text and text.endswith("old prompt")
@@ -0,0 +1,225 @@
+"""Apply the recorded webhook payloads in `fixtures/webhooks` to the caches of a fetcher."""
+
+import hmac
+import hashlib
+
+import pytest
+from starlette.testclient import TestClient
+
+from jira_prompts_mcp_server import server
+from jira_prompts_mcp_server.jira_utils import registry as registry_module
+from jira_prompts_mcp_server.jira_utils.config import JiraConfig
+from jira_prompts_mcp_server.jira_utils.registry import JiraSiteRegistry
+from jira_prompts_mcp_server.webhooks import create_webhook_app
+
+from .fakes import FIXTURES_DIR, load_fixture
+
+PROMPTS = ("jira-issue-brief", "jira-issue-full")
+# The issues of the fixtures: ACME-12 is a story under ACME-10 with the subtask ACME-13, and is blocked by ACME-15.
+# ACME-16 (created by a webhook event) is another subtask of ACME-12, and ACME-20 is unrelated.
+ISSUE_KEYS = ("ACME-10", "ACME-12", "ACME-13", "ACME-15", "ACME-16", "ACME-20")
+EVENTS = (
+    "issue_created",
+    "issue_updated",
+    "issue_deleted",
+    "comment_created",
+    "comment_updated",
+    "comment_deleted",
+    "issuelink_created",
+    "issuelink_deleted",
+)
+SECRET = "It's a secret to everybody"
+
+
+@pytest.fixture
+def fetcher(make_fetcher):
+    """A fetcher with ACME-12 and ACME-15 (and their converted comments) and the prompts of all the issues cached."""
+    fetcher = make_fetcher(cache_ttl=3600)
+    for issue_key in ("ACME-12", "ACME-15"):
+        fetcher.collect_comments(fetcher.fetch_issue_record(issue_key))
+    for issue_key in ISSUE_KEYS:
+        for prompt in PROMPTS:
+            fetcher.prompt_cache.set((prompt, issue_key, ""), f"The {prompt} prompt of {issue_key}")
+    return fetcher
+
+
+def cached_prompts(fetcher) -> set[str]:
+    """The issues whose prompts are all cached."""
+    return {
+        issue_key
+        for issue_key in ISSUE_KEYS
+        if all(fetcher.prompt_cache.get((prompt, issue_key, "")) is not None for prompt in PROMPTS)
+    }
+
+
+def cached_issues(fetcher) -> set[str]:
+    return {issue_key for issue_key in ISSUE_KEYS if fetcher.issue_cache.get(issue_key) is not None}
+
+
+def comment_ids(fetcher, issue_key: str) -> list[str]:
+    return [comment.id for comment in fetcher.issue_cache.get(issue_key).comments]
+
+
+def test_issue_created_invalidates_the_parent(fetcher):
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/issue_created.json"))
+
+    assert cached_issues(fetcher) == {"ACME-15"}
+    assert cached_prompts(fetcher) == {"ACME-10", "ACME-13", "ACME-15", "ACME-20"}
+
+
+def test_issue_updated_invalidates_the_issue_and_the_related_issues(fetcher):
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/issue_updated.json"))
+
+    assert cached_issues(fetcher) == set()
+    # The parent, the subtask, and the linked issue show the status of ACME-12
+    assert cached_prompts(fetcher) == {"ACME-16", "ACME-20"}
+    # The converted comments are keyed by their update times, so they stay valid
+    assert fetcher.comment_cache.get("20001") is not None
+
+
+def test_issue_deleted_forgets_the_issue(fetcher):
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/issue_deleted.json"))
+
+    assert cached_issues(fetcher) == set()
+    assert cached_prompts(fetcher) == {"ACME-10", "ACME-13", "ACME-16", "ACME-20"}
+    assert fetcher.issue_keys_by_id.get("10015") is None
+    assert fetcher.issue_keys_by_id.get("10012") == "ACME-12"
+
+
+def test_comment_created_patches_the_cached_issue(fetcher):
+    requests_before = len(fetcher.jira.requests)
+
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/comment_created.json"))
+
+    assert cached_issues(fetcher) == {"ACME-12", "ACME-15"}
+    assert comment_ids(fetcher, "ACME-12") == ["20001", "20002", "20003"]
+    assert cached_prompts(fetcher) == {"ACME-10", "ACME-13", "ACME-15", "ACME-16", "ACME-20"}
+    comments = fetcher.collect_comments(fetcher.fetch_issue_record("ACME-12"))
+    assert comments[0]["body"] == "Deployed the fix to staging. **51 items** go through now."
+    assert len(fetcher.jira.requests) == requests_before
+
+
+def test_comment_updated_replaces_the_comment(fetcher):
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/comment_updated.json"))
+
+    assert comment_ids(fetcher, "ACME-12") == ["20002", "20001"]
+    assert fetcher.comment_cache.get("20001") is None
+    assert fetcher.comment_cache.get("20002") is not None
+    assert "ACME-12" not in cached_prompts(fetcher)
+    bodies = {
+        comment["id"]: comment["body"] for comment in fetcher.collect_comments(fetcher.issue_cache.get("ACME-12"))
+    }
+    assert bodies["20001"] == "Reproduced on staging with 51 items (and with 200 items on production)."
+
+
+def test_comment_deleted_removes_the_comment(fetcher):
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/comment_deleted.json"))
+
+    assert comment_ids(fetcher, "ACME-12") == ["20001"]
+    assert fetcher.comment_cache.get("20002") is None
+    assert "ACME-12" not in cached_prompts(fetcher)
+
+
+def test_comment_on_an_uncached_issue_only_drops_the_prompts(fetcher):
+    fetcher.issue_cache.pop("ACME-12")
+
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/comment_created.json"))
+
+    assert cached_issues(fetcher) == {"ACME-15"}
+    assert "ACME-12" not in cached_prompts(fetcher)
+
+
+def test_issuelink_created_invalidates_both_issues(fetcher):
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/issuelink_created.json"))
+
+    assert cached_issues(fetcher) == set()
+    assert cached_prompts(fetcher) == {"ACME-10", "ACME-13", "ACME-16", "ACME-20"}
+
+
+def test_issuelink_deleted_invalidates_the_known_issues(fetcher):
+    # The destination (ID 10020) has never been fetched, so its key is unknown
+    assert fetcher.handle_webhook_event(load_fixture("webhooks/issuelink_deleted.json"))
+
+    assert cached_issues(fetcher) == {"ACME-12"}
+    assert cached_prompts(fetcher) == {"ACME-10", "ACME-12", "ACME-13", "ACME-16", "ACME-20"}
+
+
+def test_unknown_events_are_ignored(fetcher):
+    assert not fetcher.handle_webhook_event({"webhookEvent": "sprint_started", "sprint": {"id": 7}})
+
+    assert cached_issues(fetcher) == {"ACME-12", "ACME-15"}
+    assert cached_prompts(fetcher) == set(ISSUE_KEYS)
+
+
+@pytest.fixture
+def webhook_client(fetcher, monkeypatch):
+    """A test client of the webhook receiver, serving the fetcher as the default site."""
+    monkeypatch.setattr(registry_module, "JiraFetcher", lambda config: fetcher)
+    registry = JiraSiteRegistry({registry_module.DEFAULT_SITE: fetcher.config})
+    registry.get()
+    monkeypatch.setattr(server, "_JIRA_SITES", registry)
+    return TestClient(create_webhook_app(secret=SECRET))
+
+
+def post_event(client: TestClient, event: str, secret: str | None = SECRET):
+    body = (FIXTURES_DIR / "webhooks" / f"{event}.json").read_bytes()
+    headers = {"Content-Type": "application/json"}
+    if secret is not None:
+        headers["X-Hub-Signature"] = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return client.post("/webhooks/jira", content=body, headers=headers)
+
+
+@pytest.mark.parametrize("event", EVENTS)
+def test_receiver_applies_signed_events(webhook_client, fetcher, event):
+    response = post_event(webhook_client, event)
+
+    assert response.status_code == 200
+    assert response.json() == {"handled": True}
+    assert cached_prompts(fetcher) != set(ISSUE_KEYS)
+
+
+@pytest.mark.parametrize("secret", ["not the secret", None])
+def test_receiver_rejects_bad_signatures(webhook_client, fetcher, secret):
+    response = post_event(webhook_client, "issue_updated", secret=secret)
+
+    assert response.status_code == 401
+    assert cached_issues(fetcher) == {"ACME-12", "ACME-15"}
+    assert cached_prompts(fetcher) == set(ISSUE_KEYS)
+
+
+@pytest.fixture
+def multi_site_client(fetcher, monkeypatch):
+    """A test client of the webhook receiver, serving the fetcher as the "cloud" site next to a "dc" site."""
+    monkeypatch.setattr(registry_module, "JiraFetcher", lambda config: fetcher)
+    dc_config = JiraConfig(url="https://jira.example.com", auth_type="token", personal_token="secret")
+    registry = JiraSiteRegistry({"cloud": fetcher.config, "dc": dc_config})
+    registry.get("cloud")
+    monkeypatch.setattr(server, "_JIRA_SITES", registry)
+    return TestClient(create_webhook_app())
+
+
+@pytest.mark.parametrize("event", ["issuelink_created", "issuelink_deleted"])
+def test_issue_link_events_need_the_site_when_serving_multiple_sites(multi_site_client, fetcher, event):
+    body = (FIXTURES_DIR / "webhooks" / f"{event}.json").read_bytes()
+    headers = {"Content-Type": "application/json"}
+
+    response = multi_site_client.post("/webhooks/jira", content=body, headers=headers)
+
+    assert response.status_code == 400
+    assert cached_issues(fetcher) == {"ACME-12", "ACME-15"}
+    assert cached_prompts(fetcher) == set(ISSUE_KEYS)
+
+    response = multi_site_client.post("/webhooks/jira/cloud", content=body, headers=headers)
+
+    assert response.json() == {"handled": True}
+    assert cached_prompts(fetcher) != set(ISSUE_KEYS)
+
+
+def test_issue_events_are_routed_without_the_site(multi_site_client, fetcher):
+    body = (FIXTURES_DIR / "webhooks" / "issue_updated.json").read_bytes()
+
+    response = multi_site_client.post("/webhooks/jira", content=body, headers={"Content-Type": "application/json"})
+
+    # ACME is not mapped to a site, so the event goes to the default site (the first one)
+    assert response.json() == {"handled": True}
+    assert cached_issues(fetcher) == set()